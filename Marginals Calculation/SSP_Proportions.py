@@ -1,250 +1,310 @@
-# PROCESSING FILE TO CALCULATE PROPORTIONAL CHANGES IN 
+# PROCESSING FILE TO CALCULATE PROPORTIONAL CHANGES IN
+import numpy as np
 import pandas as pd
+import argparse
+import os
 
 # ---------------------------------------------------------------------
 # CONFIG
 # ---------------------------------------------------------------------
-SSP_NAME = "SSP3"
-RAW_SSP_PATH = f"../Data/Demand_SSPs/{SSP_NAME}.txt"
-CLEAN_SSP_PATH = f"../Data/Demand_SSPs/Cleaned_Files/{SSP_NAME}_cleaned.txt"
-OUTPUT_PROPORTIONS_PATH = f"../Data/Demand_SSPs/SSP_Proportions/{SSP_NAME}_proportions.csv"
-
 TARGET_YEARS = [2020, 2025, 2030, 2035, 2040, 2045, 2050]
 
-# ---------------------------------------------------------------------
-# 1. CLEAN & LOAD RAW SSP DEMAND FILE
-# ---------------------------------------------------------------------
-with open(RAW_SSP_PATH, "r") as f:
-    lines = [line.strip().strip('"') for line in f]
-
-with open(CLEAN_SSP_PATH, "w") as f:
-    f.write("\n".join(lines))
-
-SSP_demand = pd.read_csv(CLEAN_SSP_PATH, delimiter=",")
-
-# rename columns and filter years
-SSP_demand = SSP_demand.rename(columns={"dummy": "year", "dummy.1": "ISO3"})
-SSP_demand["year"] = SSP_demand["year"].str.replace("y", "").astype(int)
-SSP_demand = SSP_demand[SSP_demand["year"].isin(TARGET_YEARS)]
-
-cols_keep = [
-    "year",
-    "ISO3",
-    "Demand for animal source foods (kcal/capita/day)",
-    "Demand for empty calories (kcal/capita/day)",
-    "Demand for vegetables fruits and nuts (kcal/capita/day)",
-]
-SSP_demand = SSP_demand[cols_keep]
-
-# ---------------------------------------------------------------------
-# 2. CONVERT TO PROPORTIONS RELATIVE TO 2020
-# ---------------------------------------------------------------------
-SSP_demand = SSP_demand.set_index(["ISO3", "year"])
-
-baseline = SSP_demand.loc[SSP_demand.index.get_level_values("year") == 2020]
-baseline_reindexed = (
-    baseline.groupby(level="ISO3")
-    .first()
-    .loc[SSP_demand.index.get_level_values("ISO3")]
-    .set_index(SSP_demand.index)
-)
-
-SSP_demand_prop = (SSP_demand / baseline_reindexed).reset_index()
-
-# ---------------------------------------------------------------------
-# 3. LOAD INCOME GROUPS AND DEFINE ADJUSTMENTS
-# ---------------------------------------------------------------------
-income_brackets = pd.read_csv(
-    "../Data/Demand_SSPs/Metadata_Country_API_NY.GDP.MKTP.PP.CD_DS2_en_csv_v2_132008.csv",
-    usecols=[0, 2],
-)
-income_brackets = income_brackets.rename(columns={"Country Code": "ISO3"})
-
-# SSP1 adjustment targets 
-adjustment_targets = {
-    "animal_foods": {
-        "Low income": -0.05,
-        "Lower middle income": -0.10,
-        "Upper middle income": -0.20,
-        "High income": -0.30,
-    },
-    "plant_foods": {
-        "Low income": 0.10,
-        "Lower middle income": 0.20,
-        "Upper middle income": 0.20,
-        "High income": 0.30,
+# adjustment targets per SSP (relative change in 2050, phased in linearly from 2020)
+ADJUSTMENT_TARGETS = {
+    "SSP1": {
+        "animal_foods": {
+            "Low income": -0.05,
+            "Lower middle income": -0.10,
+            "Upper middle income": -0.20,
+            "High income": -0.30,
+        },
+        "plant_foods": {
+            "Low income": 0.10,
+            "Lower middle income": 0.20,
+            "Upper middle income": 0.20,
+            "High income": 0.30,
+        },
+        "empty_calories": {
+            "Low income": -0.10,
+            "Lower middle income": -0.20,
+            "Upper middle income": -0.20,
+            "High income": -0.30,
+        },
+        "fatty_acids": {
+            "Low income": 0.10,
+            "Lower middle income": 0.10,
+            "Upper middle income": 0.10,
+            "High income": 0.10,
+        },
     },
-    "empty_calories": {
-        "Low income": -0.10,
-        "Lower middle income": -0.20,
-        "Upper middle income": -0.20,
-        "High income": -0.30,
+    "SSP2": {
+        "animal_foods": {
+            "Low income": 0.0,
+            "Lower middle income": 0.0,
+            "Upper middle income": 0.0,
+            "High income": 0.0,
+        },
+        "plant_foods": {
+            "Low income": 0.0,
+            "Lower middle income": 0.0,
+            "Upper middle income": 0.0,
+            "High income": 0.0,
+        },
+        "empty_calories": {
+            "Low income": 0.0,
+            "Lower middle income": 0.0,
+            "Upper middle income": 0.0,
+            "High income": 0.0,
+        },
+        "fatty_acids": {
+            "Low income": 0.0,
+            "Lower middle income": 0.0,
+            "Upper middle income": 0.0,
+            "High income": 0.0,
+        },
     },
-    "fatty_acids": {
-        "Low income": 0.10,
-        "Lower middle income": 0.10,
-        "Upper middle income": 0.10,
-        "High income": 0.10,
+    "SSP3": {
+        "animal_foods": {
+            "Low income": 0.05,
+            "Lower middle income": 0.10,
+            "Upper middle income": 0.10,
+            "High income": 0.05,
+        },
+        "plant_foods": {
+            "Low income": -0.10,
+            "Lower middle income": -0.15,
+            "Upper middle income": -0.15,
+            "High income": -0.10,
+        },
+        "empty_calories": {
+            "Low income": 0.10,
+            "Lower middle income": 0.20,
+            "Upper middle income": 0.20,
+            "High income": 0.10,
+        },
+        "fatty_acids": {
+            "Low income": 0.0,
+            "Lower middle income": 0.0,
+            "Upper middle income": 0.0,
+            "High income": 0.0,
+        },
     },
-}
-
-"""
-# SSP2 adjustment targets 
-adjustment_targets = {
-    "animal_foods": {
-        "Low income": 0.0,
-        "Lower middle income": 0.0,
-        "Upper middle income": 0.0,
-        "High income": 0.0,
+    "SSP4": {
+        "animal_foods": {
+            "Low income": 0.00,
+            "Lower middle income": 0.00,
+            "Upper middle income": 0.10,
+            "High income": 0.05,
+        },
+        "plant_foods": {
+            "Low income": -0.20,
+            "Lower middle income": -0.10,
+            "Upper middle income": 0.10,
+            "High income": 0.20,
+        },
+        "empty_calories": {
+            "Low income": 0.30,
+            "Lower middle income": 0.20,
+            "Upper middle income": 0.10,
+            "High income": -0.10,
+        },
+        "fatty_acids": {
+            "Low income": -0.20,
+            "Lower middle income": -0.10,
+            "Upper middle income": 0.10,
+            "High income": 0.20,
+        },
     },
-    "plant_foods": {
-        "Low income": 0.0,
-        "Lower middle income": 0.0,
-        "Upper middle income": 0.0,
-        "High income": 0.0,
-    },
-    "empty_calories": {
-        "Low income": 0.0,
-        "Lower middle income": 0.0,
-        "Upper middle income": 0.0,
-        "High income": 0.0,
-    },
-    "fatty_acids": {
-        "Low income": 0.0,
-        "Lower middle income": 0.0,
-        "Upper middle income": 0.0,
-        "High income": 0.0,
-    },
-}
-"""
-
-# SSP3 adjustment targets 
-adjustment_targets = {
-    "animal_foods": {
-        "Low income": 0.05,
-        "Lower middle income": 0.10,
-        "Upper middle income": 0.10,
-        "High income": 0.05,
-    },
-    "plant_foods": {
-        "Low income": -0.10,
-        "Lower middle income": -0.15,
-        "Upper middle income": -0.15,
-        "High income": -0.10,
-    },
-    "empty_calories": {
-        "Low income": 0.10,
-        "Lower middle income": 0.20,
-        "Upper middle income": 0.20,
-        "High income": 0.10,
-    },
-    "fatty_acids": {
-        "Low income": 0.0,
-        "Lower middle income": 0.0,
-        "Upper middle income": 0.0,
-        "High income": 0.0,
+    "SSP5": {
+        "animal_foods": {
+            "Low income": 0.00,
+            "Lower middle income": 0.00,
+            "Upper middle income": 0.00,
+            "High income": 0.00,
+        },
+        "plant_foods": {
+            "Low income": 0.15,
+            "Lower middle income": 0.10,
+            "Upper middle income": 0.10,
+            "High income": 0.10,
+        },
+        "empty_calories": {
+            "Low income": -0.05,
+            "Lower middle income": -0.05,
+            "Upper middle income": -0.10,
+            "High income": -0.10,
+        },
+        "fatty_acids": {
+            "Low income": 0.05,
+            "Lower middle income": 0.05,
+            "Upper middle income": 0.05,
+            "High income": 0.05,
+        },
     },
 }
 
-"""
-# SSP4 adjustment targets 
-adjustment_targets = {
-    "animal_foods": {
-        "Low income": 0.00,
-        "Lower middle income": 0.00,
-        "Upper middle income": 0.10,
-        "High income": 0.05,
-    },
-    "plant_foods": {
-        "Low income": -0.20,
-        "Lower middle income": -0.10,
-        "Upper middle income": 0.10,
-        "High income": 0.20,
-    },
-    "empty_calories": {
-        "Low income": 0.30,
-        "Lower middle income": 0.20,
-        "Upper middle income": 0.10,
-        "High income": -0.10,
-    },
-    "fatty_acids": {
-        "Low income": -0.20,
-        "Lower middle income": -0.10,
-        "Upper middle income": 0.10,
-        "High income": 0.20,
-    },
-}
-"""
-"""
-# SSP5 adjustment targets 
-adjustment_targets = {
-    "animal_foods": {
-        "Low income": 0.00,
-        "Lower middle income": 0.00,
-        "Upper middle income": 0.00,
-        "High income": 0.00,
-    },
-    "plant_foods": {
-        "Low income": 0.15,
-        "Lower middle income": 0.10,
-        "Upper middle income": 0.10,
-        "High income": 0.10,
-    },
-    "empty_calories": {
-        "Low income": -0.05,
-        "Lower middle income": -0.05,
-        "Upper middle income": -0.10,
-        "High income": -0.10,
-    },
-    "fatty_acids": {
-        "Low income": 0.05,
-        "Lower middle income": 0.05,
-        "Upper middle income": 0.05,
-        "High income": 0.05,
-    },
-}
-"""
-merge = pd.merge(SSP_demand_prop, income_brackets, on="ISO3", how="inner")
-
 column_mapping = {
     "Demand for animal source foods (kcal/capita/day)": "animal_foods",
     "Demand for empty calories (kcal/capita/day)": "empty_calories",
     "Demand for vegetables fruits and nuts (kcal/capita/day)": "plant_foods",
 }
 
-def compute_adjustment(year, income_group, category_key):
-    target = adjustment_targets[category_key].get(income_group, 0)
-    years_elapsed = year - 2020
+
+def load_SSP_demand(ssp, data_root="../Data"):
+    """
+    Cleans and loads the raw SSP demand file and converts it to proportions relative to 2020.
+    Returns a DataFrame with columns ISO3, year and the three demand categories.
+    """
+    return SSP_demand_proportions(read_SSP_demand(ssp, data_root))
+
+
+def read_SSP_demand(ssp, data_root="../Data"):
+    """
+    Cleans and loads the raw SSP demand file of one SSP.
+    Returns the raw demand DataFrame.
+    """
+    raw_SSP_path = f"{data_root}/Demand_SSPs/{ssp}.txt"
+    clean_SSP_path = f"{data_root}/Demand_SSPs/Cleaned_Files/{ssp}_cleaned.txt"
+
+    # ---------------------------------------------------------------------
+    # 1. CLEAN & LOAD RAW SSP DEMAND FILE
+    # ---------------------------------------------------------------------
+    with open(raw_SSP_path, "r") as f:
+        lines = [line.strip().strip('"') for line in f]
+
+    with open(clean_SSP_path, "w") as f:
+        f.write("\n".join(lines))
+
+    return pd.read_csv(clean_SSP_path, delimiter=",")
+
+
+def SSP_demand_proportions(SSP_demand):
+    """
+    Converts the raw demand of one SSP (output of read_SSP_demand) to proportions relative to 2020.
+    Returns a DataFrame with columns ISO3, year and the three demand categories.
+    """
+    # rename columns and filter years
+    SSP_demand = SSP_demand.rename(columns={"dummy": "year", "dummy.1": "ISO3"})
+    SSP_demand["year"] = SSP_demand["year"].str.replace("y", "").astype(int)
+    SSP_demand = SSP_demand[SSP_demand["year"].isin(TARGET_YEARS)]
+
+    cols_keep = ["year", "ISO3"] + list(column_mapping)
+    SSP_demand = SSP_demand[cols_keep]
+
+    # ---------------------------------------------------------------------
+    # 2. CONVERT TO PROPORTIONS RELATIVE TO 2020
+    # ---------------------------------------------------------------------
+    SSP_demand = SSP_demand.set_index(["ISO3", "year"])
+
+    baseline = SSP_demand.loc[SSP_demand.index.get_level_values("year") == 2020]
+    baseline_reindexed = (
+        baseline.groupby(level="ISO3")
+        .first()
+        .loc[SSP_demand.index.get_level_values("ISO3")]
+        .set_index(SSP_demand.index)
+    )
+
+    return (SSP_demand / baseline_reindexed).reset_index()
+
+
+def compute_adjustment(year, income_group, category_key, adjustment_targets):
+    """
+    Adjustment factors of one demand category for all rows at once.
+    year, income_group: columns (or scalars) with the year and the income group of each row
+    Returns an array of factors (income groups without a target are not adjusted).
+    """
+    target = pd.Series(income_group).map(adjustment_targets[category_key]).fillna(0).to_numpy()
+    years_elapsed = np.asarray(year) - 2020
     # Linearly phase in target over 30 years (2020–2050)
     return 1 + (target / 30) * years_elapsed
 
-# apply adjustments for plant/animal/empty
-for col, cat_key in column_mapping.items():
-    factor_col = f"{col}_adj_factor"
-    adj_col = f"{col}_adj"
 
-    merge[factor_col] = merge.apply(
-        lambda row: compute_adjustment(row["year"], row["IncomeGroup"], cat_key),
-        axis=1,
+def load_income_groups(data_root="../Data"):
+    """
+    Loads the income group of each country (shared by all SSPs).
+    Returns a DataFrame with columns ISO3 and IncomeGroup.
+    """
+    income_brackets = pd.read_csv(
+        f"{data_root}/Demand_SSPs/Metadata_Country_API_NY.GDP.MKTP.PP.CD_DS2_en_csv_v2_132008.csv",
+        usecols=[0, 2],
+    )
+    return income_brackets.rename(columns={"Country Code": "ISO3"})
+
+
+def calculate_SSP_proportions(ssp, data_root="../Data", SSP_demand=None, income_brackets=None):
+    """
+    Calculates the income group adjusted demand proportions of one SSP.
+    ssp: one of 'SSP1', 'SSP2', 'SSP3', 'SSP4', 'SSP5'
+    SSP_demand, income_brackets: raw demand of the SSP and income groups if already loaded (read_SSP_demand,
+                                 load_income_groups), otherwise they are read from data_root
+    Returns a DataFrame with the adjusted demand proportions and the fatty acids adjustment factor per ISO3 and year.
+    """
+    if ssp not in ADJUSTMENT_TARGETS:
+        raise ValueError("ssp must be one of: SSP1, SSP2, SSP3, SSP4, SSP5")
+    adjustment_targets = ADJUSTMENT_TARGETS[ssp]
+
+    if SSP_demand is None:
+        SSP_demand = read_SSP_demand(ssp, data_root)
+    SSP_demand_prop = SSP_demand_proportions(SSP_demand)
+
+    # ---------------------------------------------------------------------
+    # 3. LOAD INCOME GROUPS AND APPLY ADJUSTMENTS
+    # ---------------------------------------------------------------------
+    if income_brackets is None:
+        income_brackets = load_income_groups(data_root)
+
+    merge = pd.merge(SSP_demand_prop, income_brackets, on="ISO3", how="inner")
+
+    # apply adjustments for plant/animal/empty
+    for col, cat_key in column_mapping.items():
+        factor_col = f"{col}_adj_factor"
+        adj_col = f"{col}_adj"
+
+        merge[factor_col] = compute_adjustment(merge["year"], merge["IncomeGroup"], cat_key, adjustment_targets)
+        merge[adj_col] = merge[col] * merge[factor_col]
+
+    # separate fatty-acids factor (no direct column; just an adjustment factor)
+    merge["fatty_acids_adj_factor"] = compute_adjustment(
+        merge["year"], merge["IncomeGroup"], "fatty_acids", adjustment_targets
     )
-    merge[adj_col] = merge[col] * merge[factor_col]
-
-# separate fatty-acids factor (no direct column; just an adjustment factor)
-merge["fatty_acids_adj_factor"] = merge.apply(
-    lambda row: compute_adjustment(row["year"], row["IncomeGroup"], "fatty_acids"),
-    axis=1,
-)
-
-merge = merge[
-    [
-        "ISO3",
-        "year",
-        "IncomeGroup",
-        "Demand for animal source foods (kcal/capita/day)_adj",
-        "Demand for empty calories (kcal/capita/day)_adj",
-        "Demand for vegetables fruits and nuts (kcal/capita/day)_adj",
-        "fatty_acids_adj_factor",
+
+    return merge[
+        [
+            "ISO3",
+            "year",
+            "IncomeGroup",
+            "Demand for animal source foods (kcal/capita/day)_adj",
+            "Demand for empty calories (kcal/capita/day)_adj",
+            "Demand for vegetables fruits and nuts (kcal/capita/day)_adj",
+            "fatty_acids_adj_factor",
+        ]
     ]
-]
 
-merge.to_csv(OUTPUT_PROPORTIONS_PATH, index=False)
\ No newline at end of file
+
+def output_path(ssp, data_root="../Data"):
+    # saved where SSP_means.py reads the proportions from
+    return f"{data_root}/SSP Means/SSP_Proportions/{ssp}_proportions.csv"
+
+
+def main(ssp: str, data_root: str = "../Data"):
+    proportions = calculate_SSP_proportions(ssp, data_root)
+
+    out_path = output_path(ssp, data_root)
+    os.makedirs(os.path.dirname(out_path), exist_ok=True)
+    proportions.to_csv(out_path, index=False)
+    print(f"Saved SSP proportions to: {out_path}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description="Compute income group adjusted demand proportions (relative to 2020) for one SSP."
+    )
+    parser.add_argument(
+        '--ssp',
+        type=str,
+        required=True,
+        help="SSP scenario name (one of: SSP1, SSP2, SSP3, SSP4, SSP5)"
+    )
+    parser.add_argument('--data-root', type=str, default='../Data', help="root directory of the data")
+    args = parser.parse_args()
+    main(args.ssp, args.data_root)
@@ -1,57 +1,13 @@
-# script generates SSP specific means used as inputs for the final code 
+# script generates SSP specific means used as inputs for the final code
+import numpy as np
 import pandas as pd
+import argparse
+import os
 
-SSP_NAME = "SSP1"
-PROPORTIONS_PATH = f"../Data/SSP Means/SSP_Proportions/{SSP_NAME}_proportions.csv"
-OUTPUT_MEANS_PATH = f"../Data/SSP Means/SSP_means/{SSP_NAME}_means.csv"
+YEARS = [2020, 2025, 2030, 2035, 2040, 2045, 2050]
 
 # ---------------------------------------------------------------------
-# 1. LOAD SSP PROPORTIONS
-# ---------------------------------------------------------------------
-SSP_proportions = pd.read_csv(PROPORTIONS_PATH)
-
-rename_columns = {
-    "Demand for animal source foods (kcal/capita/day)_adj": "animal",
-    "Demand for empty calories (kcal/capita/day)_adj": "empty",
-    "Demand for vegetables fruits and nuts (kcal/capita/day)_adj": "plant",
-    "fatty_acids_adj_factor": "fatty_acids",
-}
-SSP_proportions = SSP_proportions.rename(columns=rename_columns)
-
-SSP_proportions_long = SSP_proportions.melt(
-    id_vars=["ISO3", "year", "IncomeGroup"],
-    var_name="category",
-    value_name="proportion",
-)
-SSP_proportions_long = SSP_proportions_long.rename(columns={"year": "Year"})
-
-# ---------------------------------------------------------------------
-# 2. LOAD BASELINE MEAN INTAKES (2017) AND EXPAND OVER YEARS
-# ---------------------------------------------------------------------
-mean_intakes = pd.read_csv("../Data/GBD 2017/Central_Values/dietary_means_2017_corrected.csv")
-mean_intakes = mean_intakes.drop(columns="Year")
-
-years = [2020, 2025, 2030, 2035, 2040, 2045, 2050]
-years_df = pd.DataFrame({"Year": years})
-years_df["key"] = 1
-
-mean_intakes["key"] = 1
-mean_intakes_expanded = mean_intakes.merge(years_df, on="key").drop(columns="key")
-
-# ---------------------------------------------------------------------
-# 3. MAP LOCATIONS TO ISO3
-# ---------------------------------------------------------------------
-Country_Codes = pd.read_csv(
-    "../Data/Country_Codes_FAO_GBD_ISO_M49.csv", usecols=["ISO3", "GBD_2017_name"]
-)
-Country_Codes = Country_Codes.rename(columns={"GBD_2017_name": "Location"})
-
-mean_intakes_expanded_ISO3 = pd.merge(
-    mean_intakes_expanded, Country_Codes, on="Location", how="inner"
-)
-
-# ---------------------------------------------------------------------
-# 4. MAP RISKS TO DEMAND CATEGORIES
+# MAP RISKS TO DEMAND CATEGORIES
 # ---------------------------------------------------------------------
 risk_category_map = {
     "Diet high in red meat": "animal",
@@ -71,34 +27,122 @@ risk_category_map = {
     "Diet low in vegetables": "plant",
 }
 
-mean_intakes_expanded_ISO3["category"] = mean_intakes_expanded_ISO3["Risk"].map(
-    risk_category_map
-)
-
-# ---------------------------------------------------------------------
-# 5. MERGE PROPORTIONS AND CALCULATE PROJECTED MEANS
-# ---------------------------------------------------------------------
-projected_df = mean_intakes_expanded_ISO3.merge(
-    SSP_proportions_long, on=["ISO3", "Year", "category"], how="left"
-)
-
-projected_df["Mean_projected"] = projected_df["Mean"] * projected_df["proportion"]
-projected_df["Lower_projected"] = projected_df["Lower"] * projected_df["proportion"]
-projected_df["Upper_projected"] = projected_df["Upper"] * projected_df["proportion"]
-
-projected_df = projected_df[
-    [
-        "Risk",
-        "Year",
-        "Location",
-        "Age Group",
-        "Sex",
-        "Unit",
-        "Mean_projected",
-        "Lower_projected",
-        "Upper_projected",
-    ]
-]
-
-projected_df.to_csv(OUTPUT_MEANS_PATH, index=False)
 
+def load_SSP_proportions(ssp, data_root="../Data", SSP_proportions=None):
+    """
+    Loads the demand proportions of one SSP (output of SSP_Proportions.py) in long format.
+    SSP_proportions: proportions of the SSP if already calculated, otherwise they are read from data_root
+    Returns a DataFrame with columns ISO3, Year, IncomeGroup, category and proportion.
+    """
+    # ---------------------------------------------------------------------
+    # 1. LOAD SSP PROPORTIONS
+    # ---------------------------------------------------------------------
+    if SSP_proportions is None:
+        SSP_proportions = pd.read_csv(f"{data_root}/SSP Means/SSP_Proportions/{ssp}_proportions.csv")
+
+    rename_columns = {
+        "Demand for animal source foods (kcal/capita/day)_adj": "animal",
+        "Demand for empty calories (kcal/capita/day)_adj": "empty",
+        "Demand for vegetables fruits and nuts (kcal/capita/day)_adj": "plant",
+        "fatty_acids_adj_factor": "fatty_acids",
+    }
+    SSP_proportions = SSP_proportions.rename(columns=rename_columns)
+
+    SSP_proportions_long = SSP_proportions.melt(
+        id_vars=["ISO3", "year", "IncomeGroup"],
+        var_name="category",
+        value_name="proportion",
+    )
+    return SSP_proportions_long.rename(columns={"year": "Year"})
+
+
+def load_baseline_means(data_root="../Data"):
+    """
+    Loads the 2017 mean intakes and maps locations and risks to ISO3 codes and demand categories.
+    Returns a DataFrame with one row per risk, location, age group and sex (the same for all SSPs).
+    """
+    # ---------------------------------------------------------------------
+    # 2. LOAD BASELINE MEAN INTAKES (2017)
+    # ---------------------------------------------------------------------
+    mean_intakes = pd.read_csv(f"{data_root}/GBD 2017/Central_Values/dietary_means_2017_corrected.csv")
+    mean_intakes = mean_intakes.drop(columns="Year")
+
+    # ---------------------------------------------------------------------
+    # 3. MAP LOCATIONS TO ISO3
+    # ---------------------------------------------------------------------
+    Country_Codes = pd.read_csv(
+        f"{data_root}/Country_Codes_FAO_GBD_ISO_M49.csv", usecols=["ISO3", "GBD_2017_name"]
+    )
+    Country_Codes = Country_Codes.rename(columns={"GBD_2017_name": "Location"})
+
+    mean_intakes_ISO3 = pd.merge(mean_intakes, Country_Codes, on="Location", how="inner")
+
+    # ---------------------------------------------------------------------
+    # 4. MAP RISKS TO DEMAND CATEGORIES
+    # ---------------------------------------------------------------------
+    mean_intakes_ISO3["category"] = mean_intakes_ISO3["Risk"].map(risk_category_map)
+    return mean_intakes_ISO3
+
+
+def calculate_SSP_means(ssp, data_root="../Data", SSP_proportions=None, baseline_means=None):
+    """
+    Projects the 2017 mean intakes with the demand proportions of one SSP.
+    ssp: one of 'SSP1', 'SSP2', 'SSP3', 'SSP4', 'SSP5'
+    SSP_proportions, baseline_means: proportions of the SSP and baseline means (the same for all SSPs) if already
+                                     loaded (output of SSP_Proportions.py and load_baseline_means), otherwise they
+                                     are read from data_root
+    Returns a DataFrame with the projected means (and bounds) per risk, year, location, age group and sex.
+    """
+    SSP_proportions_long = load_SSP_proportions(ssp, data_root, SSP_proportions)
+    if baseline_means is None:
+        baseline_means = load_baseline_means(data_root)
+
+    # ---------------------------------------------------------------------
+    # 5. BROADCAST PROPORTIONS OVER THE BASELINE MEANS
+    # ---------------------------------------------------------------------
+    # proportions per (ISO3, category) and year, one row per baseline row (NaN if the SSP has no proportions for
+    # the country or the risk has no demand category)
+    proportions = SSP_proportions_long.pivot(index=["ISO3", "category"], columns="Year", values="proportion")
+    proportions = proportions.reindex(columns=YEARS)
+    factors = proportions.reindex(
+        pd.MultiIndex.from_arrays([baseline_means["ISO3"], baseline_means["category"]])
+    ).to_numpy()
+
+    # projected means (and bounds) of each baseline row and year (dim baseline rows x years)
+    projected_df = baseline_means.loc[
+        baseline_means.index.repeat(len(YEARS)), ["Risk", "Location", "Age Group", "Sex", "Unit"]
+    ].reset_index(drop=True)
+    projected_df.insert(1, "Year", np.tile(YEARS, len(baseline_means)))
+    for column in ["Mean", "Lower", "Upper"]:
+        projected_df[f"{column}_projected"] = (baseline_means[column].to_numpy()[:, None] * factors).ravel()
+
+    return projected_df
+
+
+def output_path(ssp, data_root="../Data"):
+    # saved where the Marginals scenario reads the means from (means_per_SSP in the Setup_file)
+    return f"{data_root}/SSP Means/SSP_means/{ssp}_means.csv"
+
+
+def main(ssp: str, data_root: str = "../Data"):
+    projected_df = calculate_SSP_means(ssp, data_root)
+
+    out_path = output_path(ssp, data_root)
+    os.makedirs(os.path.dirname(out_path), exist_ok=True)
+    projected_df.to_csv(out_path, index=False)
+    print(f"Saved SSP means to: {out_path}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description="Compute SSP-specific projected mean intakes from the 2017 means and the SSP demand proportions."
+    )
+    parser.add_argument(
+        '--ssp',
+        type=str,
+        required=True,
+        help="SSP scenario name (one of: SSP1, SSP2, SSP3, SSP4, SSP5)"
+    )
+    parser.add_argument('--data-root', type=str, default='../Data', help="root directory of the data")
+    args = parser.parse_args()
+    main(args.ssp, args.data_root)
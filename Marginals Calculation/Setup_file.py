@@ -1,8 +1,44 @@
-from helpers import index_dict 
+import numpy as np
+from gbd_emulator.helpers import index_dict
+
+# time points of the projections
+time_points = np.array([2020, 2025, 2030, 2035, 2040, 2045, 2050]) # this is a place-holder; can have multiplie time-points to create projections into the future
+# the SSP means and YLL/YLD projections are given for 2020 and 2025-2050 in 5-year steps, time points in between are
+# interpolated linearly (e.g. np.arange(2020, 2051) for annual steps); all time points of a country are calculated in
+# one pass
+
+# central index dictionary used across all scripts for this analytical scenario
+index_dict = dict(index_dict, time_points=time_points)
+
+# SSP of the projections (the SSP specific paths below are built from it)
+SSP_name = 'SSP1'
+# SSPs compared in one run, e.g. ['SSP1', 'SSP2', 'SSP3', 'SSP4', 'SSP5'] (None: only SSP_name); the inputs that do not
+# depend on the SSP are loaded once, the SSPs are calculated together and saved to one dataset partitioned by SSP
+# (SSP_comparison_path)
+SSP_names = None
 
 # for uncertainty calculations (for a 1000 runs, num_runs = 1000)
 num_runs = 1 #set to 1 if using central values 
 sample_size = 1000
+# seed of the random streams of the sampling (each country, run, risk, age and sex combination gets its own stream)
+random_seed = 0
+# sampling of the intake distributions: 'random' (independent random numbers), 'latin-hypercube' or 'sobol'
+# (stratified / quasi-random numbers, less Monte Carlo noise in the PAFs at the same sample size; 'sobol' needs a
+# power of 2 as sample_size, e.g. 1024)
+sampling_method = 'random'
+
+# integration of the PAFs: 'equal-width' (100 equally wide bins, Simpson's rule on the bin centers) or 'adaptive'
+# (PAF_bins bins at the sample quantiles and the TMREL; with PAF_tolerance the bins are doubled from 8 up to PAF_bins
+# until the estimated error of the PAF is below the tolerance)
+PAF_binning = 'equal-width'
+PAF_bins = 100
+PAF_tolerance = None
+# estimator of the PAFs: 'histogram' (integral of the histogram of the sample, binned as set above) or 'sample-mean'
+# (ratio of the sample means E[RR(X) - 1] / E[RR(X)] of all combinations at once, without binning error)
+PAF_estimator = 'histogram'
+# precision of the intake samples and the RRs calculated from them: 'float64' or 'float32' (half the memory traffic;
+# the PAF integrals, joint PAFs and DALYs are accumulated in float64)
+precision = 'float64'
 
 # setup the file paths the files needed for the calculation
 # GBD paths
@@ -13,20 +49,69 @@ dietary_risk_factors_path = '../Data/GBD 2017/Dietry_risks_relative_risk_factors
 
 # input exposure data 
 GBD_centralval_path = '../Data/GBD 2017/Central_Values/{}_central_{}.csv'
-means_per_SSP = '../Data/SSP Means/SSP_means/SSP1_means.csv' # needs to be changed for every SSP
+means_per_SSP = f'../Data/SSP Means/SSP_means/{SSP_name}_means.csv'
  
 # file paths to data used to construct the distributions 
 distrbution_weights_path = '../Data/ensemble_distribution_weights.csv'
 min_max_path = '../Data/GBD 2017/relative_exposure_minmax.csv'
 
 # input data (total disease burden)
-# needs to be changed for every SSP 
-total_YLL_or_YLD_path_per_SSP = '../Data/SSP_YLL_YLD_Projections/SSPs/SSP1/SSP1_total_{}s_projected_gendered.csv'  
+total_YLL_or_YLD_path_per_SSP = f'../Data/SSP_YLL_YLD_Projections/SSPs/{SSP_name}/{SSP_name}_total_{{}}s_projected_gendered.csv'
  
 # M49 encoding of countries
 M49_path = '../Data/Country_Codes_FAO_GBD_ISO_M49.csv'
 
+# groups of the predictions (see gbd_emulator/aggregation.py)
+# age bands, name -> (lowest, highest) start age of the included age groups, highest excluded (None: no bound); one
+# output per band
+age_bands = {'all_ages': (None, None), 'below70': (None, 70)}
+# sex, disease and country groups, name -> members (None: all), e.g. {'Cancers': ['Colon and rectum cancer', ...]}
+# for the diseases or regions and income groups for the countries. Without sex (disease) groups the DALYs are summed
+# over the sexes (diseases), the country groups are added next to the countries
+sex_groups = None
+disease_groups = None
+country_groups = None
+# country groups read from group tables (see gbd_emulator/helpers_data_and_setup.py, added to country_groups): column
+# of the groups -> path of a csv table with the ISO3 codes of the countries ('ISO3' or 'Country Code') and the column,
+# e.g. the World Bank income groups
+# {'IncomeGroup': '../Data/Demand_SSPs/Metadata_Country_API_NY.GDP.MKTP.PP.CD_DS2_en_csv_v2_132008.csv'} or a table of
+# the WHO regions (the names of all groups have to be unique)
+country_group_tables = None
+# the country groups are the sums of their countries for every run; with per_capita = True the DALYs per capita are
+# saved next to the DALYs (divided by the population under the SSP in the year, population_path, for a country group
+# by the population of its countries)
+per_capita = False
+population_path = '../Data/f09_pop_iso(in).csv'
+# whether the countries are saved next to the country groups (False: only the country groups are saved)
+save_countries = True
+# runs in the predictions: 'first' (run 0, one column per year), 'all' (one column per run) or 'summary' (mean,
+# standard deviation and 2.5%, 50% and 97.5% percentiles over the runs)
+run_output = 'first'
 
+# path were the predictions are saved, formatted with the name of the age band ('all_ages', 'below70', ...)
+saving_path = f'../Data/Predictions/Marginals/{SSP_name}/{SSP_name}_{{}}.csv'
+# folder of the predictions of several SSPs (SSP_names), formatted with the name of the age band; one subfolder per SSP
+# ('ssp=SSP1', ...)
+SSP_comparison_path = '../Data/Predictions/Marginals/all_SSPs/{}'
 
- 
- 
\ No newline at end of file
+# parallel execution: number of worker processes and number of countries per chunk (None splits the countries evenly
+# over the workers); with num_workers = 1 everything runs in the current process
+num_workers = 1
+chunk_size = None
+
+# format of the saved predictions ('csv' or 'parquet')
+output_format = 'csv'
+
+# profiling: path of the timing report per stage (JSON or CSV, None: the report is only printed) and optional capture
+# of the whole run with 'cprofile' or 'pyinstrument' (saved to profiler_path)
+timing_report_path = None
+profiler = None
+profiler_path = None
+
+# convergence telemetry of the parameter fitting: path of the report per country, risk, distribution family and
+# method (JSON or CSV, None: only the summary per family and method is printed)
+convergence_report_path = None
+
+# truncation diagnostics of the intake distributions: path of the report of the probability mass per country, risk
+# and distribution family that lies outside of the limits of relative_exposure_minmax.csv (JSON or CSV, None: no report)
+truncation_report_path = None
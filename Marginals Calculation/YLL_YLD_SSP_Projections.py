@@ -2,83 +2,94 @@ import pandas as pd
 import argparse
 import os
 
+# raw tables read by this process (GBD 2021 totals with normalised age labels, metadata lookups, SSP population), kept
+# for the following functions, measures and SSPs of the same run. The cached tables are never modified, the functions
+# work on copies or build new tables from them
+_cache = {}
 
-def build_gendered_yld_projections():
+
+def normalise_age_labels(ages: pd.Series) -> pd.Series:
+    """
+    Converts the GBD 2021 age labels ('25-29 years', '95+ years') to the labels of the metadata ('25 to 29', '95 plus').
+    The labels are converted through a mapping table of the distinct labels (categories) instead of per row.
+    Returns Series of the converted labels.
+    """
+    ages = ages.astype('category')
+    mapping = (
+        pd.Series(ages.cat.categories, index=ages.cat.categories)
+        .str.replace(' years', '', regex=False)
+        .str.replace('-', ' to ', regex=False)
+        .str.replace('+', ' plus', regex=False)
+    )
+    return ages.map(mapping).astype(object)
+
+
+def load_GBD_2021_totals(measure: str = 'YLD', data_root: str = '../Data') -> pd.DataFrame:
+    """
+    Loads the GBD 2021 totals per sex of a measure with the age labels of the metadata (read once per process).
+    Returns the cached DataFrame (not to be modified) with the columns of total_{measure}s_gendered.csv.
+    """
+    path = f'{data_root}/GBD 2021/total YLLs and YLDs/total_{measure}s_gendered.csv'
+    if path not in _cache:
+        totals = pd.read_csv(path)
+        totals['age'] = normalise_age_labels(totals['age'])
+        _cache[path] = totals
+    return _cache[path]
+
+
+def load_metadata(data_root: str = '../Data') -> dict:
+    """
+    Loads the names of the ids of the GBD projections (read once per process).
+    Returns dict of Series from the ids to the names, per column of the projections.
     """
-    Build sex-specific YLD projections (central values) from GBD projections and 2021 splits,
+    meta = f'{data_root}/SSP_YLL_YLD_Projections/meta_data'
+    if meta not in _cache:
+        _cache[meta] = {
+            'age_group_id': pd.read_csv(f'{meta}/meta_age_group.csv').set_index('age_group_id')['age_group_name'],
+            'location_id': pd.read_csv(f'{meta}/meta_locations.csv').set_index('location_id')['location_name'],
+            'sex_id': pd.read_csv(f'{meta}/meta_sex.csv').set_index('sex_id')['sex'],
+            'acause': pd.read_csv(f'{meta}/meta_cause.csv').set_index('acause')['cause_name']
+        }
+    return _cache[meta]
+
+
+def build_gendered_yld_projections(measure: str = 'YLD', data_root: str = '../Data'):
+    """
+    Build sex-specific YLD (or YLL) projections (central values) from GBD projections and 2021 splits,
     with uncertainty bounds propagated from 2021 ratios.
+    measure: 'YLD' or 'YLL'
     Returns a DataFrame with columns:
     ['year', 'location', 'cause', 'age', 'sex', 'val', 'lower', 'upper']
     for years 2025–2050.
     """
     # load GBD YLD projections ----------
-    projections = pd.read_csv('../Data/SSP_YLL_YLD_Projections/YLD.csv') # replace with YLL file if needed 
+    projections = pd.read_csv(f'{data_root}/SSP_YLL_YLD_Projections/{measure}.csv')
 
     # select rows where age is 25+ years
     selected_age_id = [10, 11, 12, 13, 14, 15, 16,
                        17, 18, 19, 20, 30, 31, 32, 235]
     projections = projections[projections['age_group_id'].isin(selected_age_id)]
 
-    # load meta data
-    age_meta = pd.read_csv('../Data/SSP_YLL_YLD_Projections/meta_data/meta_age_group.csv')
-    cause_meta = pd.read_csv('../Data/SSP_YLL_YLD_Projections/meta_data/meta_cause.csv')
-    locations_meta = pd.read_csv('../Data/SSP_YLL_YLD_Projections/meta_data/meta_locations.csv')
-    sex_meta = pd.read_csv('../Data/SSP_YLL_YLD_Projections/meta_data/meta_sex.csv')
-
-    # merge projections with metadata
-    projections_fin = pd.merge(projections, age_meta, on='age_group_id', how='left')
-    projections_fin = pd.merge(projections_fin, locations_meta, on='location_id', how='left')
-    projections_fin = pd.merge(projections_fin, sex_meta, on='sex_id', how='left')
-    projections_fin = pd.merge(projections_fin, cause_meta, on='acause', how='left')
-
-    # drop and tidy columns
-    projections_fin.drop(
-        columns=['statistic', 'scenario', 'sex_id', 'age_group_id',
-                 'location_id', 'cause_id', 'acause'],
-        inplace=True
-    )
-    projections_fin.rename(
-        columns={
-            'year_id': 'year',
-            'age_group_name': 'age',
-            'location_name': 'location',
-            'cause_name': 'cause'
-        },
-        inplace=True
-    )
-    projections_fin = projections_fin[['location', 'age', 'cause', 'sex', 'value', 'year']]
-
-    # load 2021 YLD values and compute sex proportions 
-    YLD_2021 = pd.read_csv('../Data/GBD 2021/total YLLs and YLDs/total_YLDs_gendered.csv')
-
-    # group by location, age and cause, summing over sex
-    grouped = YLD_2021.groupby(['location', 'age', 'cause'])
-    YLD_2021['total_val'] = grouped['val'].transform('sum')
-    YLD_2021['total_val_upper'] = grouped['upper'].transform('sum')
-    YLD_2021['total_val_lower'] = grouped['lower'].transform('sum')
-
-    # proportions per sex
-    YLD_2021['proportions'] = YLD_2021['val'] / YLD_2021['total_val']
-    YLD_2021['proportions_upper'] = YLD_2021['upper'] / YLD_2021['total_val_upper']
-    YLD_2021['proportions_lower'] = YLD_2021['lower'] / YLD_2021['total_val_lower']
-
-    YLD_2021.drop(
-        columns=['total_val', 'total_val_upper', 'total_val_lower',
-                 'measure', 'metric', 'year', 'val', 'upper', 'lower',
-                 'proportions_upper', 'proportions_lower'],
-        inplace=True
-    )
-    YLD_2021 = YLD_2021[['location', 'age', 'cause', 'sex', 'proportions']]
-
-    # normalise age labels to match metadata if needed
-    YLD_2021['age'] = (
-        YLD_2021['age']
-        .str.replace(' years', '', regex=False)
-        .str.replace('-', ' to ', regex=False)
-        .str.replace('+', ' plus', regex=False)
+    # names of the metadata ids
+    metadata = load_metadata(data_root)
+    projections_fin = pd.DataFrame({
+        'location': projections['location_id'].map(metadata['location_id']),
+        'age': projections['age_group_id'].map(metadata['age_group_id']),
+        'cause': projections['acause'].map(metadata['acause']),
+        'sex': projections['sex_id'].map(metadata['sex_id']),
+        'value': projections['value'],
+        'year': projections['year_id']
+    })
+
+    # 2021 YLD values (age labels normalised to the metadata) and sex proportions
+    totals_2021 = load_GBD_2021_totals(measure, data_root)
+
+    # proportions per sex, summing over sex per location, age and cause
+    YLD_2021 = totals_2021[['location', 'age', 'cause', 'sex']].copy()
+    YLD_2021['proportions'] = (
+        totals_2021['val'] / totals_2021.groupby(['location', 'age', 'cause'])['val'].transform('sum')
     )
 
-
     # expand "Both" projections into Male/Female using 2021 proportions ----------
     projections_expanded = pd.concat(
         [
@@ -106,19 +117,9 @@ def build_gendered_yld_projections():
     projections_gendered = merged[merged['year'].isin([2025, 2030, 2035, 2040, 2045, 2050])]
 
     # add uncertainty bounds via 2021 ratios ----------
-    YLD_2021_bounds = pd.read_csv('../Data/GBD 2021/total YLLs and YLDs/total_YLDs_gendered.csv')
-
-    YLD_2021_bounds['age'] = (
-        YLD_2021_bounds['age']
-        .str.replace(' years', '', regex=False)
-        .str.replace('-', ' to ', regex=False)
-        .str.replace('+', ' plus', regex=False)
-    )
-
-    YLD_2021_bounds['lower_ratio'] = YLD_2021_bounds['lower'] / YLD_2021_bounds['val']
-    YLD_2021_bounds['upper_ratio'] = YLD_2021_bounds['upper'] / YLD_2021_bounds['val']
-
-    ratios_df = YLD_2021_bounds[['location', 'age', 'sex', 'cause', 'lower_ratio', 'upper_ratio']]
+    ratios_df = totals_2021[['location', 'age', 'sex', 'cause']].copy()
+    ratios_df['lower_ratio'] = totals_2021['lower'] / totals_2021['val']
+    ratios_df['upper_ratio'] = totals_2021['upper'] / totals_2021['val']
 
     merged_bounds = pd.merge(
         projections_gendered,
@@ -136,21 +137,12 @@ def build_gendered_yld_projections():
     return merged_bounds
 
 
-def add_baseline_2020(merged_bounds: pd.DataFrame) -> pd.DataFrame:
+def add_baseline_2020(merged_bounds: pd.DataFrame, measure: str = 'YLD', data_root: str = '../Data') -> pd.DataFrame:
     """
     Add 2020 baseline (from 2021 GBD totals) to the projected YLDs.
     Returns stacked DataFrame with years 2020 + 2025–2050.
     """
-    baseline = pd.read_csv('../Data/GBD 2021/total YLLs and YLDs/total_YLDs_gendered.csv')
-
-    baseline['age'] = (
-        baseline['age']
-        .str.replace(' years', '', regex=False)
-        .str.replace('-', ' to ', regex=False)
-        .str.replace('+', ' plus', regex=False)
-    )
-
-    baseline.drop(columns=['measure', 'metric', 'year'], inplace=True)
+    baseline = load_GBD_2021_totals(measure, data_root).drop(columns=['measure', 'metric', 'year'])
     baseline['year'] = 2020
 
     # align column order to merged_bounds
@@ -162,17 +154,34 @@ def add_baseline_2020(merged_bounds: pd.DataFrame) -> pd.DataFrame:
     return stacked_df
 
 
-def apply_ssp_scaling(stacked_df: pd.DataFrame, ssp: str) -> pd.DataFrame:
+def project_burden(measure: str = 'YLD', data_root: str = '../Data') -> pd.DataFrame:
     """
-    Apply SSP-specific population proportions to YLDs.
-    ssp: one of 'SSP1', 'SSP2', 'SSP3', 'SSP4', 'SSP5'
-    Returns DataFrame with SSP-scaled val_SSP, lower_SSP, upper_SSP.
+    Gendered projections with the 2020 baseline, the part of the projections that is the same for all SSPs.
+    measure: 'YLD' or 'YLL'
+    Returns stacked DataFrame with years 2020 + 2025–2050.
     """
-    if ssp not in ['SSP1', 'SSP2', 'SSP3', 'SSP4', 'SSP5']:
-        raise ValueError("ssp must be one of: SSP1, SSP2, SSP3, SSP4, SSP5")
+    if measure not in ['YLD', 'YLL']:
+        raise ValueError("measure must be one of: YLD, YLL")
+
+    # build gendered projections (central + bounds) for projection years
+    merged_bounds = build_gendered_yld_projections(measure, data_root)
+
+    # add 2020 baseline
+    return add_baseline_2020(merged_bounds, measure, data_root)
+
+
+def load_SSP_population(data_root: str = '../Data') -> pd.DataFrame:
+    """
+    Loads the population of all SSPs relative to SSP2 per GBD location and year (shared by all SSPs and measures,
+    read once per process).
+    Returns the cached DataFrame (not to be modified) with columns year, location and SSP1_prop ... SSP5_prop.
+    """
+    path = f'{data_root}/f09_pop_iso(in).csv'
+    if path in _cache:
+        return _cache[path]
 
     SSP_pop = pd.read_csv(
-        '../Data/f09_pop_iso(in).csv',
+        path,
         skiprows=4,
         usecols=['year', 'ISO3', 'SSP1', 'SSP2', 'SSP3', 'SSP4', 'SSP5']
     )
@@ -192,12 +201,27 @@ def apply_ssp_scaling(stacked_df: pd.DataFrame, ssp: str) -> pd.DataFrame:
 
     # Attach GBD locations
     Country_Codes = pd.read_csv(
-        '../Data/Country_Codes_FAO_GBD_ISO_M49.csv',
+        f'{data_root}/Country_Codes_FAO_GBD_ISO_M49.csv',
         usecols=['GBD_name', 'ISO3']
     )
     Country_Codes.rename(columns={'GBD_name': 'location'}, inplace=True)
 
-    merged_pop = pd.merge(SSP_pop, Country_Codes, on='ISO3', how='left')
+    _cache[path] = pd.merge(SSP_pop, Country_Codes, on='ISO3', how='left')
+    return _cache[path]
+
+
+def apply_ssp_scaling(stacked_df: pd.DataFrame, ssp: str, data_root: str = '../Data',
+                      SSP_population: pd.DataFrame = None) -> pd.DataFrame:
+    """
+    Apply SSP-specific population proportions to YLDs.
+    ssp: one of 'SSP1', 'SSP2', 'SSP3', 'SSP4', 'SSP5'
+    SSP_population: output of load_SSP_population if already loaded, otherwise it is read from data_root
+    Returns DataFrame with SSP-scaled val_SSP, lower_SSP, upper_SSP.
+    """
+    if ssp not in ['SSP1', 'SSP2', 'SSP3', 'SSP4', 'SSP5']:
+        raise ValueError("ssp must be one of: SSP1, SSP2, SSP3, SSP4, SSP5")
+
+    merged_pop = SSP_population if SSP_population is not None else load_SSP_population(data_root)
 
     prop_col = f'{ssp}_prop'
     if prop_col not in merged_pop.columns:
@@ -222,28 +246,28 @@ def apply_ssp_scaling(stacked_df: pd.DataFrame, ssp: str) -> pd.DataFrame:
     return final
 
 
-def main(ssp: str):
-    # build gendered YLD projections (central + bounds) for projection years
-    merged_bounds = build_gendered_yld_projections()
+def output_path(ssp: str, measure: str = 'YLD', data_root: str = '../Data') -> str:
+    # SSP-specific output, read by the Marginals scenario (total_YLL_or_YLD_path_per_SSP in the Setup_file)
+    return f'{data_root}/SSP_YLL_YLD_Projections/SSPs/{ssp}/{ssp}_total_{measure}s_projected_gendered.csv'
 
-    # add 2020 baseline
-    stacked_df = add_baseline_2020(merged_bounds)
+
+def main(ssp: str, measure: str = 'YLD', data_root: str = '../Data'):
+    # build gendered projections (central + bounds) for projection years and add 2020 baseline
+    stacked_df = project_burden(measure, data_root)
 
     # apply SSP scaling
-    final_ssp_df = apply_ssp_scaling(stacked_df, ssp)
+    final_ssp_df = apply_ssp_scaling(stacked_df, ssp, data_root)
 
     # save to SSP-specific output
-    out_dir = f'../Data/SSP_YLL_YLD_Projections/SSPs/{ssp}'
-    os.makedirs(out_dir, exist_ok=True)
-
-    out_path = os.path.join(out_dir, f'{ssp}_total_YLDs_projected_gendered.csv') # change out path for YLLs
+    out_path = output_path(ssp, measure, data_root)
+    os.makedirs(os.path.dirname(out_path), exist_ok=True)
     final_ssp_df.to_csv(out_path, index=False)
-    print(f"Saved SSP-scaled YLD projections to: {out_path}")
+    print(f"Saved SSP-scaled {measure} projections to: {out_path}")
 
 
 if __name__ == '__main__':
     parser = argparse.ArgumentParser(
-        description="Compute SSP-specific projected YLDs (gendered, with bounds) from GBD projections."
+        description="Compute SSP-specific projected YLDs or YLLs (gendered, with bounds) from GBD projections."
     )
     parser.add_argument(
         '--ssp',
@@ -251,5 +275,7 @@ if __name__ == '__main__':
         required=True,
         help="SSP scenario name (one of: SSP1, SSP2, SSP3, SSP4, SSP5)"
     )
+    parser.add_argument('--measure', type=str, default='YLD', help="YLD or YLL")
+    parser.add_argument('--data-root', type=str, default='../Data', help="root directory of the data")
     args = parser.parse_args()
-    main(args.ssp)
\ No newline at end of file
+    main(args.ssp, args.measure, args.data_root)
\ No newline at end of file
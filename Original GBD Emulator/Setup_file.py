@@ -1,8 +1,27 @@
-from helpers import index_dict 
+from gbd_emulator.helpers import index_dict
 
 # for uncertainty calculations (for a 1000 runs, num_runs = 1000)
 num_runs = 1 # set to 1 if using just the central values 
 sample_size = 1000
+# seed of the random streams of the sampling (each country, run, risk, age and sex combination gets its own stream)
+random_seed = 0
+# sampling of the intake distributions: 'random' (independent random numbers), 'latin-hypercube' or 'sobol'
+# (stratified / quasi-random numbers, less Monte Carlo noise in the PAFs at the same sample size; 'sobol' needs a
+# power of 2 as sample_size, e.g. 1024)
+sampling_method = 'random'
+
+# integration of the PAFs: 'equal-width' (100 equally wide bins, Simpson's rule on the bin centers) or 'adaptive'
+# (PAF_bins bins at the sample quantiles and the TMREL; with PAF_tolerance the bins are doubled from 8 up to PAF_bins
+# until the estimated error of the PAF is below the tolerance)
+PAF_binning = 'equal-width'
+PAF_bins = 100
+PAF_tolerance = None
+# estimator of the PAFs: 'histogram' (integral of the histogram of the sample, binned as set above) or 'sample-mean'
+# (ratio of the sample means E[RR(X) - 1] / E[RR(X)] of all combinations at once, without binning error)
+PAF_estimator = 'histogram'
+# precision of the intake samples and the RRs calculated from them: 'float64' or 'float32' (half the memory traffic;
+# the PAF integrals, joint PAFs and DALYs are accumulated in float64)
+precision = 'float64'
 
 # set unit for marginal
 unit_of_marginal = 'DALYs'
@@ -43,4 +62,26 @@ scenarios = [{'name': 'original_GBD',
               'diffs_saving_path': directory_path + 'Full_marginal_DALY_changes.csv',
               'costs_saving_path': directory_path + 'Full_marginal_costs.csv'}]
 
- 
\ No newline at end of file
+ 
+
+# parallel execution: number of worker processes and number of countries per chunk (None splits the countries evenly
+# over the workers); with num_workers = 1 everything runs in the current process
+num_workers = 1
+chunk_size = None
+
+# format of the saved predictions ('csv' or 'parquet')
+output_format = 'csv'
+
+# profiling: path of the timing report per stage (JSON or CSV, None: the report is only printed) and optional capture
+# of the whole run with 'cprofile' or 'pyinstrument' (saved to profiler_path)
+timing_report_path = None
+profiler = None
+profiler_path = None
+
+# convergence telemetry of the parameter fitting: path of the report per country, risk, distribution family and
+# method (JSON or CSV, None: only the summary per family and method is printed)
+convergence_report_path = None
+
+# truncation diagnostics of the intake distributions: path of the report of the probability mass per country, risk
+# and distribution family that lies outside of the limits of relative_exposure_minmax.csv (JSON or CSV, None: no report)
+truncation_report_path = None
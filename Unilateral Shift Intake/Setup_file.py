@@ -1,8 +1,35 @@
-from helpers import index_dict 
+import numpy as np
+from gbd_emulator.helpers import index_dict
+
+# categories for the unilateral shift scenarios
+scenario_names = np.array(['CT', 'FT']) # this is a place-holder and can be modified by the user (corresponds to scenario names in shift file, there could be multiple)
+time_points = np.array(['2025', '2030']) # this is a place-holder; can have multiplie time-points to create projections into the future
+
+# central index dictionary used across all scripts for this analytical scenario
+index_dict = dict(index_dict, scenario_names=scenario_names, time_points=time_points)
 
 # for uncertainty calculations (for a 1000 runs, num_runs = 1000)
 num_runs = 1 # set to 1 if using just the central values 
 sample_size = 1000
+# seed of the random streams of the sampling (each country, run, risk, age and sex combination gets its own stream)
+random_seed = 0
+# sampling of the intake distributions: 'random' (independent random numbers), 'latin-hypercube' or 'sobol'
+# (stratified / quasi-random numbers, less Monte Carlo noise in the PAFs at the same sample size; 'sobol' needs a
+# power of 2 as sample_size, e.g. 1024)
+sampling_method = 'random'
+
+# integration of the PAFs: 'equal-width' (100 equally wide bins, Simpson's rule on the bin centers) or 'adaptive'
+# (PAF_bins bins at the sample quantiles and the TMREL; with PAF_tolerance the bins are doubled from 8 up to PAF_bins
+# until the estimated error of the PAF is below the tolerance)
+PAF_binning = 'equal-width'
+PAF_bins = 100
+PAF_tolerance = None
+# estimator of the PAFs: 'histogram' (integral of the histogram of the sample, binned as set above) or 'sample-mean'
+# (ratio of the sample means E[RR(X) - 1] / E[RR(X)] of all combinations at once, without binning error)
+PAF_estimator = 'histogram'
+# precision of the intake samples and the RRs calculated from them: 'float64' or 'float32' (half the memory traffic;
+# the PAF integrals, joint PAFs and DALYs are accumulated in float64)
+precision = 'float64'
 
 # setup the file paths the files needed for the calculation
 # GBD paths
@@ -27,6 +54,54 @@ total_YLL_or_YLD_path = '../Data/Projections/total YLLs and YLDs/total_projected
 # M49 encoding of countries
 M49_path = '../Data/Country_Codes_FAO_GBD_ISO_M49.csv'
 
+# path were the predictions are saved, formatted with the DALY calculation mode ('J', 'NJ' or 'PJ')
+saving_path = '../Data/Predictions/Unilateral_Shift/DALYs_{}.csv'
+
+# groups of the predictions (see gbd_emulator/aggregation.py, None: the DALYs are summed over the dimension)
+# age bands, name -> (lowest, highest) start age of the included age groups, highest excluded (None: no bound), e.g.
+# {'below70': (None, 70), '70plus': (70, None)}
+age_bands = None
+# sex, disease and country groups, name -> members (None: all), e.g. {'Cancers': ['Colon and rectum cancer', ...]}
+# for the diseases or regions and income groups for the countries (the country groups are added next to the countries)
+sex_groups = None
+disease_groups = None
+country_groups = None
+# country groups read from group tables (see gbd_emulator/helpers_data_and_setup.py, added to country_groups): column
+# of the groups -> path of a csv table with the ISO3 codes of the countries ('ISO3' or 'Country Code') and the column,
+# e.g. the World Bank income groups
+# {'IncomeGroup': '../Data/Demand_SSPs/Metadata_Country_API_NY.GDP.MKTP.PP.CD_DS2_en_csv_v2_132008.csv'} or a table of
+# the WHO regions (the names of all groups have to be unique)
+country_group_tables = None
+# the country groups are the sums of their countries for every run; with per_capita = True the DALYs per capita are
+# saved next to the DALYs (divided by the population under population_SSP in the year, population_path, for a country
+# group by the population of its countries)
+per_capita = False
+population_path = '../Data/f09_pop_iso(in).csv'
+population_SSP = 'SSP2'
+# whether the countries are saved next to the country groups (False: only the country groups are saved)
+save_countries = True
+
+# introduces a flag to either execute non-joint or joint PAF calculations in Unilateral_Shift.py (both use the same code by different MFs)
+calculate_NJ_DALYs = False
+
+# parallel execution: number of worker processes and number of countries per chunk (None splits the countries evenly
+# over the workers); with num_workers = 1 everything runs in the current process
+num_workers = 1
+chunk_size = None
+
+# format of the saved predictions ('csv' or 'parquet')
+output_format = 'csv'
+
+# profiling: path of the timing report per stage (JSON or CSV, None: the report is only printed) and optional capture
+# of the whole run with 'cprofile' or 'pyinstrument' (saved to profiler_path)
+timing_report_path = None
+profiler = None
+profiler_path = None
 
+# convergence telemetry of the parameter fitting: path of the report per country, risk, distribution family and
+# method (JSON or CSV, None: only the summary per family and method is printed)
+convergence_report_path = None
 
- 
\ No newline at end of file
+# truncation diagnostics of the intake distributions: path of the report of the probability mass per country, risk
+# and distribution family that lies outside of the limits of relative_exposure_minmax.csv (JSON or CSV, None: no report)
+truncation_report_path = None
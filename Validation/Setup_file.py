@@ -1,41 +1,8 @@
-import numpy as np
+import os
+import sys
 
-# general values for country, diseases, risks, ages, and genders
-countries = np.array(['Afghanistan', 'Albania', 'Algeria', 'American Samoa', 'Andorra', 'Angola', 'Antigua and Barbuda',
-             'Argentina', 'Armenia', 'Australia', 'Austria', 'Azerbaijan', 'Bahrain', 'Bangladesh', 'Barbados',
-             'Belarus', 'Belgium', 'Belize', 'Benin', 'Bermuda', 'Bhutan', 'Bolivia', 'Bosnia and Herzegovina',
-             'Botswana', 'Brazil', 'Brunei', 'Bulgaria', 'Burkina Faso', 'Burundi', 'Cambodia', 'Cameroon', 'Canada',
-             'Cape Verde', 'Central African Republic', 'Chad', 'Chile', 'China', 'Colombia', 'Comoros', 'Congo',
-             'Costa Rica', "Cote d'Ivoire", 'Croatia', 'Cuba', 'Cyprus', 'Czech Republic',
-             'Democratic Republic of the Congo', 'Denmark', 'Djibouti', 'Dominica', 'Dominican Republic', 'Ecuador',
-             'Egypt', 'El Salvador', 'Equatorial Guinea', 'Eritrea', 'Estonia', 'Ethiopia',
-             'Federated States of Micronesia', 'Fiji', 'Finland', 'France', 'Gabon', 'Georgia', 'Germany', 'Ghana',
-             'Greece', 'Greenland', 'Grenada', 'Guam', 'Guatemala', 'Guinea', 'Guinea-Bissau', 'Guyana', 'Haiti',
-             'Honduras', 'Hungary', 'Iceland', 'India', 'Indonesia', 'Iran', 'Iraq', 'Ireland', 'Israel', 'Italy',
-             'Jamaica', 'Japan', 'Jordan', 'Kazakhstan', 'Kenya', 'Kiribati', 'Kuwait', 'Kyrgyzstan', 'Laos', 'Latvia',
-             'Lebanon', 'Lesotho', 'Liberia', 'Libya', 'Lithuania', 'Luxembourg', 'Macedonia', 'Madagascar', 'Malawi',
-             'Malaysia', 'Maldives', 'Mali', 'Malta', 'Marshall Islands', 'Mauritania', 'Mauritius', 'Mexico',
-             'Moldova', 'Mongolia', 'Montenegro', 'Morocco', 'Mozambique', 'Myanmar', 'Namibia', 'Nepal', 'Netherlands',
-             'New Zealand', 'Nicaragua', 'Niger', 'Nigeria', 'North Korea', 'Northern Mariana Islands', 'Norway',
-             'Oman', 'Pakistan', 'Palestine', 'Panama', 'Papua New Guinea', 'Paraguay', 'Peru', 'Philippines', 'Poland',
-             'Portugal', 'Puerto Rico', 'Qatar', 'Romania', 'Russian Federation', 'Rwanda', 'Saint Lucia',
-             'Saint Vincent and the Grenadines', 'Samoa', 'Sao Tome and Principe', 'Saudi Arabia', 'Senegal', 'Serbia',
-             'Seychelles', 'Sierra Leone', 'Singapore', 'Slovakia', 'Slovenia', 'Solomon Islands', 'Somalia',
-             'South Africa', 'South Korea', 'South Sudan', 'Spain', 'Sri Lanka', 'Sudan', 'Suriname', 'Swaziland',
-             'Sweden', 'Switzerland', 'Syria', 'Taiwan (Province of China)', 'Tajikistan', 'Tanzania', 'Thailand',
-             'The Bahamas', 'The Gambia', 'Timor-Leste', 'Togo', 'Tonga', 'Trinidad and Tobago', 'Tunisia', 'Turkey',
-             'Turkmenistan', 'Uganda', 'Ukraine', 'United Arab Emirates', 'United Kingdom', 'United States', 'Uruguay',
-             'Uzbekistan', 'Vanuatu', 'Venezuela', 'Vietnam', 'Virgin Islands, U.S.', 'Yemen', 'Zambia', 'Zimbabwe'])
-risks = np.array(['Diet low in calcium', 'Diet low in fiber', 'Diet low in seafood omega-3 fatty acids',
-                 'Diet low in fruits', 'Diet low in whole grains', 'Diet low in legumes', 'Diet low in milk',
-                 'Diet low in nuts and seeds', 'Diet high in processed meat',
-                 'Diet low in polyunsaturated fatty acids', 'Diet high in red meat', 'Diet high in sodium',
-                 'Diet high in sugar-sweetened beverages', 'Diet high in trans fatty acids',
-                 'Diet low in vegetables'])
-diseases = np.array(['Colon and rectum cancer', 'Diabetes mellitus type 2', 'Esophageal cancer', 'Intracerebral hemorrhage',
-            'Ischemic heart disease', 'Ischemic stroke', 'Larynx cancer', 'Lip and oral cavity cancer',
-            'Nasopharynx cancer', 'Other pharynx cancer', 'Stomach cancer', 'Subarachnoid hemorrhage',
-            'Tracheal, bronchus, and lung cancer'])
-age_groups = np.array(['25 to 29', '30 to 34', '35 to 39', '40 to 44', '45 to 49', '50 to 54', '55 to 59', '60 to 64',
-                      '65 to 69', '70 to 74', '75 to 79', '80 to 84', '85 to 89', '90 to 94', '95 plus'])
-genders = ['Male', 'Female']
\ No newline at end of file
+# make the shared emulator core (gbd_emulator package in the root directory) importable
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+# general values for country, diseases, risks, ages, and genders (shared with the analytical scenarios)
+from gbd_emulator.helpers import countries, risks, diseases, age_groups, genders
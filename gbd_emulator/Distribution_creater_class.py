@@ -0,0 +1,222 @@
+import numpy as np
+import pandas as pd
+from functools import partial
+from .helpers import dist_parameter_tuples, distribution_names
+from . import ensemble_distributions
+from .random_streams import cell_generators, stratified_uniforms, check_sample_size
+from .Variable_creater_class import VariableCreator
+from .profiling import stage
+from .convergence import telemetry
+from .truncation import truncation
+
+# precision of the intake samples ('float32' halves the memory of the samples and of the RR arrays calculated from
+# them, the PAF integrals and joint PAFs are accumulated in float64)
+precisions = {'float64': np.float64, 'float32': np.float32}
+
+
+def _get_variables(means, stds, min_max_df, years=None):
+    # computes distribution-specific parameters that cannot be derived directly 
+    # from mean and standard deviations alone. 
+    variables_df = VariableCreator(means, stds, min_max_df, years).get_variables_dataframe()
+    return variables_df
+
+
+class DistributionCreator(object):
+    #Generates the probability distributions of dietary intake for each (risk,age,gender) combination 
+
+
+    def __init__(self, country, risks, age_groups, genders, run, sample_size=1000, seed=0, sampling='random',
+                 precision='float64', years=None):
+        # this constructor intitialises the 'DistributionCreator' object 
+        # sets up empty dfs for distributions, parameters and coefficients 
+        # the random numbers of each (risk, age, gender) combination are drawn from an own stream, which depends on the
+        # seed, country, run and the combination only (random_streams.py)
+        # sampling: 'random', 'latin-hypercube' or 'sobol' (random_streams.sampling_methods)
+        # precision: 'float64' or 'float32', dtype in which the samples are stored (they are drawn in float64)
+        # years: years of a leading year axis (the means of all years are given at once, the index of the distributions
+        # gets a year level); the random numbers of a combination are the same in all years
+        if precision not in precisions:
+            print(f'Unknown precision {precision}, use one of {list(precisions)}')
+            exit()
+        check_sample_size(sample_size, sampling)
+        self.country = country
+        self.run = run
+        self.sample_size = sample_size
+        self.seed = seed
+        self.sampling = sampling
+        self.dtype = precisions[precision]
+        self.years = years
+
+        # set up the distributions creator
+        # setup the distributions dataframe
+        self.cells = pd.MultiIndex.from_product([risks, age_groups, genders]).sort_values()
+        if years is None:
+            index = self.cells
+        else:
+            index = pd.MultiIndex.from_arrays([np.repeat(years, len(self.cells))] +
+                                              [np.tile(self.cells.get_level_values(i), len(years)) for i in range(3)])
+        self.distributions_df = pd.DataFrame(index=index, columns=np.arange(self.sample_size), dtype=self.dtype)
+        # setup the parameters dataframe
+        self.parameters_df = pd.DataFrame(index=self.distributions_df.index,
+                                          columns=pd.MultiIndex.from_tuples(dist_parameter_tuples))
+        # setup risks, ages, genders
+        self.risks = np.unique(self.cells.get_level_values(0))
+        self.ages = np.unique(self.cells.get_level_values(1))
+        self.genders = np.unique(self.cells.get_level_values(2))
+        # setup the coefficients of the single distributions
+        self.coefficients = pd.DataFrame(index=risks, columns=distribution_names)
+
+    def get_distributions(self, means, stds, min_max_df, distribution_weights_df):
+        self._create_distribution(means, stds, min_max_df, distribution_weights_df)
+        return self.distributions_df
+
+    def _create_distribution(self, mean_array, std_array, min_max_df, distribution_weights_df):
+        with stage('variable fitting'), telemetry.cell(country=self.country):
+            variables_df = _get_variables(mean_array, std_array, min_max_df, self.years)
+        variables_array = variables_df.to_numpy(dtype=float)
+
+        with stage('sampling'):
+            # get coefficients, if the coefficients do not add up to 1 they get normalised
+            coefficients = distribution_weights_df.loc[self.risks, 'exp':].to_numpy(dtype=float)
+            coefficients /= coefficients.sum(axis=1, keepdims=True)
+            # store coefficients as property of the creator object (depending on risk)
+            self.coefficients.loc[self.risks, :] = coefficients
+
+            # parameters and samples of all risk, age and sex combinations (same order as the distributions_df)
+            num_years = 1 if self.years is None else len(self.years)
+            cell_coefficients = np.tile(np.repeat(coefficients, len(self.ages) * len(self.genders), axis=0),
+                                        (num_years, 1))
+            parameter_array = self._get_parameters(np.ravel(mean_array),
+                                                   np.broadcast_to(std_array, np.shape(mean_array)).ravel(),
+                                                   variables_array)
+            distributions_array = self._get_distributions(cell_coefficients, parameter_array)
+
+        self.distributions_df = pd.DataFrame(distributions_array.astype(self.dtype), index=self.distributions_df.index,
+                                             columns=self.distributions_df.columns)
+        self.parameters_df.loc[:, :] = parameter_array
+
+    def _get_parameters(self, mu, sigma, vars):
+        # parameters of all families (columns of dist_parameter_tuples), for one combination (vars 1D) or for all
+        # combinations at once (mu, sigma 1D and vars 2D)
+        vr = sigma ** 2
+        l = vars[..., 9]
+        u = vars[..., 8]
+
+        parameters = np.zeros(np.shape(mu) + (len(dist_parameter_tuples),))
+        # expon, scale
+        parameters[..., 0] = mu
+        # gamma, scale & a
+        parameters[..., 1] = vr / mu
+        parameters[..., 2] = mu ** 2 / vr
+        # fisk, scale & c
+        parameters[..., 3] = vars[..., 0]
+        parameters[..., 4] = vars[..., 1]
+        # gumbel_r, scale & loc
+        parameters[..., 5] = np.sqrt(6) / np.pi * sigma
+        parameters[..., 6] = mu - sigma * np.sqrt(6) / np.pi * np.euler_gamma
+        # weibull_min, scale & c
+        parameters[..., 7] = vars[..., 3]
+        parameters[..., 8] = vars[..., 2]
+        # lognorm, scale & s
+        parameters[..., 9] = mu ** 2 / np.sqrt(mu ** 2 + vr)
+        parameters[..., 10] = np.sqrt(np.log(1 + vr / mu ** 2))
+        # norm, scale & loc
+        parameters[..., 11] = sigma
+        parameters[..., 12] = mu
+        # beta, scale, loc, a, & b
+        parameters[..., 13] = (vars[..., 10] - vars[..., 11])
+        parameters[..., 14] = vars[..., 11]
+        parameters[..., 15] = vars[..., 6]
+        parameters[..., 16] = vars[..., 7]
+        # mirrored_gamma, scale & a
+        parameters[..., 17] = vr / (u - mu)
+        parameters[..., 18] = (u - mu) ** 2 / vr
+        # mirrored_gumbel_r, scale & loc
+        parameters[..., 19] = np.sqrt(6) / np.pi * sigma
+        parameters[..., 20] = u - mu - sigma * np.sqrt(6) / np.pi * np.euler_gamma
+        # invgamma, scale & a
+        parameters[..., 21] = mu * (mu**2 / vr + 1)
+        parameters[..., 22] = mu**2 / vr + 2
+        # invweibull, scale & c
+        parameters[..., 23] = 1/vars[..., 5]
+        parameters[..., 24] = vars[..., 4]
+        # lower l & upper u boundary
+        parameters[..., 25] = l
+        parameters[..., 26] = u
+
+        return parameters
+
+    def _get_distributions(self, coef, vars):
+        # samples the ensemble distributions of all combinations at once (inverse transform sampling with the
+        # quantile functions of ensemble_distributions.py), every combination uses the random numbers of its own
+        # stream. The distributions are truncated to the limits [l, u]: the single distributions are sampled
+        # within [F(l), F(u)] and weighted with their mass within the limits
+        # with a year axis the random numbers of each combination are drawn once for all years and the years are
+        # sampled one after the other; a combination whose parameters are unchanged in a later year (same mean and std)
+        # keeps its samples
+        num_distr = len(distribution_names)
+        num_cells = len(self.cells)
+        generators = cell_generators(self.seed, self.country, self.run, self.cells)
+        mass = ensemble_distributions.truncated_mass(vars)
+        truncation.record(self.country, np.tile(np.repeat(self.risks, len(self.ages) * len(self.genders)),
+                                                len(vars) // num_cells), coef, mass)
+
+        if self.sampling != 'random':
+            # one stratified or quasi-random number per sample, which selects the distribution and the quantile
+            uniforms = np.stack([stratified_uniforms(generator, self.sample_size, self.sampling)
+                                 for generator in generators])
+        else:
+            # random numbers of all single distributions and of the selection (combinations x (distributions + 1) x
+            # sample size)
+            uniforms = np.stack([generator.random((num_distr + 1, self.sample_size)) for generator in generators])
+        if len(vars) == num_cells:
+            return self._sample(uniforms, coef, vars, mass)
+
+        # rows (year, combination) with the parameters of an earlier year of the combination reuse its samples
+        cell_idx = np.tile(np.arange(num_cells), len(vars) // num_cells)
+        _, first, inverse = np.unique(np.column_stack([cell_idx, vars]), axis=0, return_index=True,
+                                      return_inverse=True)
+        sampled = np.sort(first)
+        samples = np.zeros((len(sampled), self.sample_size))
+        for year_idx in range(len(vars) // num_cells):
+            rows = np.flatnonzero((sampled >= year_idx * num_cells) & (sampled < (year_idx + 1) * num_cells))
+            if len(rows) > 0:
+                samples[rows] = self._sample(uniforms[cell_idx[sampled[rows]]], coef[sampled[rows]],
+                                             vars[sampled[rows]], mass[sampled[rows]])
+        return samples[np.searchsorted(sampled, first[inverse.ravel()])]
+
+    def _sample(self, uniforms, coef, vars, mass):
+        # samples of the combinations from their random numbers (stratified: combinations x sample size, random:
+        # combinations x (distributions + 1) x sample size)
+        if self.sampling != 'random':
+            return ensemble_distributions.sample_from_uniforms(uniforms, vars, coef, truncate=True)
+
+        # samples of all single distributions (combinations x distributions x sample size)
+        num_distr = len(distribution_names)
+        data = ensemble_distributions.truncated_ppf(uniforms[:, :num_distr], vars, per_family=True)
+
+        # pick one distribution per sample with the truncated weights as probabilities
+        cumulative = np.cumsum(ensemble_distributions.truncated_weights(coef, mass), axis=1)
+        cumulative /= cumulative[:, -1:]
+        random_idx = np.sum(uniforms[:, num_distr, :, None] >= cumulative[:, None, :], axis=2)
+
+        return np.take_along_axis(data, random_idx[:, None, :], axis=1)[:, 0, :]
+
+    def get_pdfs(self, risk, age, gender):
+        # retrieved the probability density functions for distributons (the pdfs of the mirrored gamma and gumbel_r
+        # are those of the sampled, mirrored variable u - x, not of the unmirrored x)
+        vars = self.parameters_df.loc[(risk, age, gender), :].to_numpy(dtype=float)
+
+        distributions = [partial(family_pdf, p=vars) for family_pdf, _, _ in ensemble_distributions.families]
+
+        return distributions
+
+    # this function is not called, but can be useful to assess the rvs for testing
+    def get_rvss(self, risk, age, gender, random_state=None):
+        vars = self.parameters_df.loc[(risk, age, gender), :].to_numpy(dtype=float)
+        random_state = np.random.default_rng() if random_state is None else random_state
+
+        distributions = [lambda size, family_ppf=family_ppf: family_ppf(random_state.random(size), vars)
+                         for _, _, family_ppf in ensemble_distributions.families]
+
+        return distributions
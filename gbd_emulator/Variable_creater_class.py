@@ -0,0 +1,137 @@
+import numpy as np
+import pandas as pd
+from .helpers_variables_calculation import run_for_beta, solve_fisk, solve_invweibull, solve_weibull, \
+    greater_one_weibull, smaller_one_eighth_weibull, greater_4_5_inv_weibull, smaller_one_eighth_invweibull
+from .helpers import index_dict
+
+
+class VariableCreator(object):
+    def __init__(self, means, stds, min_max_df, years=None):
+        """
+        means_df (dataframe): contains the means for different risk, age and sex combinations for specific country and run
+                              index = Multiindex (risks, ages, sexes),
+                              columns = only one, the run has already been selected before
+                              => run number and country have to be selected before
+        stds_df (dataframe): contains the stds for different risk, age and sex combinations for specific country and run
+                             index = Multiindex (risks, ages, sexes),
+                             columns = only one, the run has already been selected before
+                             => run number and country have to be selected before
+        min_max_df (dataframe): contains the min and max values for different risk, age and sex combinations
+                                for specific country and run
+                                index = Multiindex (risks, ages, sexes),
+                                columns = only one, the run has already been selected before
+                                => run number and country have to be selected before
+        years (array/None): years of a leading year axis of the means (dim years x combinations), the stds and
+                            limits are the same for all years; the variables of all years are fitted together
+                            (index = Multiindex (years, risks, ages, sexes))
+        """
+        risks = index_dict['risks']
+        ages = index_dict['age_groups']
+        genders = index_dict['genders']
+
+        # setup the variables dataframe
+        cells = pd.MultiIndex.from_product([risks, ages, genders]).sort_values()
+        if years is None:
+            index = cells
+        else:
+            index = pd.MultiIndex.from_arrays([np.repeat(years, len(cells))] +
+                                              [np.tile(cells.get_level_values(i), len(years)) for i in range(3)])
+        self.variables_df = pd.DataFrame(index=index,
+                                         columns=['alpha_fisk', 'beta_fisk', 'k_weibull', 'lambda_weibull',
+                                                  'k_invweibull', 'lambda_invweibull', 'a_beta', 'b_beta', 'u', 'l',
+                                                  'u_beta', 'l_beta'], dtype=float)
+        self.risks = np.unique(cells.get_level_values(0))
+        self.ages = np.unique(cells.get_level_values(1))
+        self.genders = np.unique(cells.get_level_values(2))
+
+        # combination of each row (the years one after the other); a combination whose mean and std (so its CV) are
+        # unchanged in a later year is fitted once
+        means = np.asarray(means, dtype=float).ravel()
+        stds = np.broadcast_to(np.asarray(stds, dtype=float), np.shape(means) if years is None else
+                               (len(years), len(cells))).ravel()
+        cell_idx = np.tile(np.arange(len(cells)), len(means) // len(cells))
+        _, first, inverse = np.unique(np.column_stack([cell_idx, means, stds]), axis=0, return_index=True,
+                                      return_inverse=True)
+        fitted = np.sort(first)
+        self.cell_risks = cells.get_level_values(0).to_numpy()[cell_idx[fitted]]
+        self.variables = np.zeros((len(fitted), len(self.variables_df.columns)))
+
+        # fill the variables dataframe
+        self._calculate_variables_beta(means[fitted], stds[fitted], min_max_df.iloc[cell_idx[fitted]])
+        self._calculate_variables_with_optimisation(means[fitted], stds[fitted])
+        self.variables_df.loc[:, :] = self.variables[np.searchsorted(fitted, first[inverse.ravel()])]
+
+    def _calculate_variables_beta(self, means, stds, min_max_df):
+        """
+        means_df (dataframe): contains the means for different risk, age and sex combinations for specific country and run
+                              index = Multiindex (risks, ages, sexes),
+                              columns = only one, the run has already been selected before
+                              => run number and country have to be selected before
+        stds_df (dataframe): contains the stds for different risk, age and sex combinations for specific country and run
+                             index = Multiindex (risks, ages, sexes),
+                             columns = only one, the run has already been selected before
+                             => run number and country have to be selected before
+        """
+        mean = means.flatten()
+        std = stds.flatten()
+
+        upper = min_max_df.loc[:, 'xmax'].to_numpy() * mean
+        lower = min_max_df.loc[:, 'xmin'].to_numpy() * mean
+
+        self.variables[:, 8] = upper
+        self.variables[:, 9] = lower
+
+        a_beta, b_beta, u_beta, l_beta = run_for_beta(mean, std, upper, lower)
+        if np.any(np.isnan(a_beta)):
+            print('problem')
+        self.variables[:, 6] = a_beta.T
+        self.variables[:, 7] = b_beta.T
+        self.variables[:, 10] = u_beta.T
+        self.variables[:, 11] = l_beta.T
+
+    def _calculate_variables_with_optimisation(self, means, stds):
+        '''
+        means_df (dataframe): contains the means for different risk, age and sex combinations for specific country and run
+                              index = Multiindex (risks, ages, sexes),
+                              columns = only one, the run has already been selected before
+                              => run number and country have to be selected before
+        stds_df (dataframe): contains the stds for different risk, age and sex combinations for specific country and run
+                             index = Multiindex (risks, ages, sexes),
+                             columns = only one, the run has already been selected before
+                             => run number and country have to be selected before
+        '''
+        # columns alpha_fisk, beta_fisk, k_weibull, lambda_weibull, k_invweibull, lambda_invweibull
+        variables_array = np.zeros((len(means), 6))
+
+        # risk of each (risk, age, sex) combination (labels of the convergence telemetry)
+        cell_risks = self.cell_risks
+
+        # regimes of the weibull and inverse weibull fits (masks over all cells): closed-form approximations for large
+        # and small mean/std ratios, the remaining cells are solved numerically
+        y = means / stds
+        weibull_regimes = [(y >= 1, greater_one_weibull), (y <= 1/8, smaller_one_eighth_weibull)]
+        invweibull_regimes = [(y >= 4.5, greater_4_5_inv_weibull), (y <= 1/8, smaller_one_eighth_invweibull)]
+
+        # fisk for all cells
+        variables_array[:, 0], variables_array[:, 1] = solve_fisk(means, stds, cell_risks)
+
+        # weibull and inverse weibull, each regime is fitted once for all of its cells
+        for columns, regimes, solve in [([2, 3], weibull_regimes, solve_weibull),
+                                        ([4, 5], invweibull_regimes, solve_invweibull)]:
+            closed_form = np.zeros(len(means), dtype=bool)
+            for mask, approximation in regimes:
+                if np.any(mask):
+                    variables_array[mask, columns[0]], variables_array[mask, columns[1]] = \
+                        approximation(means[mask], stds[mask], cell_risks[mask])
+                closed_form |= mask
+
+            cells = np.where(~closed_form)[0]
+            if len(cells) > 0:
+                variables_array[cells, columns[0]], variables_array[cells, columns[1]] = \
+                    solve(means[cells], stds[cells], cell_risks[cells])
+
+        self.variables[:, :6] = variables_array
+
+    def get_variables_dataframe(self):
+        return self.variables_df
+
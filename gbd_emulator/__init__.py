@@ -0,0 +1,19 @@
+'''
+################################################
+# GBD Diet-NCD emulator core
+# shared distribution, variable-fitting and PAF engines used by all analytical scenarios
+# the scenario drivers (Original GBD, Unilateral Shift Intake, Marginals Calculation) are found in scenarios/
+################################################
+'''
+from .helpers import index_dict, dist_parameter_tuples, distribution_names
+from .Variable_creater_class import VariableCreator
+from .Distribution_creater_class import DistributionCreator
+from .helpers_PAF_calculation import calculate_rr, calculate_rr_der, calculate_PAF_per_disease, \
+    change_joint_PAFs_per_disease, calculate_PJ_PAFs, calculate_PAF_der_per_disease, full_calculation, \
+    full_calculation_shift, full_calculation_der
+from .helpers_data_and_setup import get_country_range, load_country_codes, load_risk_inputs, load_input_files, \
+    load_mean_and_std, load_std, load_total_YLDs_YLLs, interpolate_years, load_total_YLDs_YLLs_projected, \
+    load_means_projected, burden_arrays, country_burden, create_full_min_max_df, calculate_mediation_matrix, \
+    calculate_MF_NJ, calculate_MF_J, dense_to_dataframe, summarise_runs, load_country_group_tables, load_population
+from .aggregation import Aggregator, age_band_groups, group_membership, add_country_groups, load_country_groups
+from .runner import run_countries, save_dataframe
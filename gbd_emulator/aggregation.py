@@ -0,0 +1,213 @@
+import numpy as np
+import pandas as pd
+from string import ascii_letters
+from scipy import sparse
+from .helpers_data_and_setup import load_country_codes, load_country_group_tables, load_population
+
+'''
+################################################
+# aggregation of the dense result arrays
+# the outputs of the scenarios are sums of the dense DALY arrays over groups of the labels of an axis (age bands, sex
+# groupings, disease groups such as cardiovascular diseases or cancers, country groupings such as regions or income
+# groups). The membership of the labels in the groups of an axis is a (groups x labels) matrix, computed once per
+# axis, and every aggregate is one tensor contraction of the result array with the membership matrices of its
+# grouped axes (the axes that are not kept are summed in the same contraction). The country groups are aggregated
+# once all countries are calculated, as sums of the countries in sparse matrix products on the country axis for every
+# run (so the uncertainty of a group comes from its runs, not from summaries of the countries); rates per capita divide
+# the sums by the population of the countries of the group
+################################################
+'''
+
+
+def age_band_groups(age_groups, age_bands):
+    """
+    Converts age bands given by start ages into groups of age groups
+    age_groups (list): age groups of the model ('25 to 29', ..., '95 plus')
+    age_bands (dict/None): name of the band -> (lowest, highest) start age of its age groups, highest excluded (None:
+                           no bound), e.g. {'all_ages': (None, None), 'below70': (None, 70)}
+    Returns: dict of name of the band -> age groups of the band (None if no age bands are given)
+    """
+    if not age_bands:
+        return None
+    start_ages = np.array([int(age.split()[0]) for age in age_groups])
+    groups = {}
+    for name, (lowest, highest) in age_bands.items():
+        in_band = (start_ages >= (-np.inf if lowest is None else lowest)) & \
+            (start_ages < (np.inf if highest is None else highest))
+        groups[name] = list(np.asarray(age_groups)[in_band])
+    return groups
+
+
+def group_membership(labels, groups):
+    """
+    Membership of the labels of an axis in named groups
+    labels (array): labels of the axis
+    groups (dict): name of the group -> members (None: all labels)
+    Returns: names of the groups, membership array (dim groups x labels, 1 for the members of the group)
+    """
+    known = set(labels)
+    for name, members in groups.items():
+        unknown = [] if members is None else [member for member in members if member not in known]
+        if unknown:
+            raise ValueError(f'Members {unknown} of the group {name} are not labels of the axis')
+    membership = np.zeros((len(groups), len(labels)))
+    for group_idx, members in enumerate(groups.values()):
+        membership[group_idx] = True if members is None else np.isin(labels, list(members))
+    return list(groups), membership
+
+
+class Aggregator(object):
+    # aggregates of dense result arrays over named groups of their axes
+
+    def __init__(self, groupings):
+        """
+        Sets the groups of the axes
+        groupings (dict): name of the axis -> groups of its labels (name of the group -> members), axes without groups
+                          (None) keep their labels
+        """
+        self.groupings = {axis: groups for axis, groups in groupings.items() if groups}
+        self._memberships = {}
+
+    def membership(self, axis, labels):
+        """
+        Membership matrix of a grouped axis (computed once per axis and labels)
+        axis (str): name of the axis
+        labels (array): labels of the axis
+        Returns: names of the groups, membership array (dim groups x labels)
+        """
+        key = (axis, tuple(labels))
+        if key not in self._memberships:
+            self._memberships[key] = group_membership(labels, self.groupings[axis])
+        return self._memberships[key]
+
+    def levels(self, axes, by):
+        """
+        Labels of the axes of an aggregate
+        axes (dict): name -> labels of the axes of the result array, in the order of the axes
+        by (list): axes of the aggregate
+        Returns: dict of name -> labels (group names for the grouped axes), in the order of by
+        """
+        return {axis: list(self.groupings[axis]) if axis in self.groupings else axes[axis] for axis in by}
+
+    def aggregate(self, array, axes, by):
+        """
+        Sums a result array over the axes that are not in by and over the groups of the grouped axes in by, in one
+        tensor contraction
+        array (array): result array
+        axes (dict): name -> labels of the axes of the array, in the order of the axes
+        by (list): axes of the aggregate (the grouped axes are replaced by their groups)
+        Returns: aggregate array (axes in the order of by), dict of name -> labels of its axes
+        """
+        letters = dict(zip(axes, ascii_letters))
+        operands, subscripts, output = [array], [''.join(letters.values())], ''
+        for axis in by:
+            if axis in self.groupings:
+                # the groups get a new index of the contraction
+                group_letter = ascii_letters[len(axes) + len(operands) - 1]
+                operands.append(self.membership(axis, axes[axis])[1])
+                subscripts.append(group_letter + letters[axis])
+                output += group_letter
+            else:
+                output += letters[axis]
+        return np.einsum(','.join(subscripts) + '->' + output, *operands, optimize=True), self.levels(axes, by)
+
+    def aggregate_dataframe(self, df):
+        """
+        Aggregates an output dataframe over the groups of its index levels (the columns, e.g. runs, are kept)
+        df (dataframe): output with one index level per axis
+        Returns: dataframe (index: the levels with the grouped levels replaced by their groups, same columns)
+        """
+        axes = {name: df.index.unique(name) for name in df.index.names}
+        cells = pd.MultiIndex.from_product(list(axes.values()), names=list(axes))
+        array = df.reindex(cells).to_numpy().reshape(tuple(len(labels) for labels in axes.values()) + (-1,))
+        axes['columns'] = df.columns
+        aggregate, levels = self.aggregate(array, axes, list(axes))
+        levels.pop('columns')
+        index = pd.MultiIndex.from_product(list(levels.values()), names=list(levels))
+        return pd.DataFrame(aggregate.reshape(len(index), -1), index=index, columns=df.columns)
+
+
+def load_country_groups(setup):
+    """
+    Country groups of a scenario: the groups of setup.country_groups and of the group tables of
+    setup.country_group_tables (e.g. income groups and regions)
+    setup (module/namespace): Setup_file of the scenario
+    Returns: dict of name of the group -> countries of the group (None if no groups are set)
+    """
+    groups = dict(setup.country_groups or {})
+    if setup.country_group_tables:
+        table_groups = load_country_group_tables(setup.M49_path, setup.country_group_tables)
+        duplicates = [name for name in table_groups if name in groups]
+        if duplicates:
+            raise ValueError(f'The country groups {duplicates} are given in country_groups and in the group tables')
+        groups.update(table_groups)
+    # the members have to be modelled countries
+    group_membership(load_country_codes(setup.M49_path)[1], groups)
+    return groups or None
+
+
+def country_population(setup, years, SSP_names):
+    """
+    Population of the countries for the DALYs per capita (setup.per_capita)
+    setup (module/namespace): Setup_file of the scenario
+    years (array): years of the output
+    SSP_names (list): SSPs of the population
+    Returns: population series (index: ssp, year, country), None if no DALYs per capita are saved
+    """
+    if not setup.per_capita:
+        return None
+    return load_population(setup.population_path, setup.M49_path, years, SSP_names)
+
+
+def add_country_groups(df, country_groups, level='country', keep_countries=True):
+    """
+    Adds the sums of country groups (e.g. regions or income groups) to an output dataframe of all countries, as
+    sparse matrix products on the country axis for every column (run)
+    df (dataframe): output with one index level per axis (combined from all chunks of countries)
+    country_groups (dict/None): name of the group -> countries of the group (None: the output is returned as it is)
+    level (str): name of the country level
+    keep_countries (bool): whether the countries are kept next to the groups
+    Returns: dataframe with the countries (if kept) followed by the country groups on the country level
+    """
+    if not country_groups:
+        return df
+    # the groups only contain the calculated countries (e.g. if a range of countries is calculated)
+    countries = df.index.unique(level)
+    names, membership = group_membership(countries, {name: None if members is None else
+                                                     [member for member in members if member in countries]
+                                                     for name, members in country_groups.items()})
+
+    # output values with the countries first, then the other levels and the columns
+    axes = {name: df.index.unique(name) for name in [level] + [name for name in df.index.names if name != level]}
+    cells = pd.MultiIndex.from_product(list(axes.values()), names=list(axes))
+    values = df.reorder_levels(list(axes)).reindex(cells).to_numpy().reshape(len(countries), -1)
+    aggregates = sparse.csr_matrix(membership) @ values
+
+    index = pd.MultiIndex.from_product([names] + list(axes.values())[1:], names=list(axes))
+    groups_df = pd.DataFrame(aggregates.reshape(len(index), -1), index=index, columns=df.columns).reorder_levels(
+        df.index.names)
+    return pd.concat([df, groups_df]) if keep_countries else groups_df
+
+
+def per_capita(df, population, country_groups=None, level='country', keep_countries=True):
+    """
+    Values per capita of an output of all countries and of its country groups: the values of each country divided by
+    its population, the sums of each country group (see add_country_groups) divided by the population of its countries
+    df (dataframe): output with one index level per axis (combined from all chunks of countries)
+    population (series): population of the modelled countries (index: the country level and the other levels of the
+                         output it depends on, e.g. the year)
+    country_groups (dict/None): name of the group -> countries of the group
+    level (str): name of the country level
+    keep_countries (bool): whether the countries are kept next to the groups
+    Returns: dataframe with the same index and columns as add_country_groups(df, country_groups, level, keep_countries)
+    """
+    sums_df = add_country_groups(df, country_groups, level, keep_countries)
+    population = population[population.index.get_level_values(level).isin(df.index.unique(level))]
+    population = add_country_groups(population.to_frame('population'), country_groups, level,
+                                    keep_countries)['population']
+    divisor = population.reindex(pd.MultiIndex.from_arrays(
+        [sums_df.index.get_level_values(name) for name in population.index.names])).to_numpy()
+    if np.any(np.isnan(divisor)):
+        print(f'No population for {list(sums_df.index.get_level_values(level)[np.isnan(divisor)].unique())}')
+        exit()
+    return sums_df.div(divisor, axis=0)
@@ -0,0 +1,476 @@
+import io
+import json
+import time
+import tempfile
+import tracemalloc
+import contextlib
+import numpy as np
+import pandas as pd
+from .config import load_setup
+from .synthetic_data import create_synthetic_data
+from .helpers_data_and_setup import load_input_files, load_mean_and_std, load_risk_inputs, \
+    calculate_mediation_matrix
+from .helpers_PAF_calculation import full_calculation, full_calculation_shift, full_calculation_der, \
+    calculate_PAF_table, calculate_PAF_per_disease, calculate_rr_array, calculate_rr_der_array
+from .Variable_creater_class import VariableCreator
+from .Distribution_creater_class import DistributionCreator
+from .random_streams import sampling_methods
+from .integration import create_integrator, binning_methods, PAFIntegrator
+from .runner import run_countries, setup_to_namespace
+from .scenarios import original_gbd, unilateral_shift, partial_derivative
+
+'''
+################################################
+# benchmark suite
+# times the single stages (variable fitting, sampling, PAF calculation, joint aggregation) and the full per country
+# pipeline of each scenario on synthetic inputs, reporting wall/CPU time, throughput in cells per second and the
+# peak memory (traced in an additional run), the accuracy of the PAFs per sampling method and sample size, the
+# agreement of the PAF estimators and the DALY differences of float32 samples
+################################################
+'''
+stages = ['variables', 'distributions', 'PAF', 'aggregation']
+pipelines = ['original', 'shift', 'shift-pj', 'marginals']
+
+
+def measure(func, repeats=3, trace_memory=True):
+    """
+    Times a function (the printouts of the emulator are suppressed)
+    func (function): function without arguments
+    repeats (int): number of timed calls
+    trace_memory (bool): whether the peak memory is traced in an additional call
+    Returns: dict with the best and mean wall time, the mean CPU time (seconds) and the peak memory (MB)
+    """
+    wall_times, cpu_times = [], []
+    for _ in range(repeats):
+        with contextlib.redirect_stdout(io.StringIO()):
+            begin_wall, begin_cpu = time.perf_counter(), time.process_time()
+            func()
+            wall_times.append(time.perf_counter() - begin_wall)
+            cpu_times.append(time.process_time() - begin_cpu)
+
+    peak_memory = np.nan
+    if trace_memory:
+        tracemalloc.start()
+        with contextlib.redirect_stdout(io.StringIO()):
+            func()
+        peak_memory = tracemalloc.get_traced_memory()[1] / 2 ** 20
+        tracemalloc.stop()
+
+    return {'wall_best_s': np.min(wall_times), 'wall_mean_s': np.mean(wall_times), 'cpu_mean_s': np.mean(cpu_times),
+            'peak_memory_MB': peak_memory}
+
+
+def _load_country(setup, country):
+    # inputs of one country and run (run 0) and the PAF evaluations of the country (risk-disease pairs linked in the
+    # risk factors file)
+    index_dict = setup.index_dict
+    risks, age_groups, genders = index_dict['risks'], index_dict['age_groups'], index_dict['genders']
+    risk_factors_df, risks_dict, rf_df_morb, rf_df_mort, TMREL_df = \
+        load_risk_inputs(setup.dietary_risk_factors_path, setup.rf_mord_mort_path, setup.TMREL_path)
+    minmax_bounds_df, distribution_weights_df = load_input_files(setup.min_max_path, setup.distrbution_weights_path)
+    mean_values_df, sd_values_df = load_mean_and_std(setup.GBD_centralval_path, country)
+
+    PAF_calls = []
+    for risk in risks:
+        for disease in risks_dict[risk]:
+            morb_mort = np.unique(risk_factors_df.loc[(risk, disease), :].index.get_level_values(0))[0]
+            for age in age_groups:
+                for gender in genders:
+                    if morb_mort == 'Both':
+                        PAF_calls.append((risk, disease, age, gender, 'Both'))
+                    else:
+                        PAF_calls.append((risk, disease, age, gender, 'Morbidity'))
+                        PAF_calls.append((risk, disease, age, gender, 'Mortality'))
+
+    return dict(risk_factors_df=risk_factors_df, rf_df_morb=rf_df_morb, rf_df_mort=rf_df_mort, TMREL_df=TMREL_df,
+                minmax_bounds_df=minmax_bounds_df, distribution_weights_df=distribution_weights_df,
+                means=mean_values_df.loc[:, '0'].to_numpy(), stds=sd_values_df.loc[:, '0'].to_numpy(),
+                PAF_calls=PAF_calls)
+
+
+def _create_distributions(setup, country, inputs, sample_size, seed, sampling_method):
+    # intake distributions of one country and run (run 0), stored in the precision of the setup
+    index_dict = setup.index_dict
+    return DistributionCreator(country, index_dict['risks'], index_dict['age_groups'], index_dict['genders'], 0,
+                               sample_size, seed, sampling_method, setup.precision).get_distributions(
+        inputs['means'], inputs['stds'], inputs['minmax_bounds_df'].loc[country, :], inputs['distribution_weights_df'])
+
+
+def _calculate_PAFs(inputs, distributions_df, integrator=None):
+    # PAFs of all PAF evaluations of one country and run (run 0)
+    return np.array([full_calculation(risk, disease, age, gender, inputs['TMREL_df'], inputs['risk_factors_df'],
+                                      distributions_df, inputs['rf_df_morb'], inputs['rf_df_mort'], morb_mort, 0,
+                                      integrator)
+                     for risk, disease, age, gender, morb_mort in inputs['PAF_calls']])
+
+
+def benchmark_stages(setup, country, repeats=3, trace_memory=True):
+    """
+    Benchmarks the single stages for one country and run (run 0)
+    setup (namespace): setup of the Original GBD scenario (paths of the synthetic data, sample size)
+    country (str): country used for the benchmark
+    Returns: list of result dicts
+    """
+    index_dict = setup.index_dict
+    risks, diseases, age_groups, genders = \
+        index_dict['risks'], index_dict['diseases'], index_dict['age_groups'], index_dict['genders']
+    num_cells = len(risks) * len(age_groups) * len(genders)
+
+    inputs = _load_country(setup, country)
+    MF = calculate_mediation_matrix()
+
+    def fit_variables():
+        VariableCreator(inputs['means'], inputs['stds'], inputs['minmax_bounds_df'].loc[country, :])
+
+    def create_distributions():
+        return _create_distributions(setup, country, inputs, setup.sample_size, setup.random_seed,
+                                     setup.sampling_method)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        distributions_df = create_distributions()
+
+    integrator = create_integrator(setup)
+
+    def calculate_PAFs():
+        _calculate_PAFs(inputs, distributions_df, integrator)
+
+    PAFs = np.random.default_rng(0).uniform(0, 0.2, (len(diseases), len(age_groups), len(genders), len(risks), 2))
+
+    def aggregate_PAFs():
+        for idx2 in range(len(diseases)):
+            for idx3 in range(len(age_groups)):
+                for idx4 in range(len(genders)):
+                    for k in range(2):
+                        calculate_PAF_per_disease(PAFs[idx2, idx3, idx4, :, k], MF, idx2)
+
+    functions = {'variables': (fit_variables, num_cells, 'VariableCreator, (risk, age, sex) cells'),
+                 'distributions': (create_distributions, num_cells,
+                                   'DistributionCreator incl. variable fitting, (risk, age, sex) cells'),
+                 'PAF': (calculate_PAFs, len(inputs['PAF_calls']),
+                         'full_calculation, (risk, disease, age, sex, measure) cells'),
+                 'aggregation': (aggregate_PAFs, PAFs.size // len(risks),
+                                 'joint PAF via the mediation matrix, (disease, age, sex, measure) cells')}
+
+    results = []
+    for stage in stages:
+        func, cells, description = functions[stage]
+        print(f'Benchmarking stage {stage}')
+        result = measure(func, repeats, trace_memory)
+        results.append(dict(name=stage, description=description, cells=cells,
+                            cells_per_s=cells / result['wall_best_s'], **result))
+    return results
+
+
+def benchmark_pipelines(data_root, countries, num_runs, sample_size, repeats=1, trace_memory=True, names=None):
+    """
+    Benchmarks the full calculation of each scenario for the given countries (one scenario name and time point)
+    data_root (str): root directory of the synthetic data
+    countries (array): countries of the synthetic data
+    num_runs (int): number of runs
+    sample_size (int): sample size of the intake distributions
+    names (list/None): pipelines to run (default: all)
+    Returns: list of result dicts
+    """
+    overrides = {'data_root': data_root, 'num_runs': num_runs, 'sample_size': sample_size}
+    setups = {'original': load_setup('original', overrides=overrides),
+              'shift': load_setup('shift', overrides=overrides),
+              # the SSP means are central values only, so the marginals are calculated for one run
+              'marginals': load_setup('marginals', overrides=dict(overrides, num_runs=1))}
+    setups['shift'].index_dict['scenario_names'] = setups['shift'].index_dict['scenario_names'][:1]
+    setups['shift'].index_dict['time_points'] = setups['shift'].index_dict['time_points'][:1]
+    setups['marginals'].index_dict['time_points'] = setups['marginals'].index_dict['time_points'][:1]
+
+    setups['original'].scenarios = setups['original'].scenarios[:1]
+    num_cells = len(countries) * len(setups['original'].index_dict['risks']) * \
+        len(setups['original'].index_dict['age_groups']) * len(setups['original'].index_dict['genders'])
+
+    functions = {'original': (lambda: original_gbd.calculate(setups['original'], countries), num_runs),
+                 'shift': (lambda: unilateral_shift.calculate(setups['shift'], countries, mode='J'), num_runs),
+                 'shift-pj': (lambda: unilateral_shift.calculate(setups['shift'], countries, mode='PJ'), num_runs),
+                 'marginals': (lambda: partial_derivative.calculate(setups['marginals'], countries), 1)}
+
+    results = []
+    for name in (names or pipelines):
+        func, runs = functions[name]
+        print(f'Benchmarking pipeline {name}')
+        cells = num_cells * runs
+        result = measure(func, repeats, trace_memory)
+        results.append(dict(name=f'pipeline {name}',
+                            description=f'{len(countries)} countries x {runs} runs, (risk, age, sex) cells',
+                            cells=cells, cells_per_s=cells / result['wall_best_s'], **result))
+    return results
+
+
+def sampling_convergence(setup, country, sample_sizes, methods=None, replicates=3, reference_size=16000):
+    """
+    Error of the PAFs of one country and run (run 0) per sampling method and sample size, compared to the PAFs of a
+    large Latin hypercube sample (the replicates use different seeds)
+    setup (namespace): setup of the Original GBD scenario (paths of the data)
+    country (str): country of the report
+    sample_sizes (list): sample sizes of the intake distributions
+    methods (list/None): sampling methods (default: all, see random_streams.sampling_methods)
+    replicates (int): number of samples per method and sample size
+    reference_size (int): sample size of the reference PAFs
+    Returns: list of result dicts with the root mean square, mean absolute and largest error of the PAFs (over all
+             PAFs and replicates) and the mean time of the sampling and PAF calculation
+    """
+    inputs = _load_country(setup, country)
+    print(f'Calculating the reference PAFs with {reference_size} samples')
+    with contextlib.redirect_stdout(io.StringIO()):
+        reference = _calculate_PAFs(inputs, _create_distributions(setup, country, inputs, reference_size, replicates,
+                                                                  'latin-hypercube'))
+
+    results = []
+    for method in (methods or sampling_methods):
+        for sample_size in sample_sizes:
+            print(f'Sampling with {method} numbers, sample size {sample_size}')
+            errors, times = [], []
+            for seed in range(replicates):
+                begin = time.perf_counter()
+                with contextlib.redirect_stdout(io.StringIO()):
+                    PAFs = _calculate_PAFs(inputs, _create_distributions(setup, country, inputs, sample_size, seed,
+                                                                         method))
+                times.append(time.perf_counter() - begin)
+                errors.append(PAFs - reference)
+            errors = np.concatenate(errors)
+            results.append(dict(method=method, sample_size=sample_size, replicates=replicates, PAFs=len(reference),
+                                rmse=np.sqrt(np.mean(errors ** 2)), mean_abs_error=np.mean(np.abs(errors)),
+                                max_abs_error=np.max(np.abs(errors)), wall_mean_s=np.mean(times)))
+    return results
+
+
+def run_sampling_report(sample_sizes=(256, 512, 1024, 2048), methods=None, replicates=3, reference_size=16000,
+                        seed=0, data_root=None, output=None):
+    """
+    Creates synthetic inputs of one country (in a temporary folder if no data root is given) and reports the error
+    of the PAFs per sampling method and sample size (convergence of the PAFs with the sample size)
+    Returns: dataframe with one row per method and sample size
+    """
+    with tempfile.TemporaryDirectory() as temporary_root:
+        data_root = data_root if data_root is not None else temporary_root
+        print(f'Creating synthetic data in {data_root}')
+        countries = create_synthetic_data(data_root, 1, 1, seed)
+        setup = load_setup('original', overrides={'data_root': data_root})
+        results = sampling_convergence(setup, countries[0], sample_sizes, methods, replicates, reference_size)
+
+    report_df = pd.DataFrame(results)
+    with pd.option_context('display.max_columns', None, 'display.width', 200):
+        print(report_df.to_string(index=False, float_format='{:.3g}'.format))
+    if output is not None:
+        save_report(results, output)
+        print(f'Saved sampling report to: {output}')
+    return report_df
+
+
+def _sample_mean(inputs, distributions_df, call, h=0.0, derivative=False):
+    # PAF (or PAF derivative) of one combination as ratio of the sample means, evaluated combination by combination
+    risk, disease, age, gender, morb_mort = call
+    TMREL = inputs['TMREL_df'].loc[risk, '0']
+    unit = inputs['risk_factors_df'].loc[(risk, disease, morb_mort), 'Units']
+    low = inputs['risk_factors_df'].loc[(risk, disease, morb_mort), 'Low']
+    rf_df = inputs['rf_df_morb'] if morb_mort == 'Morbidity' else inputs['rf_df_mort']
+    rf = rf_df.loc[(risk, disease, age), '0']
+    x_array = distributions_df.loc[(risk, age, gender), :].to_numpy() + h
+    rr = calculate_rr_der_array(x_array, TMREL, rf, unit, low) if derivative else \
+        calculate_rr_array(x_array, TMREL, rf, unit, low)
+    return np.mean(rr - 1) / np.mean(rr)
+
+
+def estimator_comparison(setup, shift_setup, country):
+    """
+    Compares the sample-mean estimator (calculate_PAF_table) of the PAFs, shifted PAFs and PAF derivatives of one
+    country and run (run 0) with the sample means evaluated combination by combination (equivalence of the vectorized
+    calculation) and with the histogram estimator of each binning method (binning error)
+    setup (namespace): setup of the Original GBD scenario (paths of the data, sample size, sampling)
+    shift_setup (namespace): setup of the Unilateral Shift scenario (shift file, first scenario name and time point)
+    country (str): country of the report
+    Returns: list of result dicts per quantity and estimator with the largest and mean absolute difference to the
+             sample-mean estimator (over the finite values) and the time of the calculation
+    """
+    index_dict = setup.index_dict
+    inputs = _load_country(setup, country)
+    with contextlib.redirect_stdout(io.StringIO()):
+        distributions_df = _create_distributions(setup, country, inputs, setup.sample_size, setup.random_seed,
+                                                 setup.sampling_method)
+
+    shift_df = pd.read_csv(shift_setup.shift_path, index_col=[0, 1, 2, 3, 4, 5])
+    shift_df.sort_index(inplace=True)
+    shift_df.index = shift_df.index.set_levels(shift_df.index.levels[1].astype(str), level=1)
+    scenario_name, time_point = shift_setup.index_dict['scenario_names'][0], shift_setup.index_dict['time_points'][0]
+    shift = shift_df.loc[(scenario_name, time_point, country), '0'].reindex(pd.MultiIndex.from_product(
+        [index_dict['age_groups'], index_dict['genders'], index_dict['risks']])).to_numpy()
+    shift = shift.reshape(len(index_dict['age_groups']), len(index_dict['genders']), len(index_dict['risks']))
+
+    def histogram(quantity, call, integrator):
+        risk, disease, age, gender, morb_mort = call
+        arguments = (inputs['TMREL_df'], inputs['risk_factors_df'], distributions_df, inputs['rf_df_morb'],
+                     inputs['rf_df_mort'])
+        if quantity == 'shifted PAF':
+            return full_calculation_shift(scenario_name, time_point, country, disease, age, gender, risk,
+                                          *arguments, shift_df, morb_mort, 0, integrator)
+        calculation = full_calculation_der if quantity == 'PAF derivative' else full_calculation
+        return calculation(risk, disease, age, gender, *arguments, morb_mort, 0, integrator)
+
+    def shift_of(call):
+        risk, _, age, gender, _ = call
+        return shift_df.loc[(scenario_name, time_point, country, age, gender, risk), '0']
+
+    results = []
+    for quantity in ['PAF', 'shifted PAF', 'PAF derivative']:
+        print(f'Comparing the estimators of the {quantity}s')
+        derivative = quantity == 'PAF derivative'
+        begin = time.perf_counter()
+        PAF_table = calculate_PAF_table(distributions_df, inputs['TMREL_df'], inputs['risk_factors_df'],
+                                        inputs['rf_df_morb'], inputs['rf_df_mort'], index_dict, 0,
+                                        shift if quantity == 'shifted PAF' else None, derivative)
+        times = {'sample-mean': time.perf_counter() - begin}
+        sample_means = np.array([PAF_table[list(index_dict['diseases']).index(disease),
+                                           list(index_dict['age_groups']).index(age),
+                                           list(index_dict['genders']).index(gender),
+                                           list(index_dict['risks']).index(risk), int(morb_mort == 'Mortality')]
+                                 for risk, disease, age, gender, morb_mort in inputs['PAF_calls']])
+
+        estimates = {'sample-mean': sample_means}
+        begin = time.perf_counter()
+        estimates['sample-mean per combination'] = np.array(
+            [_sample_mean(inputs, distributions_df, call, shift_of(call) if quantity == 'shifted PAF' else 0.0,
+                          derivative) for call in inputs['PAF_calls']])
+        times['sample-mean per combination'] = time.perf_counter() - begin
+        for binning in binning_methods:
+            integrator = PAFIntegrator(100) if binning == 'adaptive' else None
+            begin = time.perf_counter()
+            with np.errstate(divide='ignore', invalid='ignore'), contextlib.redirect_stdout(io.StringIO()):
+                estimates[f'histogram {binning}'] = np.array([histogram(quantity, call, integrator)
+                                                              for call in inputs['PAF_calls']])
+            times[f'histogram {binning}'] = time.perf_counter() - begin
+
+        for estimator, values in estimates.items():
+            finite = np.isfinite(values) & np.isfinite(sample_means)
+            differences = np.abs(values[finite] - sample_means[finite])
+            results.append(dict(quantity=quantity, estimator=estimator, PAFs=len(values),
+                                non_finite=int(np.sum(~finite)), max_abs_difference=np.max(differences, initial=0),
+                                mean_abs_difference=np.mean(differences) if len(differences) else np.nan,
+                                wall_s=times[estimator]))
+    return results
+
+
+def run_estimator_report(sample_size=1000, seed=0, data_root=None, output=None):
+    """
+    Creates synthetic inputs of one country (in a temporary folder if no data root is given) and compares the
+    sample-mean estimator of the PAFs with the histogram estimator (estimator_comparison)
+    Returns: dataframe with one row per quantity and estimator
+    """
+    with tempfile.TemporaryDirectory() as temporary_root:
+        data_root = data_root if data_root is not None else temporary_root
+        print(f'Creating synthetic data in {data_root}')
+        countries = create_synthetic_data(data_root, 1, 1, seed)
+        setup = load_setup('original', overrides={'data_root': data_root, 'sample_size': sample_size})
+        shift_setup = load_setup('shift', overrides={'data_root': data_root})
+        results = estimator_comparison(setup, shift_setup, countries[0])
+
+    report_df = pd.DataFrame(results)
+    with pd.option_context('display.max_columns', None, 'display.width', 200):
+        print(report_df.to_string(index=False, float_format='{:.3g}'.format))
+    equivalent = report_df.loc[report_df['estimator'] == 'sample-mean per combination', 'max_abs_difference'].max()
+    print(f'Largest difference of the vectorized sample means to the sample means per combination: {equivalent:.3g}')
+    if output is not None:
+        save_report(results, output)
+        print(f'Saved estimator report to: {output}')
+    return report_df
+
+
+def precision_comparison(setup, countries):
+    """
+    DALYs of the Original GBD scenario per country and run with float64 and with float32 samples (the first scenario
+    of setup.scenarios, calculated with the workers of the setup)
+    setup (module/namespace): setup of the Original GBD scenario
+    countries (array): countries of the report
+    Returns: list of result dicts per country and run with the DALYs of both precisions and their absolute and
+             relative difference, dict with the wall time per precision
+    """
+    scenario_name = setup.scenarios[0]['name']
+    DALYs, times = {}, {}
+    for precision in ['float64', 'float32']:
+        print(f'Calculating the DALYs with {precision} samples')
+        precision_setup = setup_to_namespace(setup)
+        precision_setup.precision = precision
+        precision_setup.scenarios = setup.scenarios[:1]
+        begin = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            DALYs[precision] = run_countries(original_gbd.calculate, precision_setup, countries,
+                                             original_gbd.load_inputs)[scenario_name]
+        times[precision] = time.perf_counter() - begin
+
+    results = []
+    for idx, country in enumerate(countries):
+        for run in DALYs['float64'].columns:
+            reference, value = DALYs['float64'].iloc[idx][run], DALYs['float32'].iloc[idx][run]
+            results.append(dict(country=country, UNM49=DALYs['float64'].index[idx], run=run, DALYs_float64=reference,
+                                DALYs_float32=value, abs_difference=abs(value - reference),
+                                rel_difference=abs(value - reference) / abs(reference) if reference != 0 else 0.0))
+    return results, times
+
+
+def run_precision_report(setup, countries, output=None):
+    """
+    Validates the float32 precision: compares the DALYs of all given countries with the DALYs of float64 samples
+    (precision_comparison) and prints the largest and mean differences
+    setup (module/namespace): setup of the Original GBD scenario
+    countries (array): countries of the report
+    output (str/None): JSON or CSV file for the differences per country and run
+    Returns: dataframe with one row per country and run
+    """
+    results, times = precision_comparison(setup, countries)
+    report_df = pd.DataFrame(results)
+    with pd.option_context('display.max_columns', None, 'display.width', 200):
+        print(report_df.sort_values('rel_difference', ascending=False).head(10).to_string(
+            index=False, float_format='{:.6g}'.format))
+    print(f"{len(countries)} countries: largest relative difference {report_df['rel_difference'].max():.3g}, mean "
+          f"relative difference {report_df['rel_difference'].mean():.3g}, total DALYs "
+          f"{report_df['DALYs_float64'].sum():.6g} (float64) vs. {report_df['DALYs_float32'].sum():.6g} (float32)")
+    print(f"Wall time: {times['float64']:.1f} s (float64), {times['float32']:.1f} s (float32)")
+    if output is not None:
+        save_report(results, output)
+        print(f'Saved precision report to: {output}')
+    return report_df
+
+
+def save_report(results, path):
+    """
+    Saves the benchmark results as JSON or CSV (depending on the file extension)
+    results (list): result dicts
+    path (str): saving path
+    """
+    if path.endswith('.json'):
+        with open(path, 'w') as f:
+            json.dump(results, f, indent=2, default=float)
+    else:
+        pd.DataFrame(results).to_csv(path, index=False)
+
+
+def run_benchmark(num_countries=2, num_runs=1, sample_size=1000, repeats=3, pipeline_repeats=1, seed=0,
+                  data_root=None, trace_memory=True, skip_stages=False, skip_pipelines=False, output=None):
+    """
+    Creates the synthetic inputs (in a temporary folder if no data root is given) and runs the benchmarks
+    Returns: dataframe with one row per stage/pipeline
+    """
+    with tempfile.TemporaryDirectory() as temporary_root:
+        data_root = data_root if data_root is not None else temporary_root
+        print(f'Creating synthetic data for {num_countries} countries and {num_runs} runs in {data_root}')
+        countries = create_synthetic_data(data_root, num_countries, num_runs, seed)
+
+        results = []
+        if not skip_stages:
+            setup = load_setup('original', overrides={'data_root': data_root, 'sample_size': sample_size})
+            results += benchmark_stages(setup, countries[0], repeats, trace_memory)
+        if not skip_pipelines:
+            results += benchmark_pipelines(data_root, countries, num_runs, sample_size, pipeline_repeats,
+                                           trace_memory)
+
+    report_df = pd.DataFrame(results)
+    with pd.option_context('display.max_columns', None, 'display.width', 200):
+        print(report_df.drop(columns='description').round(4).to_string(index=False))
+    if output is not None:
+        save_report(results, output)
+        print(f'Saved benchmark report to: {output}')
+    return report_df
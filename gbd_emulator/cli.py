@@ -0,0 +1,282 @@
+import os
+import sys
+import argparse
+import numpy as np
+from .config import load_setup, repo_root
+from .helpers_data_and_setup import load_country_codes
+from .runner import run_and_save
+from .aggregation import load_country_groups
+from .scenarios import original_gbd, unilateral_shift, partial_derivative
+from .benchmark import run_benchmark, run_sampling_report, run_estimator_report, run_precision_report
+from .ssp_preprocessing import run_SSP_pipeline, SSPs, preprocessing_steps, measures
+from .random_streams import sampling_methods
+from .integration import binning_methods, PAF_estimators
+from .Distribution_creater_class import precisions
+
+'''
+################################################
+# command line interface of the emulator
+# gbd-emulator original|shift|shift-pj|marginals|ssp-prep|benchmark|sampling-report|estimator-report|
+#              precision-report [options]
+# (run as 'python -m gbd_emulator ...' from the root directory)
+################################################
+'''
+# scenario subcommands: (setup of the scenario folder, driver, DALY calculation mode)
+scenario_commands = {'original': ('original', original_gbd, None),
+                     'shift': ('shift', unilateral_shift, 'J'),
+                     'shift-pj': ('shift', unilateral_shift, 'PJ'),
+                     'marginals': ('marginals', partial_derivative, None)}
+
+
+def select_countries(countries, names=None, country_range=None):
+    """
+    Selects the countries of a run, either by name or by start and stop index (all countries if neither is given)
+    countries (array): all modelled countries
+    names (list/None): names of the countries
+    country_range (list/None): start and stop index of the countries
+    Returns: selected countries, start and stop index of the selection (used to label the output)
+    """
+    if names is not None:
+        unknown = [name for name in names if name not in countries]
+        if len(unknown) > 0:
+            print(f'Unknown countries: {unknown}')
+            exit()
+        idx = np.sort([np.where(countries == name)[0][0] for name in names])
+        print(f'It is calculated for the countries {list(countries[idx])}')
+        return countries[idx], idx[0], idx[-1] + 1
+    elif country_range is not None:
+        start_country_idx, stop_country_idx = int(country_range[0]), int(country_range[1])
+        print(f'It is calculated for countries from {start_country_idx} to {stop_country_idx}')
+        return countries[start_country_idx: stop_country_idx], start_country_idx, stop_country_idx
+    return countries, 0, len(countries)
+
+
+def common_overrides(args):
+    """
+    Settings given with the options shared by all scenario subcommands (see add_common_arguments)
+    args (namespace): parsed command line arguments
+    Returns: dict of settings (None if the option is not given)
+    """
+    return {'data_root': args.data_root, 'countries': args.countries, 'country_range': args.country_range,
+            'num_workers': args.workers, 'chunk_size': args.chunk_size, 'output_format': args.output_format,
+            'num_runs': args.num_runs, 'sample_size': args.sample_size, 'random_seed': args.seed,
+            'sampling_method': args.sampling, 'PAF_binning': args.paf_binning, 'PAF_bins': args.paf_bins,
+            'PAF_tolerance': args.paf_tolerance, 'PAF_estimator': args.paf_estimator, 'precision': args.precision,
+            'saving_path': getattr(args, 'saving_path', None), 'timing_report_path': args.timing_report,
+            'profiler': args.profiler, 'profiler_path': args.profiler_path,
+            'convergence_report_path': args.convergence_report, 'truncation_report_path': args.truncation_report}
+
+
+def run_scenario(command, args):
+    """
+    Runs an analytical scenario with the setup of its folder, the config file and the command line options
+    command (str): 'original', 'shift', 'shift-pj' or 'marginals'
+    args (namespace): parsed command line arguments
+    """
+    scenario, driver, mode = scenario_commands[command]
+    overrides = common_overrides(args)
+    if scenario == 'shift':
+        overrides.update({'scenario_names': args.scenarios, 'time_points': args.time_points})
+        if mode == 'J' and args.non_joint:
+            mode = 'NJ'
+    elif scenario == 'marginals':
+        overrides.update({'time_points': args.time_points, 'SSP_comparison_path': args.comparison_path,
+                          'run_output': args.run_output})
+        if args.ssp is not None:
+            # several SSPs are compared in one run
+            overrides.update({'SSP_name': args.ssp[0], 'SSP_names': args.ssp if len(args.ssp) > 1 else None})
+
+    setup = load_setup(scenario, args.config, overrides)
+    if scenario == 'shift' and mode == 'J' and setup.calculate_NJ_DALYs:
+        mode = 'NJ'
+    elif scenario == 'marginals' and args.annual:
+        # annual steps between the first and last time point (the years in between are interpolated)
+        time_points = setup.index_dict['time_points']
+        setup.index_dict['time_points'] = setup.time_points = np.arange(np.min(time_points), np.max(time_points) + 1)
+
+    _, countries = load_country_codes(setup.M49_path)
+    countries, start_country_idx, stop_country_idx = \
+        select_countries(countries, getattr(setup, 'countries', None), getattr(setup, 'country_range', None))
+    if hasattr(setup, 'country_groups'):
+        # the members of the country groups are checked before the calculation
+        load_country_groups(setup)
+
+    kwargs = {} if mode is None else {'mode': mode}
+    run_and_save(driver.calculate, driver.save, setup, countries, start_country_idx, stop_country_idx,
+                 driver.load_inputs, **kwargs)
+
+
+def run_precision(args):
+    """
+    Runs the float32 validation report of the Original GBD scenario for the selected countries (all by default)
+    args (namespace): parsed command line arguments
+    """
+    setup = load_setup('original', args.config, common_overrides(args))
+    _, countries = load_country_codes(setup.M49_path)
+    countries, _, _ = select_countries(countries, getattr(setup, 'countries', None),
+                                       getattr(setup, 'country_range', None))
+    run_precision_report(setup, countries, args.output)
+
+
+def run_SSP_preparation(args):
+    """
+    Runs the SSP preprocessing of the Marginals scenario (demand proportions, projected means and projected YLLs/YLDs)
+    for the given SSPs in one run
+    args (namespace): parsed command line arguments
+    """
+    data_root = args.data_root if args.data_root is not None else os.path.join(repo_root, 'Data')
+    run_SSP_pipeline(data_root, args.ssp, args.steps, args.measures, args.workers, args.output_format)
+
+
+def add_common_arguments(parser):
+    """
+    Adds the options shared by all scenario subcommands
+    parser (ArgumentParser): parser of the subcommand
+    """
+    parser.add_argument('--config', type=str, default=None,
+                        help="JSON or python (Setup_file style) config file overriding the Setup_file of the scenario")
+    parser.add_argument('--data-root', type=str, default=None, help="root directory of the data (default: Data/)")
+    parser.add_argument('--countries', type=str, nargs='+', default=None, help="names of the countries to calculate")
+    parser.add_argument('--country-range', type=int, nargs=2, default=None, metavar=('START', 'STOP'),
+                        help="start and stop index of the countries to calculate")
+    parser.add_argument('--workers', type=int, default=None, help="number of worker processes")
+    parser.add_argument('--chunk-size', type=int, default=None,
+                        help="number of countries per chunk handed to a worker")
+    parser.add_argument('--output-format', type=str, default=None, choices=['csv', 'parquet'],
+                        help="format of the saved predictions")
+    parser.add_argument('--num-runs', type=int, default=None, help="number of runs (1 for central values)")
+    parser.add_argument('--sample-size', type=int, default=None, help="sample size of the intake distributions")
+    parser.add_argument('--seed', type=int, default=None, help="seed of the random streams of the sampling")
+    parser.add_argument('--sampling', type=str, default=None, choices=sampling_methods,
+                        help="sampling of the intake distributions (random, stratified or quasi-random numbers)")
+    parser.add_argument('--paf-binning', type=str, default=None, choices=binning_methods,
+                        help="bins of the PAF integration (equally wide or at sample quantiles and the TMREL)")
+    parser.add_argument('--paf-bins', type=int, default=None, help="(largest) number of bins of the adaptive binning")
+    parser.add_argument('--paf-tolerance', type=float, default=None,
+                        help="absolute error of the PAFs at which the adaptive binning stops refining")
+    parser.add_argument('--paf-estimator', type=str, default=None, choices=PAF_estimators,
+                        help="estimator of the PAFs (integral of the histogram or ratio of the sample means)")
+    parser.add_argument('--precision', type=str, default=None, choices=list(precisions),
+                        help="precision of the intake samples and RRs (integrals are accumulated in float64)")
+    parser.add_argument('--timing-report', type=str, default=None,
+                        help="JSON or CSV file for the timing report per stage")
+    parser.add_argument('--profiler', type=str, default=None, choices=['cprofile', 'pyinstrument'],
+                        help="capture the whole run with cProfile or pyinstrument")
+    parser.add_argument('--profiler-path', type=str, default=None,
+                        help="saving path of the cProfile stats or pyinstrument html page")
+    parser.add_argument('--convergence-report', type=str, default=None,
+                        help="JSON or CSV file for the convergence report of the parameter fitting")
+    parser.add_argument('--truncation-report', type=str, default=None,
+                        help="JSON or CSV file for the truncated mass of the intake distributions")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='gbd-emulator', description="GBD Diet-NCD emulator")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    parser_original = subparsers.add_parser('original', help="Analytical scenario 1: original GBD burden")
+    add_common_arguments(parser_original)
+
+    for command, description in [('shift', "Analytical scenario 2: unilateral shift (joint or non-joint DALYs)"),
+                                 ('shift-pj', "Analytical scenario 2: unilateral shift (proportional joint DALYs)")]:
+        parser_shift = subparsers.add_parser(command, help=description)
+        add_common_arguments(parser_shift)
+        parser_shift.add_argument('--scenarios', type=str, nargs='+', default=None,
+                                  help="scenario names of the shift file")
+        parser_shift.add_argument('--time-points', type=str, nargs='+', default=None, help="years of the shift file")
+        parser_shift.add_argument('--saving-path', type=str, default=None,
+                                  help="path where the predictions are saved ({} is replaced by the mode)")
+        if command == 'shift':
+            parser_shift.add_argument('--non-joint', action='store_true', help="calculate non-joint DALYs")
+
+    parser_marginals = subparsers.add_parser('marginals', help="Analytical scenario 3: marginal DALYs under an SSP")
+    add_common_arguments(parser_marginals)
+    parser_marginals.add_argument('--ssp', type=str, nargs='+', default=None, choices=SSPs,
+                                  help="SSP of the projections (several SSPs are calculated together)")
+    parser_marginals.add_argument('--time-points', type=int, nargs='+', default=None, help="years of the projections")
+    parser_marginals.add_argument('--annual', action='store_true',
+                                  help="annual time points from the first to the last year (interpolated projections)")
+    parser_marginals.add_argument('--saving-path', type=str, default=None,
+                                  help="path where the predictions are saved ({} is replaced by the age band)")
+    parser_marginals.add_argument('--comparison-path', type=str, default=None,
+                                  help="folder of the dataset of several SSPs ({} is replaced by the age band)")
+    parser_marginals.add_argument('--run-output', type=str, default=None, choices=['first', 'all', 'summary'],
+                                  help="runs in the predictions (run 0, all runs or summary statistics over the runs)")
+
+    parser_SSP = subparsers.add_parser('ssp-prep', help="SSP preprocessing of the Marginals scenario")
+    parser_SSP.add_argument('--data-root', type=str, default=None, help="root directory of the data (default: Data/)")
+    parser_SSP.add_argument('--ssp', type=str, nargs='+', default=SSPs, choices=SSPs, help="SSPs to prepare")
+    parser_SSP.add_argument('--steps', type=str, nargs='+', default=preprocessing_steps,
+                            choices=preprocessing_steps, help="preprocessing steps to run")
+    parser_SSP.add_argument('--measures', type=str, nargs='+', default=measures, choices=measures,
+                            help="burden measures to project")
+    parser_SSP.add_argument('--workers', type=int, default=None,
+                            help="number of worker processes (default: one per SSP, at most the number of CPUs)")
+    parser_SSP.add_argument('--output-format', type=str, default='csv', choices=['csv', 'parquet'],
+                            help="format of the combined outputs of all SSPs")
+
+    parser_benchmark = subparsers.add_parser('benchmark', help="benchmark of the stages and scenarios on synthetic data")
+    parser_benchmark.add_argument('--num-countries', type=int, default=2, help="number of synthetic countries")
+    parser_benchmark.add_argument('--num-runs', type=int, default=1, help="number of runs")
+    parser_benchmark.add_argument('--sample-size', type=int, default=1000,
+                                  help="sample size of the intake distributions")
+    parser_benchmark.add_argument('--repeats', type=int, default=3, help="number of timed calls per stage")
+    parser_benchmark.add_argument('--pipeline-repeats', type=int, default=1,
+                                  help="number of timed calls per scenario pipeline")
+    parser_benchmark.add_argument('--seed', type=int, default=0, help="seed of the synthetic data")
+    parser_benchmark.add_argument('--data-root', type=str, default=None,
+                                  help="folder for the synthetic data (default: temporary folder)")
+    parser_benchmark.add_argument('--no-memory', action='store_true', help="do not trace the peak memory")
+    parser_benchmark.add_argument('--skip-stages', action='store_true', help="only benchmark the scenario pipelines")
+    parser_benchmark.add_argument('--skip-pipelines', action='store_true', help="only benchmark the single stages")
+    parser_benchmark.add_argument('--output', type=str, default=None, help="JSON or CSV file for the report")
+
+    parser_sampling = subparsers.add_parser('sampling-report',
+                                            help="PAF error per sampling method and sample size (synthetic data)")
+    parser_sampling.add_argument('--sample-sizes', type=int, nargs='+', default=[256, 512, 1024, 2048],
+                                 help="sample sizes of the intake distributions")
+    parser_sampling.add_argument('--methods', type=str, nargs='+', default=sampling_methods, choices=sampling_methods,
+                                 help="sampling methods")
+    parser_sampling.add_argument('--replicates', type=int, default=3,
+                                 help="number of samples (seeds) per method and sample size")
+    parser_sampling.add_argument('--reference-size', type=int, default=16000,
+                                 help="sample size of the reference PAFs")
+    parser_sampling.add_argument('--seed', type=int, default=0, help="seed of the synthetic data")
+    parser_sampling.add_argument('--data-root', type=str, default=None,
+                                 help="folder for the synthetic data (default: temporary folder)")
+    parser_sampling.add_argument('--output', type=str, default=None, help="JSON or CSV file for the report")
+
+    parser_estimator = subparsers.add_parser('estimator-report',
+                                             help="sample-mean vs. histogram estimator of the PAFs (synthetic data)")
+    parser_estimator.add_argument('--sample-size', type=int, default=1000,
+                                  help="sample size of the intake distributions")
+    parser_estimator.add_argument('--seed', type=int, default=0, help="seed of the synthetic data")
+    parser_estimator.add_argument('--data-root', type=str, default=None,
+                                  help="folder for the synthetic data (default: temporary folder)")
+    parser_estimator.add_argument('--output', type=str, default=None, help="JSON or CSV file for the report")
+
+    parser_precision = subparsers.add_parser('precision-report',
+                                             help="DALY differences of float32 vs. float64 samples (Original GBD)")
+    add_common_arguments(parser_precision)
+    parser_precision.add_argument('--output', type=str, default=None, help="JSON or CSV file for the report")
+
+    return parser
+
+
+def main(arguments=None):
+    args = build_parser().parse_args(arguments if arguments is not None else sys.argv[1:])
+    if args.command == 'ssp-prep':
+        run_SSP_preparation(args)
+    elif args.command == 'benchmark':
+        run_benchmark(args.num_countries, args.num_runs, args.sample_size, args.repeats, args.pipeline_repeats,
+                      args.seed, args.data_root, not args.no_memory, args.skip_stages, args.skip_pipelines,
+                      args.output)
+    elif args.command == 'sampling-report':
+        run_sampling_report(args.sample_sizes, args.methods, args.replicates, args.reference_size, args.seed,
+                            args.data_root, args.output)
+    elif args.command == 'estimator-report':
+        run_estimator_report(args.sample_size, args.seed, args.data_root, args.output)
+    elif args.command == 'precision-report':
+        run_precision(args)
+    else:
+        run_scenario(args.command, args)
@@ -0,0 +1,127 @@
+import os
+import json
+import importlib.util
+import numpy as np
+from .runner import setup_to_namespace
+
+# root directory of the repository (contains the scenario folders and the Data folder)
+repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# default data root of the Setup_files (paths there are relative to the scenario folders)
+setup_data_root = '../Data/'
+
+# scenario folder per analytical scenario (each folder keeps its own Setup_file.py)
+scenario_folders = {'original': 'Original GBD Emulator',
+                    'shift': 'Unilateral Shift Intake',
+                    'marginals': 'Marginals Calculation'}
+
+# paths of the Marginals Setup_file that depend on the SSP
+SSP_paths = ['means_per_SSP', 'total_YLL_or_YLD_path_per_SSP', 'saving_path']
+
+
+def load_module(path, name):
+    """
+    Loads a python file (e.g. a Setup_file or an SSP preprocessing script) as a module without changing the working
+    directory
+    path (str): path of the python file
+    name (str): module name
+    Returns: module
+    """
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def load_config_file(config_path):
+    """
+    Loads the settings of a config file, either a JSON file or a python file in the style of a Setup_file
+    config_path (str): path of the config file
+    Returns: dict of settings
+    """
+    if config_path.endswith('.json'):
+        with open(config_path) as f:
+            return json.load(f)
+    elif config_path.endswith('.py'):
+        return vars(setup_to_namespace(load_module(config_path, 'config_file')))
+    else:
+        print(f'Unknown config file type {config_path}, use a .json or .py file')
+        exit()
+
+
+def rebase_paths(value, data_root):
+    """
+    Replaces the relative data root of the Setup_files ('../Data/') in a setting by the given data root
+    value (str/dict/list): setting (dicts and lists, e.g. the scenarios of the Original GBD Setup_file, are searched
+                           recursively)
+    data_root (str): root directory of the data
+    Returns: setting with rebased paths
+    """
+    if isinstance(value, str) and value.startswith(setup_data_root):
+        return os.path.join(data_root, value[len(setup_data_root):])
+    elif isinstance(value, dict):
+        return {key: rebase_paths(item, data_root) for key, item in value.items()}
+    elif isinstance(value, list):
+        return [rebase_paths(item, data_root) for item in value]
+    return value
+
+
+def SSP_path(setup, name, SSP_name):
+    """
+    SSP specific path of the Marginals setup for another SSP (the setup is not changed)
+    setup (namespace): setup of the Marginals scenario
+    name (str): one of SSP_paths
+    SSP_name (str): one of 'SSP1', 'SSP2', 'SSP3', 'SSP4', 'SSP5'
+    Returns: path
+    """
+    return getattr(setup, name).replace(setup.SSP_name, SSP_name)
+
+
+def set_SSP(setup, SSP_name):
+    """
+    Switches the SSP specific paths of the Marginals setup to another SSP
+    setup (namespace): setup of the Marginals scenario
+    SSP_name (str): one of 'SSP1', 'SSP2', 'SSP3', 'SSP4', 'SSP5'
+    """
+    for name in SSP_paths:
+        setattr(setup, name, SSP_path(setup, name, SSP_name))
+    setup.SSP_name = SSP_name
+
+
+def load_setup(scenario, config_path=None, overrides=None):
+    """
+    Builds the setup of a scenario from the Setup_file of its folder, a config file and command line overrides
+    (in this order). Settings named like an index_dict entry (e.g. time_points, scenario_names) replace the entry in
+    index_dict, countries and country_range select the countries of the run, SSP_name switches the SSP specific
+    paths and data_root replaces the '../Data/' root of all paths.
+    scenario (str): 'original', 'shift' or 'marginals'
+    config_path (str/None): JSON or python config file
+    overrides (dict/None): settings given on the command line (None values are ignored)
+    Returns: setup namespace
+    """
+    setup = setup_to_namespace(
+        load_module(os.path.join(repo_root, scenario_folders[scenario], 'Setup_file.py'), f'{scenario}_Setup_file'))
+    setup.index_dict = dict(setup.index_dict)
+
+    settings = load_config_file(config_path) if config_path is not None else {}
+    settings.update({key: value for key, value in (overrides or {}).items() if value is not None})
+
+    data_root = settings.pop('data_root', os.path.join(repo_root, 'Data'))
+    for key, value in settings.items():
+        if key in ['countries', 'country_range']:
+            # country subset of the run (not the modelled countries of index_dict)
+            setattr(setup, key, value)
+        elif key in setup.index_dict:
+            setup.index_dict[key] = np.array(value)
+            if hasattr(setup, key):
+                setattr(setup, key, setup.index_dict[key])
+        elif key == 'SSP_name':
+            set_SSP(setup, value)
+        else:
+            setattr(setup, key, value)
+
+    for key, value in list(vars(setup).items()):
+        setattr(setup, key, rebase_paths(value, data_root))
+    setup.data_root = data_root
+
+    return setup
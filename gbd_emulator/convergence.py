@@ -0,0 +1,159 @@
+import json
+import contextlib
+import numpy as np
+import pandas as pd
+
+'''
+################################################
+# convergence telemetry of the parameter fitting
+# counts per (country, risk, distribution family, method) how often the closed-form approximations, the vectorized
+# Newton solver and the single optimizers of the fallback cascade (Nelder-Mead -> Powell -> L-BFGS-B -> TNC ->
+# SLSQP -> trust-constr) succeeded, together with the iterations, function evaluations (histogram) and relative error
+# of the variance of the fitted distribution
+################################################
+'''
+methods = ['closed form', 'Newton', 'Nelder-Mead', 'Powell', 'L-BFGS-B', 'TNC', 'SLSQP', 'trust-constr']
+
+# upper edges of the histogram bins of the function evaluations per solve (the last bin is open)
+nfev_bins = [0, 10, 20, 50, 100, 200, 500, 1000]
+
+
+def _empty_stats():
+    return {'count': 0, 'attempts': 0, 'nit': 0, 'nfev': 0, 'max_nfev': 0, 'max_residual': 0.0,
+            'nfev_histogram': [0] * (len(nfev_bins) + 1)}
+
+
+class ConvergenceTelemetry(object):
+    # accumulates the outcome of the parameter fits per (country, risk, family, method)
+
+    def __init__(self):
+        self.stats = {}
+        self.labels = {'country': None, 'risk': None}
+
+    @contextlib.contextmanager
+    def cell(self, **labels):
+        """
+        Context manager labelling the fits with the country and/or risk they belong to
+        labels: country and/or risk
+        """
+        previous = dict(self.labels)
+        self.labels.update(labels)
+        try:
+            yield
+        finally:
+            self.labels = previous
+
+    def record(self, family, method, attempts, nit, nfev, residual):
+        """
+        Records one fit
+        family (str): 'fisk', 'weibull' or 'invweibull'
+        method (str): method that succeeded ('closed form', 'Newton' or the optimization method)
+        attempts (int): number of methods tried (1 if the first one succeeded)
+        nit, nfev (int): iterations and function evaluations summed over all attempts
+        residual (float): relative error of the variance of the fitted distribution
+        """
+        key = (self.labels['country'], self.labels['risk'], family, method)
+        stats = self.stats.setdefault(key, _empty_stats())
+        stats['count'] += 1
+        stats['attempts'] += int(attempts)
+        stats['nit'] += int(nit)
+        stats['nfev'] += int(nfev)
+        stats['max_nfev'] = max(stats['max_nfev'], int(nfev))
+        stats['max_residual'] = max(stats['max_residual'], float(residual))
+        stats['nfev_histogram'][int(np.searchsorted(nfev_bins, nfev))] += 1
+
+    def record_batch(self, family, method, nit, nfev, residuals, risks=None):
+        """
+        Records the fits of a vectorized solver (one attempt per fit)
+        family (str): 'fisk', 'weibull' or 'invweibull'
+        method (str): 'closed form' or 'Newton'
+        nit, nfev (array): iterations and function evaluations of each fit
+        residuals (array): relative errors of the variances of the fitted distributions
+        risks (array/None): risk of each fit (None: the risk label of the current context)
+        """
+        for idx, residual in enumerate(residuals):
+            with self.cell(**({} if risks is None else {'risk': risks[idx]})):
+                self.record(family, method, 1, nit[idx], nfev[idx], residual)
+
+    def record_closed_form(self, family, residuals, risks=None):
+        """
+        Records the fits of a closed-form approximation (no iterations)
+        family (str): 'weibull' or 'invweibull'
+        residuals (array): relative errors of the variances of the fitted distributions
+        risks (array/None): risk of each fit (None: the risk label of the current context)
+        """
+        residuals = np.atleast_1d(residuals)
+        self.record_batch(family, 'closed form', np.zeros(len(residuals)), np.zeros(len(residuals)), residuals, risks)
+
+    def reset(self):
+        self.stats = {}
+
+    def merge(self, stats):
+        """
+        Adds the stats of another telemetry object (e.g. of a worker process)
+        stats (dict): stats per (country, risk, family, method)
+        """
+        for key, other in stats.items():
+            own = self.stats.setdefault(key, _empty_stats())
+            for name in ['count', 'attempts', 'nit', 'nfev']:
+                own[name] += other[name]
+            own['max_nfev'] = max(own['max_nfev'], other['max_nfev'])
+            own['max_residual'] = max(own['max_residual'], other['max_residual'])
+            own['nfev_histogram'] = [a + b for a, b in zip(own['nfev_histogram'], other['nfev_histogram'])]
+
+    def report(self):
+        """
+        Returns: dataframe with one row per (country, risk, family, method), the number of fits, fallbacks (failed
+                 attempts), mean iterations and function evaluations, the histogram of the function evaluations and the
+                 largest relative error
+        """
+        histogram_columns = [f'nfev<={edge}' for edge in nfev_bins] + [f'nfev>{nfev_bins[-1]}']
+        rows = []
+        for (country, risk, family, method), stats in self.stats.items():
+            rows.append(dict(country=country, risk=risk, family=family, method=method, count=stats['count'],
+                             fallbacks=stats['attempts'] - stats['count'], mean_nit=stats['nit'] / stats['count'],
+                             mean_nfev=stats['nfev'] / stats['count'], max_nfev=stats['max_nfev'],
+                             max_residual=stats['max_residual'],
+                             **dict(zip(histogram_columns, stats['nfev_histogram']))))
+        report_df = pd.DataFrame(rows, columns=['country', 'risk', 'family', 'method', 'count', 'fallbacks',
+                                                'mean_nit', 'mean_nfev', 'max_nfev', 'max_residual'] +
+                                 histogram_columns)
+        report_df['method'] = pd.Categorical(report_df['method'], categories=methods)
+        return report_df.sort_values(['country', 'risk', 'family', 'method']).reset_index(drop=True)
+
+    def summary(self):
+        """
+        Returns: dataframe with the number and share of the fits per (family, method) over all countries and risks
+        """
+        report_df = self.report()
+        report_df['nfev'] = report_df['mean_nfev'] * report_df['count']
+        summary_df = report_df.groupby(['family', 'method'], observed=True).agg(
+            count=('count', 'sum'), fallbacks=('fallbacks', 'sum'), nfev=('nfev', 'sum'), max_nfev=('max_nfev', 'max'),
+            max_residual=('max_residual', 'max')).reset_index()
+        summary_df['share'] = summary_df['count'] / summary_df.groupby('family')['count'].transform('sum')
+        summary_df['mean_nfev'] = summary_df['nfev'] / summary_df['count']
+        return summary_df[['family', 'method', 'count', 'share', 'fallbacks', 'mean_nfev', 'max_nfev', 'max_residual']]
+
+    def save_report(self, path):
+        """
+        Prints the summary per family and method and saves the report per country and risk as JSON or CSV
+        (depending on the file extension)
+        path (str/None): saving path (None: only the summary is printed)
+        """
+        if len(self.stats) == 0:
+            return
+        print(self.summary().round(4).to_string(index=False))
+        if path is None:
+            return
+        report_df = self.report()
+        report_df['method'] = report_df['method'].astype(str)
+        if path.endswith('.json'):
+            with open(path, 'w') as f:
+                json.dump(report_df.to_dict(orient='records'), f, indent=2, default=float)
+        else:
+            report_df.to_csv(path, index=False)
+        print(f'Saved convergence report to: {path}')
+
+
+# telemetry of the current process, filled by the parameter fitting (helpers_variables_calculation.py)
+telemetry = ConvergenceTelemetry()
@@ -0,0 +1,364 @@
+import numpy as np
+from scipy import special
+from .helpers import distribution_names
+
+'''
+################################################
+# ensemble distributions
+# array-native pdf, cdf, ppf and sampling of the 12 distribution families of the ensemble for many (risk, age, sex)
+# cells at once, written with scipy.special primitives instead of scipy frozen distributions
+# parameters: array (..., 27) with the columns of dist_parameter_tuples (helpers.py), the same layout as the
+# parameters_df of the DistributionCreator
+################################################
+'''
+# columns of the lower and upper limit, the mirrored families are mirrored at the upper limit
+lower_limit = 25
+upper_limit = 26
+
+
+def _expon_pdf(x, p):
+    s = p[..., 0]
+    return np.where(x >= 0, np.exp(-x / s) / s, 0)
+
+
+def _expon_cdf(x, p):
+    return np.where(x >= 0, -np.expm1(-x / p[..., 0]), 0)
+
+
+def _expon_ppf(q, p):
+    return -p[..., 0] * np.log1p(-q)
+
+
+def _gamma_pdf(x, p, scale_idx=1, a_idx=2):
+    s, a = p[..., scale_idx], p[..., a_idx]
+    z = x / s
+    return np.where(z > 0, np.exp(special.xlogy(a - 1, z) - z - special.gammaln(a)) / s, 0)
+
+
+def _gamma_cdf(x, p, scale_idx=1, a_idx=2):
+    return special.gammainc(p[..., a_idx], np.maximum(x / p[..., scale_idx], 0))
+
+
+def _gamma_ppf(q, p, scale_idx=1, a_idx=2):
+    return p[..., scale_idx] * special.gammaincinv(p[..., a_idx], q)
+
+
+def _fisk_pdf(x, p):
+    s, c = p[..., 3], p[..., 4]
+    z = np.maximum(x / s, 0)
+    return np.where(z > 0, c / s * z ** (c - 1) / (1 + z ** c) ** 2, 0)
+
+
+def _fisk_cdf(x, p):
+    z = np.maximum(x / p[..., 3], 0)
+    return np.where(z > 0, 1 / (1 + z ** -p[..., 4]), 0)
+
+
+def _fisk_ppf(q, p):
+    return p[..., 3] * (q / (1 - q)) ** (1 / p[..., 4])
+
+
+def _gumbel_pdf(x, p, scale_idx=5, loc_idx=6):
+    z = (x - p[..., loc_idx]) / p[..., scale_idx]
+    return np.exp(-z - np.exp(-z)) / p[..., scale_idx]
+
+
+def _gumbel_cdf(x, p, scale_idx=5, loc_idx=6):
+    return np.exp(-np.exp(-(x - p[..., loc_idx]) / p[..., scale_idx]))
+
+
+def _gumbel_ppf(q, p, scale_idx=5, loc_idx=6):
+    return p[..., loc_idx] - p[..., scale_idx] * np.log(-np.log(q))
+
+
+def _weibull_pdf(x, p):
+    s, c = p[..., 7], p[..., 8]
+    z = np.maximum(x / s, 0)
+    return np.where(z > 0, c / s * z ** (c - 1) * np.exp(-z ** c), 0)
+
+
+def _weibull_cdf(x, p):
+    return -np.expm1(-np.maximum(x / p[..., 7], 0) ** p[..., 8])
+
+
+def _weibull_ppf(q, p):
+    return p[..., 7] * (-np.log1p(-q)) ** (1 / p[..., 8])
+
+
+def _lognorm_pdf(x, p):
+    scale, s = p[..., 9], p[..., 10]
+    z = np.log(np.maximum(x, 0) / scale) / s
+    return np.where(x > 0, np.exp(-z ** 2 / 2) / (x * s * np.sqrt(2 * np.pi)), 0)
+
+
+def _lognorm_cdf(x, p):
+    return np.where(x > 0, special.ndtr(np.log(np.maximum(x, 0) / p[..., 9]) / p[..., 10]), 0)
+
+
+def _lognorm_ppf(q, p):
+    return p[..., 9] * np.exp(p[..., 10] * special.ndtri(q))
+
+
+def _norm_pdf(x, p):
+    z = (x - p[..., 12]) / p[..., 11]
+    return np.exp(-z ** 2 / 2) / (p[..., 11] * np.sqrt(2 * np.pi))
+
+
+def _norm_cdf(x, p):
+    return special.ndtr((x - p[..., 12]) / p[..., 11])
+
+
+def _norm_ppf(q, p):
+    return p[..., 12] + p[..., 11] * special.ndtri(q)
+
+
+def _beta_pdf(x, p):
+    scale, loc, a, b = p[..., 13], p[..., 14], p[..., 15], p[..., 16]
+    z = (x - loc) / scale
+    inside = (z > 0) & (z < 1)
+    z = np.clip(z, 0, 1)
+    return np.where(inside, np.exp(special.xlogy(a - 1, z) + special.xlog1py(b - 1, -z) - special.betaln(a, b)) /
+                    scale, 0)
+
+
+def _beta_cdf(x, p):
+    return special.betainc(p[..., 15], p[..., 16], np.clip((x - p[..., 14]) / p[..., 13], 0, 1))
+
+
+def _beta_ppf(q, p):
+    return p[..., 14] + p[..., 13] * special.betaincinv(p[..., 15], p[..., 16], q)
+
+
+def _mirrored_gamma_pdf(x, p):
+    return _gamma_pdf(p[..., upper_limit] - x, p, 17, 18)
+
+
+def _mirrored_gamma_cdf(x, p):
+    return 1 - _gamma_cdf(p[..., upper_limit] - x, p, 17, 18)
+
+
+def _mirrored_gamma_ppf(q, p):
+    return p[..., upper_limit] - _gamma_ppf(1 - q, p, 17, 18)
+
+
+def _mirrored_gumbel_pdf(x, p):
+    return _gumbel_pdf(p[..., upper_limit] - x, p, 19, 20)
+
+
+def _mirrored_gumbel_cdf(x, p):
+    return 1 - _gumbel_cdf(p[..., upper_limit] - x, p, 19, 20)
+
+
+def _mirrored_gumbel_ppf(q, p):
+    return p[..., upper_limit] - _gumbel_ppf(1 - q, p, 19, 20)
+
+
+def _invgamma_pdf(x, p):
+    s, a = p[..., 21], p[..., 22]
+    z = np.maximum(x / s, 0)
+    return np.where(z > 0, np.exp(special.xlogy(-a - 1, z) - 1 / z - special.gammaln(a)) / s, 0)
+
+
+def _invgamma_cdf(x, p):
+    z = np.maximum(x / p[..., 21], 0)
+    return np.where(z > 0, special.gammaincc(p[..., 22], 1 / z), 0)
+
+
+def _invgamma_ppf(q, p):
+    return p[..., 21] / special.gammainccinv(p[..., 22], q)
+
+
+def _invweibull_pdf(x, p):
+    s, c = p[..., 23], p[..., 24]
+    z = np.maximum(x / s, 0)
+    return np.where(z > 0, c / s * z ** (-c - 1) * np.exp(-z ** -c), 0)
+
+
+def _invweibull_cdf(x, p):
+    z = np.maximum(x / p[..., 23], 0)
+    return np.where(z > 0, np.exp(-z ** -p[..., 24]), 0)
+
+
+def _invweibull_ppf(q, p):
+    return p[..., 23] * (-np.log(q)) ** (-1 / p[..., 24])
+
+
+# pdf, cdf and ppf of each family (in the order of distribution_names), called as f(x, p) with x broadcastable
+# against p[..., 0]
+families = [(_expon_pdf, _expon_cdf, _expon_ppf),
+            (_gamma_pdf, _gamma_cdf, _gamma_ppf),
+            (_fisk_pdf, _fisk_cdf, _fisk_ppf),
+            (_gumbel_pdf, _gumbel_cdf, _gumbel_ppf),
+            (_weibull_pdf, _weibull_cdf, _weibull_ppf),
+            (_lognorm_pdf, _lognorm_cdf, _lognorm_ppf),
+            (_norm_pdf, _norm_cdf, _norm_ppf),
+            (_beta_pdf, _beta_cdf, _beta_ppf),
+            (_mirrored_gamma_pdf, _mirrored_gamma_cdf, _mirrored_gamma_ppf),
+            (_mirrored_gumbel_pdf, _mirrored_gumbel_cdf, _mirrored_gumbel_ppf),
+            (_invgamma_pdf, _invgamma_cdf, _invgamma_ppf),
+            (_invweibull_pdf, _invweibull_cdf, _invweibull_ppf)]
+assert len(families) == len(distribution_names)
+
+
+def _evaluate(function_idx, x, parameters, per_family):
+    # evaluates one of pdf/cdf/ppf of all families, x (..., n) or, if per_family, (..., families, n), the leading
+    # dimensions of x and the parameters are broadcast
+    x = np.asarray(x, dtype=float)
+    parameters = np.asarray(parameters, dtype=float)[..., None, :]
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore', under='ignore'):
+        values = [family[function_idx](x[..., idx, :] if per_family else x, parameters)
+                  for idx, family in enumerate(families)]
+    return np.stack(values, axis=-2)
+
+
+def pdf(x, parameters, per_family=False):
+    """
+    Probability densities of all families of the ensemble
+    x (array): values (..., n), the same for all families, or per family (..., 12, n)
+    parameters (array): parameters of the cells (..., 27)
+    per_family (bool): whether x holds values per family (..., 12, n)
+    Returns: array (..., 12, n)
+    """
+    return _evaluate(0, x, parameters, per_family)
+
+
+def cdf(x, parameters, per_family=False):
+    """
+    Cumulative distribution functions of all families of the ensemble
+    x (array): values (..., n), the same for all families, or per family (..., 12, n)
+    parameters (array): parameters of the cells (..., 27)
+    per_family (bool): whether x holds values per family (..., 12, n)
+    Returns: array (..., 12, n)
+    """
+    return _evaluate(1, x, parameters, per_family)
+
+
+def ppf(q, parameters, per_family=False):
+    """
+    Quantile functions (inverse cdfs) of all families of the ensemble
+    q (array): probabilities (..., n), the same for all families, or per family (..., 12, n)
+    parameters (array): parameters of the cells (..., 27)
+    per_family (bool): whether q holds probabilities per family (..., 12, n)
+    Returns: array (..., 12, n)
+    """
+    return _evaluate(2, q, parameters, per_family)
+
+
+def _limits_cdf(parameters):
+    # cdfs of all families at the lower and upper limit, arrays (..., 12)
+    parameters = np.asarray(parameters, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore', under='ignore'):
+        lower = np.stack([family[1](parameters[..., lower_limit], parameters) for family in families], axis=-1)
+        upper = np.stack([family[1](parameters[..., upper_limit], parameters) for family in families], axis=-1)
+    return lower, upper
+
+
+def truncated_mass(parameters):
+    """
+    Probability mass of each family outside of the limits [l, u] of the cell (nan if the parameters of the family are
+    not valid)
+    parameters (array): parameters of the cells (..., 27)
+    Returns: array (..., 12)
+    """
+    lower, upper = _limits_cdf(parameters)
+    return 1 - (upper - lower)
+
+
+def truncated_ppf(q, parameters, per_family=False):
+    """
+    Quantile functions of all families truncated to the limits [l, u] of the cell, the probabilities are mapped to
+    [F(l), F(u)] of each family, so all quantiles are within the limits
+    q (array): probabilities (..., n), the same for all families, or per family (..., 12, n)
+    parameters (array): parameters of the cells (..., 27)
+    per_family (bool): whether q holds probabilities per family (..., 12, n)
+    Returns: array (..., 12, n)
+    """
+    parameters = np.asarray(parameters, dtype=float)
+    lower, upper = _limits_cdf(parameters)
+    q = np.asarray(q, dtype=float)
+    # the probabilities mapped to [F(l), F(u)] differ per family
+    q = lower[..., None] + (q if per_family else q[..., None, :]) * (upper - lower)[..., None]
+    # quantiles close to the limits can leave them by rounding
+    return np.clip(ppf(q, parameters, per_family=True), parameters[..., lower_limit, None, None],
+                   parameters[..., upper_limit, None, None])
+
+
+def truncated_weights(coefficients, mass):
+    """
+    Weights of the families of the ensemble truncated to [l, u], each coefficient is scaled with the mass of the family
+    within the limits (families without valid parameters get weight 0)
+    coefficients (array): weights of the families (..., 12)
+    mass (array): truncated mass of the families (..., 12), see truncated_mass
+    Returns: array (..., 12), normalised to 1 (the coefficients if no family has mass within the limits)
+    """
+    coefficients = np.asarray(coefficients, dtype=float)
+    weights = coefficients * np.clip(1 - np.nan_to_num(mass, nan=1), 0, 1)
+    total = weights.sum(axis=-1, keepdims=True)
+    return np.where(total > 0, weights / np.where(total > 0, total, 1), coefficients)
+
+
+def _component_quantiles(q, components, parameters, truncate):
+    # quantiles of the family of each sample, q and components (cells, size)
+    if truncate:
+        lower, upper = _limits_cdf(parameters)
+        q = np.take_along_axis(lower, components, axis=1) + q * np.take_along_axis(upper - lower, components, axis=1)
+
+    samples = np.zeros(q.shape)
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore', under='ignore'):
+        for idx, family in enumerate(families):
+            cells, columns = np.nonzero(components == idx)
+            if len(cells) > 0:
+                samples[cells, columns] = family[2](q[cells, columns], parameters[cells])
+    if truncate:
+        samples = np.clip(samples, parameters[:, lower_limit, None], parameters[:, upper_limit, None])
+    return samples
+
+
+def _cumulative_weights(parameters, coefficients, truncate):
+    # normalised cumulative weights of the families (cells, 12)
+    if truncate:
+        coefficients = truncated_weights(coefficients, truncated_mass(parameters))
+    cumulative = np.cumsum(coefficients, axis=1)
+    return cumulative / cumulative[:, -1:]
+
+
+def sample(parameters, coefficients, size, random_state=None, truncate=False):
+    """
+    Draws samples of the ensemble for all cells by inverse transform sampling (the family of each sample is drawn with
+    the weights of the cell, the sample is the quantile of a uniform random number)
+    parameters (array): parameters of the cells (cells, 27)
+    coefficients (array): weights of the families (cells, 12)
+    size (int): number of samples per cell
+    random_state (RandomState/Generator/None): random number generator (None: numpy's global random state)
+    truncate (bool): whether the ensemble is truncated to the limits [l, u] of the cells
+    Returns: array (cells, size)
+    """
+    random_state = np.random if random_state is None else random_state
+    parameters = np.asarray(parameters, dtype=float)
+    cumulative = _cumulative_weights(parameters, np.asarray(coefficients, dtype=float), truncate)
+
+    # family of each sample
+    components = np.sum(random_state.random((len(parameters), size))[:, :, None] >= cumulative[:, None, :-1], axis=2)
+    return _component_quantiles(random_state.random((len(parameters), size)), components, parameters, truncate)
+
+
+def sample_from_uniforms(v, parameters, coefficients, truncate=False):
+    """
+    Samples of the ensemble as a function of one uniform number per sample: the family is the one whose share of the
+    cumulative weights contains v, the position of v within this share is the probability of the quantile. Stratified
+    or quasi-random numbers v thus give stratified samples of every family and of the whole ensemble
+    v (array): uniform numbers (cells, size)
+    parameters (array): parameters of the cells (cells, 27)
+    coefficients (array): weights of the families (cells, 12)
+    truncate (bool): whether the ensemble is truncated to the limits [l, u] of the cells
+    Returns: array (cells, size)
+    """
+    v = np.asarray(v, dtype=float)
+    parameters = np.asarray(parameters, dtype=float)
+    cumulative = _cumulative_weights(parameters, np.asarray(coefficients, dtype=float), truncate)
+
+    components = np.sum(v[:, :, None] >= cumulative[:, None, :-1], axis=2)
+    start = np.take_along_axis(np.concatenate([np.zeros((len(v), 1)), cumulative[:, :-1]], axis=1), components, axis=1)
+    width = np.take_along_axis(np.diff(cumulative, axis=1, prepend=0), components, axis=1)
+    q = np.clip((v - start) / np.where(width > 0, width, 1), 0, np.nextafter(1, 0))
+    return _component_quantiles(q, components, parameters, truncate)
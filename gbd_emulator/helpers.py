@@ -3,10 +3,10 @@ import numpy as np
 '''
 ################################################
 # index dictionary contains all important information which is needed for modelling
-# general values for country, diseases, risks, ages, and genders, as well as categories for marginal change scenarios
+# general values for country, diseases, risks, ages, and genders shared by all analytical scenarios
+# scenario specific categories (scenario names, time points) are added in the Setup_file of each scenario
 ################################################
 '''
-time_points = np.array([2020, 2025, 2030, 2035, 2040, 2045, 2050]) # this is a place-holder; can have multiplie time-points to create projections into the future 
 
 # list of countries included in the emulator
 # ordering is important, as country indices are used throughout the model 
@@ -57,7 +57,9 @@ age_groups = np.array(['25 to 29', '30 to 34', '35 to 39', '40 to 44', '45 to 49
 # sex categories
 genders = ['Female', 'Male']
 
-index_dict = {'time_points': time_points, 'countries': countries, 'risks': risks, 'age_groups': age_groups, 'diseases': diseases,
+# central index dictionary used across all scripts
+# provides consistent indexing for nested loops and data alignment
+index_dict = {'countries': countries, 'risks': risks, 'age_groups': age_groups, 'diseases': diseases,
               'genders': genders}
 
 # tuples specifying distribution parameter names
@@ -72,10 +74,3 @@ dist_parameter_tuples = [('expon', 'scale'), ('gamma', 'scale'), ('gamma', 'a'),
 # list of probability distribution families supported by the emulator
 distribution_names = ['expon', 'gamma', 'fisk', 'gumbel_r', 'weibull_min', 'lognorm', 'norm', 'beta', 'mirrored_gamma',
                       'mirrored_gumbel_r', 'invgamma', 'invweibull']
-
-
-
-
-
-
-
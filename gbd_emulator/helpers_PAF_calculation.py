@@ -0,0 +1,398 @@
+import numpy as np
+import pandas as pd
+import scipy as sp
+from .helpers import index_dict
+
+
+def calculate_rr(x, TMREL, rf, unit, low=True):
+    """
+    This function calculates the actual risk factors, depending on
+    TMREL: the TMREL(per risk-disease pair),
+    rf: the rf (per age group and risk-disease pair) and
+    unit: the unit in which the consumption (TRMEL) is measured
+    x: specific consumption level
+    """
+    if low:
+        if x >= TMREL:
+            return 1
+        else:
+            return rf ** ((TMREL - x) / unit)
+    else:
+        if x <= TMREL:
+            return 1
+        else:
+            return rf ** ((x - TMREL) / unit)
+
+
+def calculate_rr_der(x, TMREL, rf, unit, low=True):
+    """
+    This function calculates the derivatives of the risk factors, depending on
+    TMREL: the TMREL(per risk-disease pair),
+    rf: the rf (per age group and risk-disease pair) and
+    unit: the unit in which the consumption (TRMEL) is measured
+    x: specific consumption level
+    """
+    if low:
+        if x >= TMREL:
+            return 0
+        else:
+            return - (np.log(rf) / unit) * rf ** ((TMREL - x) / unit)
+    else:
+        if x <= TMREL:
+            return 0
+        else:
+            return  (np.log(rf) / unit) * rf ** ((x - TMREL) / unit)
+
+
+def calculate_rr_array(x, TMREL, rf, unit, low=True):
+    """
+    Vectorized version of calculate_rr (risk factors of an array of consumption levels x)
+    """
+    x = np.asarray(x, dtype=float)
+    if low:
+        return np.where(x >= TMREL, 1.0, rf ** ((TMREL - np.minimum(x, TMREL)) / unit))
+    else:
+        return np.where(x <= TMREL, 1.0, rf ** ((np.maximum(x, TMREL) - TMREL) / unit))
+
+
+def calculate_rr_der_array(x, TMREL, rf, unit, low=True):
+    """
+    Vectorized version of calculate_rr_der (derivatives of the risk factors of an array of consumption levels x)
+    """
+    x = np.asarray(x, dtype=float)
+    if low:
+        return np.where(x >= TMREL, 0.0, - (np.log(rf) / unit) * rf ** ((TMREL - np.minimum(x, TMREL)) / unit))
+    else:
+        return np.where(x <= TMREL, 0.0, (np.log(rf) / unit) * rf ** ((np.maximum(x, TMREL) - TMREL) / unit))
+
+
+def calculate_PAF_table(distribution_df, TMREL_df, risks_df, rf_df_morb, rf_df_mort, index_dict, run=1, shift=None,
+                        derivative=False):
+    """
+    calculates the PAFs of all (disease, age, sex, risk) combinations of a run at once as ratio of the sample means
+    E[RR(X) - 1] / E[RR(X)] of the intake samples (no histogram, see full_calculation for the histogram estimator)
+    distribution_df (dataframe): contains the values of the distribution for each age, gender, risk combination
+    TMREL_df (datdframe): Containing the TMREL values
+    risk_df (datdframe): Contains the specifcation of the unit and risk-high-or-low-inidcator
+    rf_df_morb (dataframe): rf of run for morbidity
+    rf_df_mort (dataframe): rf of run for mortality
+    index_dict (dict): risks, diseases, age_groups and genders
+    run (int): specifies the number of the specific run, of the code (between 0 and 999)
+    shift (array/None): shift h per (age, sex, risk) added to the intake (shifted PAFs, see full_calculation_shift)
+    derivative (bool): PAF derivatives instead of PAFs (RR derivatives as in full_calculation_der)
+    Returns: array (diseases, ages, sexes, risks, 2) with the morbidity and mortality PAFs, 0 if the risk is not
+             linked to the disease
+    """
+    risks, diseases = list(index_dict['risks']), list(index_dict['diseases'])
+    age_groups, genders = list(index_dict['age_groups']), list(index_dict['genders'])
+
+    # samples as array (risks, ages, sexes, sample size), the RRs are calculated in the precision of the samples
+    # (C order, so the sample means are summed along contiguous samples as for a single combination)
+    x_array = distribution_df.reindex(pd.MultiIndex.from_product([risks, age_groups, genders])).to_numpy()
+    x_array = np.ascontiguousarray(x_array.reshape(len(risks), len(age_groups), len(genders), -1))
+    dtype = x_array.dtype
+    if shift is not None:
+        x_array = x_array + np.moveaxis(shift, -1, 0)[..., None].astype(dtype)
+
+    # one entry per linked (risk, disease, morbidity/mortality) triple, 'Both' fills the morbidity and mortality PAF
+    entries = []
+    for risk, disease, morb_mort in risks_df.index.unique():
+        if risk not in risks or disease not in diseases:
+            continue
+        rf_df = rf_df_morb if morb_mort == 'Morbidity' else rf_df_mort
+        slots = [0, 1] if morb_mort == 'Both' else [0] if morb_mort == 'Morbidity' else [1]
+        entries.append((risks.index(risk), diseases.index(disease), slots, TMREL_df.loc[risk, str(run)],
+                        risks_df.loc[(risk, disease, morb_mort), 'Units'],
+                        risks_df.loc[(risk, disease, morb_mort), 'Low'],
+                        rf_df.loc[(risk, disease), str(run)].reindex(age_groups).to_numpy(dtype=float)))
+
+    PAF_table = np.zeros((len(diseases), len(age_groups), len(genders), len(risks), 2))
+    if len(entries) == 0:
+        return PAF_table
+
+    risk_idx, disease_idx, slots, TMREL, unit, low, rf = zip(*entries)
+    TMREL, unit = np.array(TMREL, dtype=dtype)[:, None, None, None], np.array(unit, dtype=dtype)[:, None, None, None]
+    low, rf = np.array(low, dtype=bool)[:, None, None, None], np.array(rf, dtype=dtype)[:, :, None, None]
+
+    # distance of the intake to the TMREL on the harmful side (RR = 1 on the other side)
+    x_array = x_array[list(risk_idx)]
+    distance = np.maximum(np.where(low, TMREL - x_array, x_array - TMREL), 0)
+    rr = rf ** (distance / unit)
+    if derivative:
+        rr = np.where(distance > 0, np.where(low, -1, 1).astype(dtype) * (np.log(rf) / unit) * rr, 0)
+
+    # the sample means are accumulated in float64
+    PAFs = np.mean(rr - 1, axis=-1, dtype=np.float64) / np.mean(rr, axis=-1, dtype=np.float64)
+    if np.any(np.isnan(PAFs)):
+        print('PAF is none')
+        exit()
+
+    for idx, entry_slots in enumerate(slots):
+        for slot in entry_slots:
+            PAF_table[disease_idx[idx], :, :, risk_idx[idx], slot] = PAFs[idx]
+    return PAF_table
+
+def calculate_PAF_per_disease(PAFs, MF, o):
+    """
+    this function is for calculating the PAFs considering possible overlaps between different risk factors with the
+    mediation matrix
+    PAF: vector with PAFs for different risks
+    MF: mediation matrix
+    o: corresponding disease index
+    NOTE - For the unilateral shift scenario this function does not yield a single Joint PAF for all 15 dietary risks
+    for a specific outcome, a modified MF is called before using this function (either calculate_MF_NJ() or
+    calculate_MF_J())
+    - If calculate_MF_NJ() is called then Joint PAF collapses to the non-joint (without considering mediation effects)
+      individual PAF for that risk
+    - If calculate_MF_J() is called the Joint PAF collapses to the joint (considering mediation effects) individual
+      PAF for that risk
+    """
+    PAF_J = 1 - np.prod(1 - PAFs * np.prod(1 - MF[:, :, o], axis=1))
+    return PAF_J
+
+
+def calculate_joint_PAF_table(PAF_table, MF):
+    """
+    Joint PAFs of all (disease, age, sex) combinations at once (calculate_PAF_per_disease for every combination)
+    PAF_table (array): individual PAFs (dim diseases x ages x sexes x risks x 2, morbidity and mortality)
+    MF: mediation matrix
+    Returns: joint PAFs (dim diseases x ages x sexes x 2)
+    """
+    mediation = np.prod(1 - MF, axis=1).T
+    return 1 - np.prod(1 - PAF_table * mediation[:, None, None, :, None], axis=3)
+
+
+def change_joint_PAFs_per_disease(PAFs, PAFs_shifted, MF, o):
+    '''
+    Calculates difference between shifted PAF and original PAF
+    PAFs: Vector with PAFs for different risks
+    PAFs_shifted : Vector with shifted PAFs corresponding to a unilateral shift in intake
+    MF : mediation matrix
+    o : corresponding disease index
+    Returns: Change in joint or non-joint PAFs (depending on the mediation matrix used)
+    '''
+    PAF_J_change = (1 - np.prod(1 - PAFs_shifted * np.prod(1 - MF[:, :, o], axis=1))) - \
+        (1 - np.prod(1 - PAFs * np.prod(1 - MF[:, :, o], axis=1)))
+    return PAF_J_change
+
+
+def calculate_PJ_PAFs(PAFs_J, PAF_J):
+    """
+    This function decomposes the total Joint PAF into proportional, risk specific contributions.
+    The resulting PAFs sum to the overall Joint PAF
+    """
+    factor = np.sum(PAFs_J)
+
+    # Check for zero or NaN factors
+    if factor == 0 or np.isnan(factor):
+        return np.zeros_like(PAFs_J)
+
+    # Calculate the proportional PAF for each risk
+    PAF_prop = PAFs_J * (PAF_J / factor)
+
+    return PAF_prop
+
+
+def calculate_PAF_der_per_disease(PAFs_der, PAFs, MF, risk, o):
+    """
+    this function is for calculating the PAF derivatives considering possible overlaps between different risk factors with the
+    mediation matrix
+    PAF: vector with PAFs for different risks
+    PAFs_der : vector with PAF derivatives for different risks
+    MF: mediation matrix
+    risk: current risk in the iteration.
+    o: corresponding disease index
+    """
+    risk_name = index_dict['risks'][risk]
+    if risk_name in ['Diet low in milk', 'Diet low in fiber']:
+        M_mo = 1
+    else:
+        M_mo = np.prod(1 - MF[risk, :, o])
+
+    PAF_J = 1 - np.prod(1 - PAFs * np.prod(1 - MF[:, :, o], axis=1))
+
+    PAF_J_der =  M_mo * (1 - PAFs_der[risk])**(-1) * (1 - M_mo * PAFs[risk]) ** (-1) * ((1 - PAFs[risk]) ** 2) * (1- PAF_J)
+    return PAF_J_der
+
+
+def full_calculation(risk, disease, age, gender, TMREL_df, risks_df, distribution_df, rf_df_morb,
+                     rf_df_mort, morb_mort='Both', run=1, integrator=None):
+    """
+    calculates the PAF value depending on
+    risk (str): Risk
+    disease (str): Disease
+    gender (str): Sex specification
+    morb_mort (str): specifies whether the PAF relates to Morbidity or Mortality
+    run (int): specifies the number of the specific run, of the code (between 0 and 999)
+    TMREL_df (datdframe): Containing the TMREL values
+    risk_df (datdframe): Contains the specifcation of the unit and risk-high-or-low-inidcator
+    distribution_df (dataframe): contains the values of the distribution for each age, gender, risk combination
+    rf_df_morb (dataframe): rf of run for morbidity
+    rf_df_mort (dataframe): rf of run for mortality
+    integrator (PAFIntegrator/None): adaptive integration (integration.py), None for 100 equally wide bins
+    Returns: PAF value
+    """
+    # get TMREL and unit from the risk factors df
+    TMREL = TMREL_df.loc[risk, str(run)]
+    unit = risks_df.loc[(risk, disease, morb_mort), 'Units']
+    low = risks_df.loc[(risk, disease, morb_mort), 'Low']
+
+    # get the sample
+    x_array = distribution_df.loc[(risk, age, gender), :].to_numpy()
+
+    # get risk factor from the dataframe, only the float before the brackets is used
+    if morb_mort == 'Morbidity':
+        rf = rf_df_morb.loc[(risk, disease, age), str(run)]
+    else:
+        rf = rf_df_mort.loc[(risk, disease, age), str(run)]
+
+    if integrator is not None:
+        # bins at the sample quantiles and the TMREL
+        PAF, _, _ = integrator.ratio(x_array.astype(float), lambda x: calculate_rr_array(x, TMREL, rf, unit, low) - 1,
+                                     lambda x: calculate_rr_array(x, TMREL, rf, unit, low), [TMREL])
+    else:
+        # create the histogram (the bin edges are integrated in float64 for float32 samples)
+        hist, bin_edges = np.histogram(x_array, bins=100, density=True)
+        bin_edges = bin_edges.astype(float)
+
+        # calculate risk factors per bin
+        centers = (bin_edges[:-1] + bin_edges[1:]) / 2
+        rr = np.array([])
+        for center in centers:
+            rr = np.append(rr, calculate_rr(center, TMREL, rf, unit, low))
+
+        # calculate PAFs
+        rr_upper = rr - 1
+        nominator_integral = sp.integrate.simpson(rr_upper * hist, x=centers)
+        denominator_integral = sp.integrate.simpson(rr * hist, x=centers)
+
+        PAF = nominator_integral / denominator_integral
+    if np.isnan(PAF):
+        print('PAF is none')
+        exit()
+
+    return PAF
+
+
+def full_calculation_shift(scenario, time, country, disease, age, gender, risk, TMREL_df, risks_df, distribution_df, rf_df_morb,
+                     rf_df_mort, shift_df , morb_mort='Both', run=1, integrator=None):
+    """
+    calculates the PAF value depending on
+    risk (str): Risk
+    disease (str): Disease
+    gender (str): Sex specification
+    morb_mort (str): specifies whether the PAF relates to Morbidity or Mortality
+    run (int): specifies the number of the specific run, of the code (between 0 and 999)
+    TMREL_df (datdframe): Containing the TMREL values
+    risk_df (datdframe): Contains the specifcation of the unit and risk-high-or-low-inidcator
+    distribution_df (dataframe): contains the values of the distribution for each age, gender, risk combination
+    rf_df_morb (dataframe): rf of run for morbidity
+    rf_df_mort (dataframe): rf of run for mortality
+    shift_df (dataframe): dataframe containing h values for each combination of risk, age, sex, and country
+    integrator (PAFIntegrator/None): adaptive integration (integration.py), None for 100 equally wide bins
+    Returns: PAF value
+    """
+    # get TMREL and unit from the risk factors df
+    TMREL = TMREL_df.loc[risk, str(run)]
+    unit = risks_df.loc[(risk, disease, morb_mort), 'Units']
+    low = risks_df.loc[(risk, disease, morb_mort), 'Low']
+    # load the shift applied to this risk's exposure (scenario/time/country/age/sex/risk-specific)
+    h = shift_df.loc[(scenario, time, country, age, gender, risk), str(run)]
+
+    # get the sample
+    x_array = distribution_df.loc[(risk, age, gender), :].to_numpy()
+
+    # get risk factor from the dataframe, only the float before the brackets is used
+    if morb_mort == 'Morbidity':
+        rf = rf_df_morb.loc[(risk, disease, age), str(run)]
+    else:
+        rf = rf_df_mort.loc[(risk, disease, age), str(run)]
+
+    if integrator is not None:
+        # bins at the sample quantiles and the TMREL (moved by the shift h)
+        PAF_shifted, _, _ = integrator.ratio(
+            x_array.astype(float), lambda x: calculate_rr_array(x + h, TMREL, rf, unit, low) - 1,
+            lambda x: calculate_rr_array(x + h, TMREL, rf, unit, low), [TMREL - h])
+    else:
+        # Create the histogram
+        bin_edges = np.linspace(min(x_array), max(x_array), 101, dtype=float) # bin edges are assigned to 101, number of bins does not change from the function full_calculation
+        hist, _ = np.histogram(x_array, bins=bin_edges, density=True)
+
+        # calculate risk factors per bin
+        centers = (bin_edges[:-1] + bin_edges[1:]) / 2
+        centers_shifted = h * np.ones_like(centers) + centers #apply shift h
+        rr_shifted = np.array([])
+        for center in centers_shifted:
+            rr_shifted = np.append(rr_shifted, calculate_rr(center, TMREL, rf, unit, low))
+
+        # calculate shifted PAFs
+        rr_upper_shifted = rr_shifted - 1
+        nominator_integral = sp.integrate.simpson(rr_upper_shifted * hist, x=centers)
+        denominator_integral = sp.integrate.simpson(rr_shifted * hist, x=centers)
+
+        PAF_shifted = nominator_integral / denominator_integral
+    if np.isnan(PAF_shifted):
+        print('PAF_shifted is none')
+        exit()
+
+    return PAF_shifted
+
+
+def full_calculation_der(risk, disease, age, gender, TMREL_df, risks_df, distribution_df, rf_df_morb,
+                     rf_df_mort, morb_mort='Both', run=1, integrator=None):
+    """
+    calculates the individual PAF derivative values depending on
+    risk (str): Risk
+    disease (str): Disease
+    gender (str): Sex specification
+    morb_mort (str): specifies whether the PAF relates to Morbidity or Mortality
+    run (int): specifies the number of the specific run, of the code (between 0 and 999)
+    TMREL_df (datdframe): Containing the TMREL values
+    risk_df (datdframe): Contains the specifcation of the unit and risk-high-or-low-inidcator
+    distribution_df (dataframe): contains the values of the distribution for each age, gender, risk combination
+    rf_df_morb (dataframe): rf of run for morbidity
+    rf_df_mort (dataframe): rf of run for mortality
+    integrator (PAFIntegrator/None): adaptive integration (integration.py), None for 100 equally wide bins
+    Returns: PAF value
+    """
+    # get TMREL and unit from the risk factors df
+    TMREL = TMREL_df.loc[risk, str(run)]
+    unit = risks_df.loc[(risk, disease, morb_mort), 'Units']
+    low = risks_df.loc[(risk, disease, morb_mort), 'Low']
+
+    # get the sample
+    x_array = distribution_df.loc[(risk, age, gender), :].to_numpy()
+
+    # get risk factor from the dataframe, only the float before the brackets is used
+    if morb_mort == 'Morbidity':
+        rf = rf_df_morb.loc[(risk, disease, age), str(run)]
+    else:
+        rf = rf_df_mort.loc[(risk, disease, age), str(run)]
+
+    if integrator is not None:
+        # bins at the sample quantiles and the TMREL
+        PAF_der, _, _ = integrator.ratio(
+            x_array.astype(float), lambda x: calculate_rr_der_array(x, TMREL, rf, unit, low) - 1,
+            lambda x: calculate_rr_der_array(x, TMREL, rf, unit, low), [TMREL])
+    else:
+        # create the histogram (the bin edges are integrated in float64 for float32 samples)
+        hist, bin_edges = np.histogram(x_array, bins=100, density=True)
+        bin_edges = bin_edges.astype(float)
+
+        # calculate risk factors per bin
+        centers = (bin_edges[:-1] + bin_edges[1:]) / 2
+        rr_der = np.array([])
+        for center in centers:
+            rr_der = np.append(rr_der, calculate_rr_der(center, TMREL, rf, unit, low))
+
+        # calculate PAF derivatives
+        rr_upper = rr_der - 1
+        nominator_integral = sp.integrate.simpson(rr_upper * hist, x=centers)
+        denominator_integral = sp.integrate.simpson(rr_der * hist, x=centers)
+
+        PAF_der = nominator_integral / denominator_integral
+    if np.isnan(PAF_der):
+        print('PAF is none')
+        exit()
+
+    return PAF_der
@@ -0,0 +1,433 @@
+import pandas as pd
+import numpy as np
+from .helpers import index_dict
+
+
+def get_country_range(arguments, num_countries):
+    """
+    Allows subset execution rather than looping over all countries
+    arguments (list): command line arguments, either only the file name or the file name followed by the start and
+                      stop index of the countries
+    num_countries (int): number of countries included in the calculation
+    Returns: start and stop index of the countries
+    """
+    if len(arguments) != 1:
+        start_country_idx = int(arguments[1])
+        stop_country_idx = int(arguments[2])
+        print(f'It is calculated for countries from {start_country_idx} to {stop_country_idx}')
+    else:
+        print('Only file name was given. The code is executed as normal.')
+        start_country_idx = 0
+        stop_country_idx = num_countries
+        print(start_country_idx, stop_country_idx)
+    return start_country_idx, stop_country_idx
+
+
+def load_country_codes(M49_path):
+    """
+    Loads the country M49 code file; used to derive the list of modelled countries and their UNM49 codes
+    M49_path (str): relative path where the file is stored
+    Returns: country codes dataframe (index: country name), array of modelled countries
+    """
+    country_codes_df = pd.read_csv(M49_path, index_col=3)
+    country_codes_df.sort_index(inplace=True)
+    countries = country_codes_df.loc[country_codes_df['FAO-GBD pair'] == 1].index.values
+    return country_codes_df, countries
+
+
+def load_risk_inputs(dietary_risk_factors_path, rf_mord_mort_path, TMREL_path):
+    """
+    Loads the input parameters used to construct the PAFs (shared by all analytical scenarios)
+    dietary_risk_factors_path (str): relative path of the risk factors file (units, low/high indicator)
+    rf_mord_mort_path (str): relative path of the relative risk files (formatted with 'morb' and 'mort')
+    TMREL_path (str): relative path of the TMREL file
+    Returns: risk factors dataframe, risk dictionary (diseases associated with each risk),
+             relative risk dataframes for morbidity and mortality, TMREL dataframe
+    """
+    # get the risk factors dataframe from the csv file
+    # used to (i) create the risk dictionary, (ii) identify "Both" vs separate morbidity/mortality
+    risk_factors_df = pd.read_csv(dietary_risk_factors_path, delimiter=';', index_col=[0, 5, 6])
+    risk_factors_df.sort_index(inplace=True)
+
+    # create risk dictionary, which stores the diseases associated with each risk
+    risks_dict = {}
+    for risk in index_dict['risks']:
+        risks_dict[risk] = np.unique(risk_factors_df.loc[risk, :].index.get_level_values(0))
+
+    # get relative risk (RR) parameter draws for morbidity and mortality
+    rf_df_morb = pd.read_csv(rf_mord_mort_path.format('morb'), index_col=[0, 1, 2])
+    rf_df_morb.sort_index(inplace=True)
+
+    rf_df_mort = pd.read_csv(rf_mord_mort_path.format('mort'), index_col=[0, 1, 2])
+    rf_df_mort.sort_index(inplace=True)
+
+    # TMREL values (per risk); columns correspond to draws/runs
+    TMREL_df = pd.read_csv(TMREL_path, index_col=0)
+    TMREL_df.sort_index(inplace=True)
+
+    return risk_factors_df, risks_dict, rf_df_morb, rf_df_mort, TMREL_df
+
+
+def load_input_files(min_max_path, distrbution_weights_path):
+    """
+    Loads the minimum and maximum of each distribution and the file with the weights for each candidate distribution.
+    min_max_path (str): relative path of the relative minimum and maximum file
+    distrbution_weights_path (str): relative path of the distribution weights file
+    returns: relative minimum and maximum dataframe,
+             distribution weights dataframe
+    """
+    # loading the minimum and maximum files
+    minmax_bounds_df = pd.read_csv(min_max_path, index_col=[0, 1, 2, 3])
+    minmax_bounds_df = minmax_bounds_df.swaplevel(0, 1)
+    minmax_bounds_df.sort_index(inplace=True)
+
+    # loading the distrbution weights
+    distribution_weights_df = pd.read_csv(distrbution_weights_path,
+                                          delimiter=';',
+                                          usecols=['Risk', 'exp', 'gamma', 'llogis', 'gumbel', 'weibull', 'lnorm',
+                                                   'norm', 'betasr', 'mgamma', 'mgumbel', 'invgamma', 'invweibull'],
+                                          index_col=[0])
+
+    return minmax_bounds_df, distribution_weights_df
+
+
+def load_mean_and_std(path, country):
+    """
+    Loads the mean and standard deviation files (for selected country)
+    path (str): relative path where the files are stored
+    country (int/str): indicator specifying the country (either name or M49)
+    Returns mean values dataframe, std values dataframe (index: risk factor, age, gender, columns: range(num_runs))
+    """
+    mean_values_df = pd.read_csv(path.format('Mean', country), index_col=[0, 1, 2], header=0)
+    mean_values_df.sort_index(inplace=True)
+    sd_values_df = pd.read_csv(path.format('Std', country), index_col=[0, 1, 2], header=0)
+    sd_values_df.sort_index(inplace=True)
+    return mean_values_df, sd_values_df
+
+
+def load_total_YLDs_YLLs(path):
+    """
+    Loads total YLD (Years Lived with Disability) and YLL (Years of Life Lost) dataframes from CSV files.
+    path (str): The relative path where the files are stored.
+    Returns: total_YLD_df, total_YLL_df dataframes indexed by location, cause, age, and sex.
+    """
+    total_YLD_df = pd.read_csv(path.format('YLD'), usecols=['location', 'sex', 'cause', 'age', 'val'],
+                               index_col=[0, 1, 2, 3])
+    total_YLD_df = total_YLD_df.reorder_levels(['location', 'cause', 'age', 'sex']).sort_index()
+    total_YLL_df = pd.read_csv(path.format('YLL'), usecols=['location', 'sex', 'cause', 'age', 'val'],
+                               index_col=[0, 1, 2, 3])
+    total_YLL_df = total_YLL_df.reorder_levels(['location', 'cause', 'age', 'sex']).sort_index()
+    return total_YLD_df, total_YLL_df
+
+
+def load_std(path, country):
+    """
+    Loads the standard deviation files (for selected country)
+    path (str): relative path where the files are stored
+    country (int/str): indicator specifying the country (either name or M49)
+    Returns std values dataframe (index: risk factor, age, gender, columns: range(num_runs))
+    """
+
+    sd_values_df = pd.read_csv(path.format('Std', country), index_col=[0, 1, 2], header=0)
+    sd_values_df.sort_index(inplace=True)
+
+    return sd_values_df
+
+
+def interpolate_years(df, years, year_level='year'):
+    """
+    Values of projections at the given years, years between the projected years (e.g. the 5-year steps of the SSP
+    projections) are interpolated linearly between the neighbouring projected years
+    df (dataframe): numeric projections (index levels: labels and the year)
+    years (array): years within the range of the projected years
+    year_level (str): name of the year level
+    Returns: dataframe indexed by the year and the labels (rows of interpolated years: labels projected in both
+             neighbouring years)
+    """
+    per_year = {year: table.droplevel(year_level) for year, table in df.groupby(level=year_level)}
+    projected = np.sort(list(per_year))
+    outside = [int(year) for year in years if year < projected[0] or year > projected[-1]]
+    if len(outside) > 0:
+        print(f'No projections for the years {outside}, the projected years are {[int(year) for year in projected]}')
+        exit()
+
+    values = {}
+    for year in years:
+        upper_idx = np.searchsorted(projected, year)
+        upper = projected[upper_idx]
+        if upper == year:
+            values[year] = per_year[year]
+        else:
+            lower = projected[upper_idx - 1]
+            weight = (year - lower) / (upper - lower)
+            rows = per_year[lower].index[per_year[lower].index.isin(per_year[upper].index)]
+            values[year] = (1 - weight) * per_year[lower].loc[rows] + weight * per_year[upper].loc[rows]
+    return pd.concat(values, names=[year_level])
+
+
+def load_total_YLDs_YLLs_projected(path, years):
+    """
+    Loads the projected total YLDs and YLLs of all years at once, years between the projected years are interpolated
+    path (str): The relative path where the files are stored.
+    years (array): years of the projections (e.g. annual steps)
+    Returns: total_YLD_df, total_YLL_df dataframes indexed by year, location, sex, age, and cause.
+    """
+    totals = []
+    for measure in ['YLD', 'YLL']:
+        total_df = pd.read_csv(path.format(measure), usecols=['year', 'location', 'sex', 'cause', 'age', 'val'],
+                               index_col=['year', 'location', 'sex', 'age', 'cause'])
+        totals.append(interpolate_years(total_df, years).sort_index())
+    return totals[0], totals[1]
+
+
+def burden_arrays(total_YLD_df, total_YLL_df, index_dict, years=None):
+    """
+    Dense arrays of the total YLDs and YLLs, so the burden of all (disease, age, sex) cells of a country is taken at
+    once instead of looking up every cell in the dataframes
+    total_YLD_df, total_YLL_df (dataframe): total YLDs and YLLs (index levels location, sex, age, cause and, if years
+                                            are given, year; column 'val')
+    index_dict (dict): dimensions of the model (diseases, age_groups, genders)
+    years (array/None): years of the year axis (None: the dataframes have no year level, the year axis has length 1)
+    Returns: dict with the YLD and YLL arrays (dim years x locations x diseases x ages x sexes, 0 where the dataframes
+             have no value), the mask of the missing cells (same dim) and the locations of the location axis
+    """
+    locations = np.union1d(total_YLD_df.index.unique('location'), total_YLL_df.index.unique('location'))
+    levels = [locations, index_dict['diseases'], index_dict['age_groups'], index_dict['genders']]
+    names = ['location', 'cause', 'age', 'sex']
+    if years is not None:
+        levels, names = [years] + levels, ['year'] + names
+    shape = (-1,) + tuple(len(level) for level in levels[-4:])
+
+    burden = dict(locations=locations)
+    missing = np.zeros(1, dtype=bool)
+    for measure, total_df in [('YLD', total_YLD_df), ('YLL', total_YLL_df)]:
+        # the cells in the order of the arrays, with the levels in the order of the dataframe index
+        cells = pd.MultiIndex.from_product(levels, names=names).reorder_levels(total_df.index.names)
+        values = total_df['val'].reindex(cells).to_numpy(dtype=float).reshape(shape)
+        missing = missing | np.isnan(values)
+        burden[measure] = np.nan_to_num(values, nan=0.0)
+    burden['missing'] = missing
+    return burden
+
+
+def country_burden(burden, country, year_idx=0):
+    """
+    Total YLDs and YLLs of all (disease, age, sex) cells of a country and year, stops if a cell has no value
+    burden (dict): output of burden_arrays
+    country (str): name of the country
+    year_idx (int/slice): index of the year on the year axis (slice(None): all years)
+    Returns: YLD array, YLL array (dim diseases x ages x sexes, with a leading year axis for a slice)
+    """
+    location_idx = np.flatnonzero(burden['locations'] == country)
+    if len(location_idx) == 0:
+        print(f'No total YLDs and YLLs for {country}')
+        exit()
+    missing = burden['missing'][year_idx, location_idx[0]]
+    if np.any(missing):
+        print(f'Total YLDs or YLLs missing for {country} in {np.sum(missing)} (disease, age, sex) cells')
+        exit()
+    return burden['YLD'][year_idx, location_idx[0]], burden['YLL'][year_idx, location_idx[0]]
+
+
+def load_country_group_tables(M49_path, tables):
+    """
+    Loads the country groups of group tables (e.g. World Bank income groups or WHO regions), joined to the modelled
+    countries through their ISO3 codes
+    M49_path (str): relative path of the country code file
+    tables (dict): column of the groups -> relative path of a csv table with the ISO3 codes ('ISO3' or 'Country Code')
+                   and the column
+    Returns: dict of name of the group -> countries of the group (group names have to be unique over all tables)
+    """
+    country_codes_df, countries = load_country_codes(M49_path)
+    ISO3s = country_codes_df.loc[countries, 'ISO3']
+    groups, source = {}, {}
+    for column, path in tables.items():
+        table = pd.read_csv(path).rename(columns={'Country Code': 'ISO3'}).dropna(subset=[column])
+        group_of = table.drop_duplicates('ISO3').set_index('ISO3')[column]
+        for group, members in ISO3s.groupby(ISO3s.map(group_of)):
+            if group in groups:
+                raise ValueError(f'The country group {group} of the column {column} is also a group of the column '
+                                 f'{source[group]}')
+            groups[group], source[group] = list(members.index), column
+    return groups
+
+
+def load_population(path, M49_path, years, SSP_names):
+    """
+    Loads the population of the modelled countries per SSP and year, years between the projected years (5-year steps)
+    are interpolated
+    path (str): relative path of the SSP population file (ISO3 codes, one column per SSP)
+    M49_path (str): relative path of the country code file
+    years (array): years of the population
+    SSP_names (list): SSPs of the population
+    Returns: population series (index: ssp, year, country)
+    """
+    population_df = pd.read_csv(path, skiprows=4, usecols=['year', 'ISO3'] + list(SSP_names))
+    population_df['year'] = population_df['year'].str.replace('y', '').astype(int)
+
+    country_codes_df, countries = load_country_codes(M49_path)
+    ISO3s = country_codes_df.loc[countries, 'ISO3']
+    population_df = population_df.merge(pd.DataFrame({'country': ISO3s.index, 'ISO3': ISO3s.to_numpy()}), on='ISO3')
+    population_df = interpolate_years(population_df.set_index(['year', 'country'])[list(SSP_names)],
+                                      [int(year) for year in years])
+    return population_df.rename_axis(columns='ssp').stack().reorder_levels(['ssp', 'year', 'country']).sort_index()
+
+
+def read_SSP_means(path):
+    """
+    Reads the projected means of an SSP (all countries and years)
+    path (str): relative path where the file is stored
+    Returns mean values dataframe (columns: Risk, Year, Location, Age Group, Sex and '0' (central values))
+    """
+    mean_df = pd.read_csv(path)
+    mean_df.columns = mean_df.columns.map(str)
+
+    # the projected means of SSP_means.py are the central values (run 0)
+    if '0' not in mean_df.columns:
+        mean_df = mean_df.rename(columns={'Mean_projected': '0'})
+
+    # Drop saturated fat
+    mean_df = mean_df[mean_df["Risk"] != "Diet high in saturated fatty acids"]
+
+    return mean_df[['Risk', 'Year', 'Location', 'Age Group', 'Sex', '0']]
+
+
+def load_means_projected(path, years):
+    """
+    Loads the means of all countries and years of an SSP at once, years between the projected years are interpolated
+    path (str): relative path where the file is stored
+    years (array): years of the projections (e.g. annual steps)
+    Returns mean values dataframe (index: country, year, risk factor, age, gender, column '0' (central values))
+    """
+    mean_df = read_SSP_means(path).set_index(['Location', 'Year', 'Risk', 'Age Group', 'Sex'])
+    return interpolate_years(mean_df, years, 'Year').reorder_levels(
+        ['Location', 'Year', 'Risk', 'Age Group', 'Sex']).sort_index()
+
+
+def create_full_min_max_df(min_max_df, risks, age_groups, genders):
+    """
+    Creates a new dataframe with multi-level indices based on 'risks', 'age_groups', and 'genders'.
+    min_max_df: The original dataframe with minimum and maximum values.
+    risks (list): List of risk factors.
+    age_groups (list): List of age groups.
+    genders (list): List of genders.
+    Returns: A new dataframe with multi-level indices and 'xmin', 'xmax' columns.
+    """
+    min_max_new = pd.DataFrame(index=pd.MultiIndex.from_product([genders, risks, age_groups]),
+                               columns=['xmin', 'xmax'])
+    for gender in genders:
+            min_max_new.loc[gender, 'xmin':'xmax'] = min_max_df.loc[:, 'xmin':'xmax'].to_numpy()
+    min_max_new = min_max_new.swaplevel(0, 1).swaplevel(1, 2)
+    min_max_new.sort_index(inplace=True)
+    return min_max_new
+
+
+def calculate_mediation_matrix():
+    '''
+    Calculates the mediation matrix, mediation values are now hardcoded and not loaded anymore.
+    Returns: Mediation matrix (dim 15x15x13)
+    '''
+    risks_idx_dict = {}
+    diseases_idx_dict = {}
+
+    for idx, risk in enumerate(index_dict['risks']):
+        risks_idx_dict[risk] = idx
+
+    for idx, disease in enumerate(index_dict['diseases']):
+        diseases_idx_dict[disease] = idx
+
+    # create mediation matrix
+    MF = np.zeros((len(index_dict['risks']), len(index_dict['risks']), len(index_dict['diseases'])))
+
+    # triples which are correlated, they all have a mediation factor of 1
+    triples = [('Diet low in milk', 'Diet low in calcium', 'Colon and rectum cancer'),
+               ('Diet low in fiber', 'Diet low in fruits', 'Ischemic heart disease'),
+               ('Diet low in fiber', 'Diet low in vegetables', 'Ischemic heart disease'),
+               ('Diet low in fiber', 'Diet low in whole grains', 'Ischemic heart disease')]
+
+    # loop over all triples
+    for triple in triples:
+        risk_idx_1 = risks_idx_dict[triple[0]]
+        risk_idx_2 = risks_idx_dict[triple[1]]
+        disease_idx = diseases_idx_dict[triple[2]]
+
+        MF[risk_idx_1, risk_idx_2, disease_idx] = 1
+
+    return MF
+
+
+def calculate_MF_NJ(risk_factor):
+    '''
+    This function is used to create a modified mediation matrix to calculate non-joint PAFs
+    Specified conditions -  Create a matrix with all 1s, except for the row containing the risk_factor that needs to be isolated
+    This collapses PAF_J (combined PAF that considers the overlaps across all 15 risks) to PAF_nj (individual PAF for that risk that DOES NOT consider mediation)
+    Parameters - risk_factor - the name of the risk factor to be isolated.
+    '''
+
+    risks_idx_dict = {}
+
+    for idx, risk in enumerate(index_dict['risks']):
+        risks_idx_dict[risk] = idx
+
+    # create a 15x15x13 mediation matrix with all 1s
+    MF_NJ = np.ones((len(index_dict['risks']), len(index_dict['risks']), len(index_dict['diseases'])))
+
+    # setting the row containing the risk_factor to all 0s
+    risk_idx_1 = risks_idx_dict[risk_factor]
+
+    # set the row in all matrices to be zero
+    MF_NJ[risk_idx_1, :, :] = 0
+
+    return MF_NJ
+
+
+def calculate_MF_J(MF, risk_factor):
+    '''
+    This function is used to create a modified mediation matrix to calculate joint PAFs
+    Specified conditions -
+    - The modified matrix will contain all 1s, except for the row containing the risk_factor that needs to be isolated
+    - The row containing the risk_factor will be set to the same value as the original mediation matrix
+    This collapses PAF_J (combined PAF that considers the overlaps across all 15 risks) to PAF_j (individual PAF for that risk that CONSIDERS mediation)
+    Parameters -
+    MF - the original mediation matrix
+    risk_factor - the name of the risk factor to be isolated.
+    '''
+
+    risks_idx_dict = {}
+
+    for idx, risk in enumerate(index_dict['risks']):
+        risks_idx_dict[risk] = idx
+
+    # create a 15x15x13 mediation matrix with all 1s
+    MF_J = np.ones((len(index_dict['risks']), len(index_dict['risks']), len(index_dict['diseases'])))
+
+    # setting the row containing the risk_factor to all 0s
+    risk_idx_1 = risks_idx_dict[risk_factor]
+
+    # set the row in all matrices to be zero
+    MF_J[risk_idx_1, :, :] = MF[risk_idx_1, :, :]
+
+    return MF_J
+
+
+def dense_to_dataframe(array, levels):
+    """
+    Reshapes a dense output array into a dataframe without building records, the last axis (runs) becomes the columns
+    array (array): output array (dim level 1 x ... x level n x runs)
+    levels (dict): name -> labels of the leading axes, in the order of the axes
+    Returns: dataframe (index: the levels in the order of the axes, columns: range(num_runs))
+    """
+    index = pd.MultiIndex.from_product(list(levels.values()), names=list(levels))
+    return pd.DataFrame(array.reshape(len(index), -1), index=index)
+
+
+def summarise_runs(df):
+    """
+    Summary statistics over the runs of an output dataframe
+    df (dataframe): output with one column per run
+    Returns: dataframe (same index, columns mean, std, p2.5, p50, p97.5)
+    """
+    values = df.to_numpy()
+    quantiles = np.quantile(values, [0.025, 0.5, 0.975], axis=1)
+    return pd.DataFrame({'mean': values.mean(axis=1), 'std': values.std(axis=1), 'p2.5': quantiles[0],
+                         'p50': quantiles[1], 'p97.5': quantiles[2]}, index=df.index)
@@ -0,0 +1,564 @@
+import numpy as np
+import scipy.optimize as optimize
+from scipy.special import gamma, gammaln, digamma
+from .convergence import telemetry
+
+
+def run_for_beta(mu, sigma, u, l):
+    """
+    Calculate parameters (a and b) for the Beta distribution based on mean and standard deviation.
+    mu (array-like): Mean values.
+    sigma (array-like): Standard deviation values.
+    u (array-like): Upper bounds for the distribution.
+    l (array-like): Lower bounds for the distribution.
+    Returns: Tuple (a, b, u, l) representing Beta distribution parameters.
+    """
+    vr = sigma ** 2
+    epsilon = 10 ** (-10)
+
+    selection_i = np.where((vr >= np.multiply((mu - l), (u - mu))) & (vr < np.multiply(mu, (u + l - mu))))[0]
+    selection_ii = np.where((vr >= np.multiply((mu - l), (u - mu))) & (vr >= np.multiply(mu, (u + l - mu))))[0]
+    selection_iii = np.where((vr < np.multiply((mu - l), (u - mu))))[0]
+
+    if len(selection_i) == 0:
+        delta = epsilon
+        u[selection_iii] += delta
+        l[selection_iii] -= delta
+    else:
+        delta = \
+            beta_approx(mu[selection_i], vr[selection_i], u[selection_i],
+                                   l[selection_i]) + epsilon
+        u[selection_i] += delta
+        u[selection_iii] += epsilon
+        l[selection_i] -= delta
+        l[selection_iii] -= epsilon
+
+    l[selection_ii] = 0
+    u[selection_ii] = vr[selection_ii] / mu[selection_ii] + mu[selection_ii] + epsilon
+
+    mu_beta = (mu - l) / (u - l)
+    vr_beta = vr / (u - l) ** 2
+
+    a = np.abs(mu_beta ** 2 * (1 - mu_beta) / vr_beta - mu_beta)
+    b = np.abs(mu_beta * (1 - mu_beta) ** 2 / vr_beta - 1 + mu_beta)
+
+    a[a <= 1e-12] = 1e-12
+    b[b <= 1e-12] = 1e-12
+    return a, b, u, l
+
+
+def beta_approx(mu, var, up, low):
+    """
+    Helper function to calculate parameters for the Beta distribution .
+    mu (array-like): Mean values.
+    var (array-like): Variance values.
+    up (array-like): Upper bounds for the distribution.
+    low (array-like): Lower bounds for the distribution.
+    Returns: Parameter 'delta' for the Beta distribution.
+    """
+    return - (up - low) / 2 + np.power(((up - low) / 2) ** 2 + var - (mu - low) * (up - mu), 0.5)
+
+
+def fisk_residual(alpha, beta, vr):
+    """
+    Relative error of the variance of a fitted Fisk distribution (variance from the moment equation of fisk_func).
+    alpha, beta (array-like): Fisk distribution parameters.
+    vr (array-like): Variance values the parameters were fitted to.
+    Returns: |variance - vr| / vr.
+    """
+    mean = alpha / np.sinc(1 / beta)
+    return np.abs(mean ** 2 * (2 * np.sinc(1 / beta) - 1) - vr) / vr
+
+
+def weibull_residual(k, lamb, vr):
+    """
+    Relative error of the variance of a fitted Weibull distribution.
+    k, lamb (array-like): Weibull distribution parameters.
+    vr (array-like): Variance values the parameters were fitted to.
+    Returns: |variance - vr| / vr.
+    """
+    return np.abs(lamb ** 2 * (gamma(1 + 2 / k) - gamma(1 + 1 / k) ** 2) - vr) / vr
+
+
+def invweibull_residual(k, lamb, vr):
+    """
+    Relative error of the variance of a fitted inverse Weibull distribution.
+    k, lamb (array-like): Inverse Weibull distribution parameters.
+    vr (array-like): Variance values the parameters were fitted to.
+    Returns: |variance - vr| / vr.
+    """
+    return np.abs(lamb ** (-2) * (gamma(1 - 2 / k) - gamma(1 - 1 / k) ** 2) - vr) / vr
+
+
+def run_for_fisk(mu, sigma):
+    """
+    Calculate parameters (alpha and beta) for the Fisk (Log-Logistic) distribution based on mean and standard deviation.
+    mu (array-like): Mean values.
+    sigma (array-like): Standard deviation values.
+    Returns: Tuple (alpha, beta) representing Fisk distribution parameters.
+    """
+    vr = sigma ** 2
+
+    # calculate the variables for the weibull's and log-logistic (fisk) distribution
+    # methods for optimization without constraint -> fisk
+    optimization_methods = ['Nelder-Mead', 'Powell', 'L-BFGS-B', 'TNC', 'SLSQP', 'trust-constr']
+    # 'BFGS', 'Nelder-Mead', 'Powell', 'CG', 'Newton-CG', 'L-BFGS-B', 'TNC', 'COBYLA', 'SLSQP',
+    #                        'trust-constr', 'dogleg', 'trust-ncg', 'trust-exact', 'trust-krylov'
+    nit, nfev = 0, 0
+    for attempt, meth in enumerate(optimization_methods):
+        alpha_fisk, beta_fisk, result = calculate_parameters_fisk(mu, vr, meth)
+        nit, nfev = nit + result.get('nit', 0), nfev + result.get('nfev', 0)
+        if np.all(abs(mu - (alpha_fisk * np.pi / beta_fisk) / np.sin(np.pi / beta_fisk)) < (0.05 * mu)):
+            telemetry.record('fisk', meth, attempt + 1, nit, nfev,
+                             fisk_residual(alpha_fisk, beta_fisk, (mu * 0.999) ** 2 if mu < sigma else vr))
+            break
+        else:
+            if meth != 'trust-krylov':
+                print('try next one as {} was not successful'.format(meth))
+                continue
+            else:
+                print('Error: Optimization of log-logistic parameters failed!')
+                exit()
+
+    return alpha_fisk, beta_fisk
+
+
+def fisk_func(variable, mu, var):
+    """
+    Fisk distribution function, used to solve the optimization.
+    """
+    x = 1 / variable
+    return (np.sinc(x) - (1 + var / mu ** 2) / 2) ** 2
+
+
+def calculate_parameters_fisk(mu, vr, meth='BFGS'):
+    """
+    Calculate parameters (alpha and beta) for the Fisk (Log-Logistic) distribution using optimization.
+    mu (array-like): Mean values.
+    vr (array-like): Variance values.
+    meth (str): Optimization method.
+    Returns: Tuple (alpha, beta, result) representing Fisk distribution parameters and the optimization result.
+    """
+    if mu < np.sqrt(vr):
+        vr = (mu * 0.999) ** 2
+
+    result = optimize.minimize(fisk_func, np.array([np.pi / 2]), args=(mu, vr), method=meth,
+                               bounds=optimize.Bounds(10**(-15), np.pi))
+    beta = result.x[0]
+    alpha = mu * np.sinc(1 / beta)
+    return alpha, beta, result
+
+
+def run_for_weibull(mu, sigma):
+    """
+    Calculate parameters (k and lambda) for the Weibull distribution based on mean and standard deviation.
+    mu (array-like): Mean values.
+    sigma (array-like): Standard deviation values.
+    Returns: Tuple (k, lambda) representing Weibull distribution parameters.
+    """
+    vr = sigma ** 2
+    optimization_methods_with_bounds = ['Nelder-Mead', 'Powell', 'L-BFGS-B', 'TNC', 'SLSQP', 'trust-constr']
+
+    nit, nfev = 0, 0
+    for attempt, meth in enumerate(optimization_methods_with_bounds):
+        k_weibull, lambda_weibull, result = calculate_parameters_weibull(mu, vr, weibull_func, meth)
+        nit, nfev = nit + result.get('nit', 0), nfev + result.get('nfev', 0)
+        if abs(mu - lambda_weibull * gamma(1 + 1 / k_weibull)) < (0.01 * mu):
+            telemetry.record('weibull', meth, attempt + 1, nit, nfev,
+                             weibull_residual(k_weibull[0], lambda_weibull[0], vr))
+            break
+        else:
+            if meth != 'trust-constr':
+                print('try next one as {} was not successful'.format(meth))
+                continue
+            else:
+                print('Error: Optimization of weibull parameters failed!')
+                exit()
+
+    return k_weibull[0], lambda_weibull[0]
+
+
+def helper_func_one(x):
+    """
+    Helper function used in the calculation of Weibull parameters for 'greater_one_weibull'.
+    """
+    return gamma(1/x + 1)/(gamma(2/x + 1) - gamma(1/x + 1)**2)**(1/2)
+
+
+def greater_one_weibull(mean, std, risks=None):
+    """
+    Calculate Weibull distribution parameters (k and lambda) for cases where mean/std ratio is greater than 1.
+    mean (array-like): Mean values.
+    std (array-like): Standard deviation values.
+    risks (array/None): risk of each value (labels of the convergence telemetry).
+    Returns: Tuple (k, lambda) representing Weibull distribution parameters.
+    """
+    y = mean/std
+    m = (helper_func_one(100) - 1)/99
+    k = (y + m - 1)/m
+    lamb = mean / gamma(1 + 1 / k)
+    if np.any(abs(mean - lamb * gamma(1 + 1 / k)) > (0.01 * mean)):
+        k = np.zeros_like(mean)
+        lamb = np.zeros_like(mean)
+        for run in np.arange(len(mean)):
+            with telemetry.cell(**({} if risks is None else {'risk': risks[run]})):
+                k[run], lamb[run] = run_for_weibull(mean[run], std[run])
+    else:
+        telemetry.record_closed_form('weibull', weibull_residual(k, lamb, std ** 2), risks)
+    return k, lamb
+
+
+def helper_func_two(x):
+    """
+    Helper function used in the calculation of Weibull parameters for 'smaller_one_eighth_weibull'.
+    """
+    return np.log(gamma(1 + 2*x)) - 2 * np.log(gamma(1 + x))
+
+
+def smaller_one_eighth_weibull(mean, std, risks=None):
+    """
+    Calculate Weibull distribution parameters (k and lambda) for cases where mean/std ratio is less than or equal to 1/8.
+    mean (array-like): Mean values.
+    std (array-like): Standard deviation values.
+    risks (array/None): risk of each value (labels of the convergence telemetry).
+    Returns: Tuple (k, lambda) representing Weibull distribution parameters.
+    """
+    m = (helper_func_two(20) - helper_func_two(4)) / 16
+    c = (5 * helper_func_two(4) - helper_func_two(20)) / 4
+    y = mean/std
+    k = m / (np.log(1 + 1/y**2) - c)
+    lamb = mean / gamma(1 + 1 / k)
+    if np.any(abs(mean - lamb * gamma(1 + 1 / k)) > (0.01 * mean)):
+        print('problem for y <= 1/8')
+        k = np.zeros_like(mean)
+        lamb = np.zeros_like(mean)
+        for run in np.arange(len(mean)):
+            with telemetry.cell(**({} if risks is None else {'risk': risks[run]})):
+                k[run], lamb[run] = run_for_weibull(mean[run], std[run])
+    else:
+        telemetry.record_closed_form('weibull', weibull_residual(k, lamb, std ** 2), risks)
+    return k, lamb
+
+
+def weibull_func(variable, mean, var):
+    """
+    PDF of the Weibull function.
+    """
+    k = variable
+    return np.abs((gamma(1 + 2 / k) / (gamma(1 + 1 / k) ** 2) - 1) - (var / mean ** 2))
+
+
+def calculate_parameters_weibull(mu, vr, func_to_solve, meth='Nelder-Mead'):
+    """
+    Calculate parameters (k and lambda) for the Weibull distribution using optimization.
+    mu (array-like): Mean values.
+    vr (array-like): Variance values.
+    func_to_solve (function): Function to solve.
+    meth (str): Optimization method.
+    Returns: Tuple (k, lambda, result) representing Weibull distribution parameters and the optimization result.
+    """
+    result = optimize.minimize(func_to_solve, np.array(mu / np.sqrt(vr)), args=(mu, vr), method=meth,
+                               bounds=[(0, np.inf)])  # optimize.Bounds
+    k = result.x
+    lamb = mu / gamma(1 + 1 / k)
+    return k, lamb, result
+
+
+def my_cons(x):
+    f = np.zeros(2)
+    f[0] = x + 0
+    f[1] = np.inf - x
+    return f
+
+
+def run_for_invweibull(mu, sigma):
+    """
+    Calculate parameters (k and lambda) for the Inverse Weibull distribution based on mean and standard deviation.
+    mu (array-like): Mean values.
+    sigma (array-like): Standard deviation values.
+    Returns: Tuple (k, lambda) representing Inverse Weibull distribution parameters.
+    """
+    vr = sigma ** 2
+    optimization_methods_with_bounds = ['Nelder-Mead', 'Powell', 'L-BFGS-B', 'TNC', 'SLSQP', 'trust-constr']
+
+    nit, nfev = 0, 0
+    for attempt, meth in enumerate(optimization_methods_with_bounds):
+        k_invweibull, lambda_invweibull, result = calculate_parameters_invweibull(mu, vr, meth)
+        nit, nfev = nit + result.get('nit', 0), nfev + result.get('nfev', 0)
+        if abs(mu - lambda_invweibull ** (-1) * gamma(1 - 1 / k_invweibull)) < (0.01 * mu):
+            telemetry.record('invweibull', meth, attempt + 1, nit, nfev,
+                             invweibull_residual(k_invweibull[0], lambda_invweibull[0], vr))
+            break
+        else:
+            if meth != 'trust-constr':
+                print('try next one as {} was not successful'.format(meth))
+                continue
+            else:
+                print('Error: Optimization of weibull parameters failed!')
+                exit()
+
+    return k_invweibull[0], lambda_invweibull[0]
+
+
+def invweibull_func(variable, mean, var):
+    """
+    PDF of the inverse Weibull distribution.
+    """
+    k = variable
+    return np.abs((gamma(1 - 2 / k) / (gamma(1 - 1 / k) ** 2) - 1) - (var / mean ** 2))
+
+
+def calculate_parameters_invweibull(mu, vr, meth='Nelder-Mead'):
+    """
+    Calculate parameters (k and lambda) for the Inverse Weibull distribution using optimization.
+    mu (array-like): Mean values.
+    vr (array-like): Variance values.
+    meth (str): Optimization method.
+    Returns: Tuple (k, lambda, result) representing Inverse Weibull distribution parameters and the optimization
+             result.
+    """
+    result = optimize.minimize(invweibull_func, np.array(2.5), args=(mu, vr), method=meth,
+                               bounds=[(0, np.inf)])
+    k = result.x
+    lamb = gamma(1 - 1 / k) / mu
+    return k, lamb, result
+
+
+def helper_func_invweibull_one(x):
+    """
+    Helper function used in the calculation of Inverse Weibull parameters for 'greater_4_5_inv_weibull'.
+    """
+    return gamma(1 - 1/x) * 1/np.power(gamma(1 - 2/x) - gamma(1 - 1/x)**2, 1/2)
+
+
+def greater_4_5_inv_weibull(mu, std, risks=None):
+    """
+    Calculate Inverse Weibull distribution parameters (k and lambda) for cases where mean/std ratio is greater than 4.5.
+    mu (array-like): Mean values.
+    std (array-like): Standard deviation values.
+    risks (array/None): risk of each value (labels of the convergence telemetry).
+    Returns: Tuple (k, lambda) representing Inverse Weibull distribution parameters.
+    """
+    y = mu/std
+    c = (100 * helper_func_invweibull_one(7) - 7 * helper_func_invweibull_one(100))/93
+    k = 93 * (y - c) / (helper_func_invweibull_one(100) - helper_func_invweibull_one(7))
+    lamb = gamma(1 - 1 / k) / mu
+    if np.any(abs(mu - lamb ** (-1) * gamma(1 - 1 / k) > (0.01 * mu))):
+        print('problem for y >= 4.5 inverse weibull')
+        k = np.zeros_like(mu)
+        lamb = np.zeros_like(mu)
+        for run in np.arange(len(mu)):
+            with telemetry.cell(**({} if risks is None else {'risk': risks[run]})):
+                k[run], lamb[run] = run_for_invweibull(mu[run], std[run])
+    else:
+        telemetry.record_closed_form('invweibull', invweibull_residual(k, lamb, std ** 2), risks)
+    return k, lamb
+
+
+def helper_func_invweibull_two(x):
+    """
+    Helper function used in the calculation of Weibull parameters for 'smaller_one_eighth_weibull'.
+    """
+    return gamma(1 - 1/x)**2 / gamma(1 - 2/x)
+
+
+def smaller_one_eighth_invweibull(mu, std, risks=None):
+    """
+    Calculate inverse Weibull distribution parameters (k and lambda) for cases where mean/std ratio is less than or equal to 1/8.
+    mean (array-like): Mean values.
+    std (array-like): Standard deviation values.
+    risks (array/None): risk of each value (labels of the convergence telemetry).
+    Returns: Tuple (k, lambda) representing inverse Weibull distribution parameters.
+    """
+    y = mu/std
+    m = helper_func_invweibull_two(2.01) / 0.01
+    k = (1 / (1 + 1/y**2) + 2 * m)/m
+    lamb = gamma(1 - 1 / k) / mu
+    if np.any(abs(mu - lamb ** (-1) * gamma(1 - 1 / k) > (0.01 * mu))):
+        print('problem for y <= 1/8 inverse weibull')
+        k = np.zeros_like(mu)
+        lamb = np.zeros_like(mu)
+        for run in np.arange(len(mu)):
+            with telemetry.cell(**({} if risks is None else {'risk': risks[run]})):
+                k[run], lamb[run] = run_for_invweibull(mu[run], std[run])
+    else:
+        telemetry.record_closed_form('invweibull', invweibull_residual(k, lamb, std ** 2), risks)
+    return k, lamb
+
+
+'''
+################################################
+# vectorized solvers
+# solve the moment equations of the log-logistic (fisk), Weibull and inverse Weibull distribution for all cells at
+# once with a bracketed Newton iteration, started from closed-form approximations (the starting values only depend
+# on the mean and standard deviation of the cell, so the solutions do not depend on the order in which countries
+# and runs are calculated); cells that do not converge fall back to the optimizers
+################################################
+'''
+
+
+def newton_solve(func, target, lower, upper, start, max_iter=50, tol=1e-12):
+    """
+    Bracketed Newton iteration for increasing functions, vectorized over the cells (steps leaving the bracket are
+    replaced by bisection).
+    func (function): returns the residual and its derivative, called as func(x, target) for the unconverged cells.
+    target (array): target value of each cell.
+    lower, upper (array): bracket of the root of each cell.
+    start (array): starting values (inside the bracket).
+    Returns: Tuple (root, iterations, converged) per cell.
+    """
+    x = start.copy()
+    lower = lower.copy()
+    upper = upper.copy()
+    iterations = np.zeros(len(x), dtype=int)
+    converged = np.zeros(len(x), dtype=bool)
+
+    for _ in range(max_iter):
+        idx = np.where(~converged)[0]
+        if len(idx) == 0:
+            break
+        f, df = func(x[idx], target[idx])
+        with np.errstate(divide='ignore', invalid='ignore'):
+            step = f / df
+        done = (np.abs(f) <= tol) | (np.abs(step) <= 1e-14 * np.abs(x[idx]))
+        converged[idx[done]] = True
+
+        # shrink the bracket with the sign of the residual, bisect if the Newton step leaves it
+        lower[idx] = np.where(f < 0, x[idx], lower[idx])
+        upper[idx] = np.where(f > 0, x[idx], upper[idx])
+        new_x = x[idx] - step
+        outside = ~np.isfinite(new_x) | (new_x <= lower[idx]) | (new_x >= upper[idx])
+        new_x[outside] = (lower[idx][outside] + upper[idx][outside]) / 2
+        x[idx] = np.where(done, x[idx], new_x)
+        iterations[idx] += ~done
+
+    return x, iterations, converged
+
+
+def fisk_newton_func(x, target):
+    """
+    Moment equation of the Fisk distribution in x = 1 / beta, target - sinc(x), and its derivative.
+    """
+    return target - np.sinc(x), (np.sinc(x) - np.cos(np.pi * x)) / x
+
+
+def solve_fisk(mu, sigma, risks=None):
+    """
+    Calculate parameters (alpha and beta) for the Fisk (Log-Logistic) distribution for all cells at once
+    (vectorized version of run_for_fisk).
+    mu (array-like): Mean values.
+    sigma (array-like): Standard deviation values.
+    risks (array/None): risk of each value (labels of the convergence telemetry).
+    Returns: Tuple (alpha, beta) representing Fisk distribution parameters.
+    """
+    vr = np.where(mu < sigma, (mu * 0.999) ** 2, sigma ** 2)
+    target = (1 + vr / mu ** 2) / 2
+
+    # x = 1 / beta between 1 / pi (bound of the optimizers) and 1, started from sinc(x) ~ 1 - (pi x)^2 / 6
+    lower = np.full(len(mu), 1 / np.pi)
+    upper = np.ones(len(mu))
+    start = np.clip(np.sqrt(6 * (1 - target)) / np.pi, lower + 1e-9, upper - 1e-9)
+
+    # if the root lies beyond beta = pi, the bound is used (as by the optimizers)
+    at_bound = fisk_newton_func(lower, target)[0] > 0
+    x = lower.copy()
+    iterations = np.zeros(len(mu), dtype=int)
+    converged = at_bound.copy()
+    x[~at_bound], iterations[~at_bound], converged[~at_bound] = newton_solve(
+        fisk_newton_func, target[~at_bound], lower[~at_bound], upper[~at_bound], start[~at_bound])
+
+    beta = 1 / x
+    alpha = mu * np.sinc(x)
+    return _check_solution('fisk', run_for_fisk, mu, sigma, [alpha, beta], fisk_residual(alpha, beta, vr), iterations,
+                           converged, risks, 0.05, at_bound)
+
+
+def weibull_newton_func(t, target):
+    """
+    Moment equation of the Weibull distribution in t = 1 / k, log(gamma(1 + 2t) / gamma(1 + t)^2) - target, and its
+    derivative.
+    """
+    return gammaln(1 + 2 * t) - 2 * gammaln(1 + t) - target, 2 * digamma(1 + 2 * t) - 2 * digamma(1 + t)
+
+
+def solve_weibull(mu, sigma, risks=None):
+    """
+    Calculate parameters (k and lambda) for the Weibull distribution for all cells at once (vectorized version of
+    run_for_weibull).
+    mu (array-like): Mean values.
+    sigma (array-like): Standard deviation values.
+    risks (array/None): risk of each value (labels of the convergence telemetry).
+    Returns: Tuple (k, lambda) representing Weibull distribution parameters.
+    """
+    target = np.log(1 + sigma ** 2 / mu ** 2)
+
+    # t = 1 / k, bracket from 0 up to the first power of two with a positive residual, started from the empirical
+    # approximation k ~ (mu / sigma)^1.086
+    lower = np.zeros(len(mu))
+    upper = np.ones(len(mu))
+    for _ in range(60):
+        below = weibull_newton_func(upper, target)[0] <= 0
+        if not np.any(below):
+            break
+        upper[below] *= 2
+    start = np.clip((mu / sigma) ** -1.086, lower + 1e-9, upper - 1e-9)
+    t, iterations, converged = newton_solve(weibull_newton_func, target, lower, upper, start)
+
+    k = 1 / t
+    lamb = mu / gamma(1 + t)
+    return _check_solution('weibull', run_for_weibull, mu, sigma, [k, lamb], weibull_residual(k, lamb, sigma ** 2),
+                           iterations, converged, risks, 0.01)
+
+
+def invweibull_newton_func(t, target):
+    """
+    Moment equation of the inverse Weibull distribution in t = 1 / k, log(gamma(1 - 2t) / gamma(1 - t)^2) - target,
+    and its derivative.
+    """
+    return gammaln(1 - 2 * t) - 2 * gammaln(1 - t) - target, 2 * digamma(1 - t) - 2 * digamma(1 - 2 * t)
+
+
+def solve_invweibull(mu, sigma, risks=None):
+    """
+    Calculate parameters (k and lambda) for the Inverse Weibull distribution for all cells at once (vectorized version
+    of run_for_invweibull).
+    mu (array-like): Mean values.
+    sigma (array-like): Standard deviation values.
+    risks (array/None): risk of each value (labels of the convergence telemetry).
+    Returns: Tuple (k, lambda) representing Inverse Weibull distribution parameters.
+    """
+    y = mu / sigma
+    target = np.log(1 + 1 / y ** 2)
+
+    # t = 1 / k between 0 and 1/2 (k > 2, finite variance), started from the closed-form approximations of
+    # greater_4_5_inv_weibull (mu / sigma >= 1) and smaller_one_eighth_invweibull (mu / sigma < 1)
+    lower = np.zeros(len(mu))
+    upper = np.full(len(mu), 0.5)
+    c = (100 * helper_func_invweibull_one(7) - 7 * helper_func_invweibull_one(100)) / 93
+    k_large = 93 * (y - c) / (helper_func_invweibull_one(100) - helper_func_invweibull_one(7))
+    m = helper_func_invweibull_two(2.01) / 0.01
+    k_small = (1 / (1 + 1 / y ** 2) + 2 * m) / m
+    with np.errstate(divide='ignore'):
+        start = 1 / np.where(y >= 1, k_large, k_small)
+    start = np.clip(np.nan_to_num(start, nan=0.25), lower + 1e-9, upper - 1e-9)
+    t, iterations, converged = newton_solve(invweibull_newton_func, target, lower, upper, start)
+
+    k = 1 / t
+    lamb = gamma(1 - t) / mu
+    return _check_solution('invweibull', run_for_invweibull, mu, sigma, [k, lamb],
+                           invweibull_residual(k, lamb, sigma ** 2), iterations, converged, risks, 0.01)
+
+
+def _check_solution(family, run_for_family, mu, sigma, parameters, residual, iterations, converged, risks, tolerance,
+                    at_bound=None):
+    # records the converged cells with a relative error of the variance below the tolerance (or with the root beyond
+    # the bound of the optimizers, at_bound, where the bound is the solution) and solves the remaining ones with the
+    # optimizers of run_for_fisk/weibull/invweibull
+    valid = converged & np.all(np.isfinite(parameters), axis=0) & (
+        (residual < tolerance) | (False if at_bound is None else at_bound))
+    telemetry.record_batch(family, 'Newton', iterations[valid], iterations[valid] + 1, residual[valid],
+                           None if risks is None else risks[valid])
+    for idx in np.where(~valid)[0]:
+        with telemetry.cell(**({} if risks is None else {'risk': risks[idx]})):
+            parameters[0][idx], parameters[1][idx] = run_for_family(mu[idx], sigma[idx])
+    return parameters[0], parameters[1]
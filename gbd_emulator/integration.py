@@ -0,0 +1,125 @@
+import numpy as np
+
+'''
+################################################
+# adaptive integration of the PAFs
+# the PAF is the ratio of the expectations E[RR(X) - 1] / E[RR(X)] of the intake distribution. Instead of 100 equally
+# wide bins over [min, max] of the sample (with Simpson's rule on the bin centers), the bins are placed at sample
+# quantiles (equal probability per bin) with an additional edge at the TMREL (kink of the RR curve), and the RR is
+# integrated over each bin with Gauss-Legendre nodes. With a tolerance the bins are doubled until the change of the
+# PAF (the estimated error) is below the tolerance, otherwise the PAF is integrated once with the given bins (the
+# error is only estimated, by halving the number of bins, if it is asked for)
+################################################
+'''
+binning_methods = ['equal-width', 'adaptive']
+
+# estimators of the PAFs: integral of the histogram of the sample per (risk, disease, age, sex) combination (binned
+# as chosen by PAF_binning), or ratio of the sample means of all combinations at once (calculate_PAF_table in
+# helpers_PAF_calculation.py)
+PAF_estimators = ['histogram', 'sample-mean']
+
+# Gauss-Legendre nodes and weights on [-1, 1] (exact for polynomials up to degree 5 within a bin)
+gauss_nodes, gauss_weights = np.polynomial.legendre.leggauss(3)
+
+
+def quantile_edges(x_array, num_bins, breakpoints=()):
+    """
+    Bin edges at the quantiles of the sample, the breakpoints within the range of the sample are added as edges
+    x_array (array): sample
+    num_bins (int): number of bins (fewer if quantiles coincide)
+    breakpoints (iterable): points where the integrand is not smooth (e.g. the TMREL)
+    Returns: array of increasing edges
+    """
+    edges = np.quantile(x_array, np.linspace(0, 1, num_bins + 1))
+    inside = [point for point in breakpoints if edges[0] < point < edges[-1]]
+    return np.unique(np.concatenate([edges, inside]))
+
+
+def expectation(x_array, function, edges):
+    """
+    Expectation of a function under the histogram density of the sample with the given edges (the function is
+    averaged over each bin with Gauss-Legendre nodes)
+    x_array (array): sample
+    function (function): vectorized integrand
+    edges (array): bin edges
+    Returns: expectation (float)
+    """
+    if len(edges) < 2:
+        return float(function(np.asarray(edges[:1], dtype=float))[0])
+    counts, _ = np.histogram(x_array, bins=edges)
+    centers = (edges[:-1] + edges[1:]) / 2
+    half_widths = np.diff(edges) / 2
+    bin_means = function(centers[:, None] + half_widths[:, None] * gauss_nodes) @ gauss_weights / 2
+    return np.sum(counts * bin_means) / np.sum(counts)
+
+
+class PAFIntegrator(object):
+    # integrates the PAFs with quantile bins aligned to the TMREL and estimates the integration error
+
+    def __init__(self, num_bins=100, tolerance=None, min_bins=8):
+        """
+        num_bins (int): number of bins (the largest number of bins if a tolerance is given)
+        tolerance (float/None): absolute error of the PAF at which the refinement stops (None: num_bins bins)
+        min_bins (int): number of bins the refinement starts with
+        """
+        self.num_bins = num_bins
+        self.tolerance = tolerance
+        self.min_bins = min_bins
+
+    def _ratio(self, x_array, numerator, denominator, breakpoints, num_bins):
+        edges = quantile_edges(x_array, num_bins, breakpoints)
+        return expectation(x_array, numerator, edges) / expectation(x_array, denominator, edges)
+
+    def ratio(self, x_array, numerator, denominator, breakpoints=(), estimate_error=False):
+        """
+        Ratio of the expectations of two functions under the distribution of the sample
+        x_array (array): sample
+        numerator, denominator (function): vectorized integrands
+        breakpoints (iterable): points where the integrands are not smooth (e.g. the TMREL)
+        estimate_error (bool): whether the error is estimated without a tolerance (integration with half the bins)
+        Returns: Tuple (ratio, estimated absolute error (None if not estimated), number of bins)
+        """
+        if self.tolerance is None:
+            value = self._ratio(x_array, numerator, denominator, breakpoints, self.num_bins)
+            if not estimate_error:
+                return value, None, self.num_bins
+            coarse = self._ratio(x_array, numerator, denominator, breakpoints, max(self.num_bins // 2, 1))
+            return value, abs(value - coarse), self.num_bins
+
+        num_bins = min(self.min_bins, self.num_bins)
+        value = self._ratio(x_array, numerator, denominator, breakpoints, num_bins)
+        error = np.inf
+        while num_bins < self.num_bins:
+            num_bins = min(2 * num_bins, self.num_bins)
+            refined = self._ratio(x_array, numerator, denominator, breakpoints, num_bins)
+            error, value = abs(refined - value), refined
+            if error <= self.tolerance:
+                break
+        return value, error, num_bins
+
+
+def create_integrator(setup):
+    """
+    Integrator of the PAFs chosen in the Setup_file
+    setup (module/namespace): Setup_file of the scenario (PAF_binning, PAF_bins, PAF_tolerance)
+    Returns: PAFIntegrator, or None for the equally wide bins of the original calculation
+    """
+    if setup.PAF_binning == 'equal-width':
+        return None
+    elif setup.PAF_binning == 'adaptive':
+        return PAFIntegrator(setup.PAF_bins, setup.PAF_tolerance)
+    else:
+        print(f'Unknown PAF binning {setup.PAF_binning}, use one of {binning_methods}')
+        exit()
+
+
+def uses_sample_means(setup):
+    """
+    Whether the PAFs are estimated by the sample means (PAF_estimator of the Setup_file)
+    setup (module/namespace): Setup_file of the scenario
+    Returns: True for 'sample-mean', False for 'histogram'
+    """
+    if setup.PAF_estimator not in PAF_estimators:
+        print(f'Unknown PAF estimator {setup.PAF_estimator}, use one of {PAF_estimators}')
+        exit()
+    return setup.PAF_estimator == 'sample-mean'
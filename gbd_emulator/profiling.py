@@ -0,0 +1,122 @@
+import time
+import json
+import cProfile
+import contextlib
+import pandas as pd
+
+'''
+################################################
+# profiling hooks
+# stage timers accumulating the number of calls and the wall and CPU time per stage (data loading, variable fitting,
+# sampling, PAF computation, aggregation, output) and an optional cProfile/pyinstrument capture of a whole run
+################################################
+'''
+stages = ['data loading', 'variable fitting', 'sampling', 'PAF computation', 'aggregation', 'output']
+
+
+class StageProfiler(object):
+    # accumulates calls, wall time and CPU time per stage
+
+    def __init__(self):
+        self.stats = {}
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        begin_wall, begin_cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            stats = self.stats.setdefault(name, {'count': 0, 'wall_s': 0.0, 'cpu_s': 0.0})
+            stats['count'] += 1
+            stats['wall_s'] += time.perf_counter() - begin_wall
+            stats['cpu_s'] += time.process_time() - begin_cpu
+
+    def reset(self):
+        self.stats = {}
+
+    def merge(self, stats):
+        """
+        Adds the stats of another profiler (e.g. of a worker process)
+        stats (dict): stats per stage
+        """
+        for name, other in stats.items():
+            own = self.stats.setdefault(name, {'count': 0, 'wall_s': 0.0, 'cpu_s': 0.0})
+            for key in own:
+                own[key] += other[key]
+
+    def report(self):
+        """
+        Returns: dataframe with the calls, wall and CPU time and the share of the total wall time per stage
+        """
+        names = [name for name in stages if name in self.stats] + \
+            [name for name in self.stats if name not in stages]
+        report_df = pd.DataFrame([dict(stage=name, **self.stats[name]) for name in names],
+                                 columns=['stage', 'count', 'wall_s', 'cpu_s'])
+        report_df['wall_share'] = report_df['wall_s'] / report_df['wall_s'].sum()
+        return report_df
+
+    def save_report(self, path):
+        """
+        Prints the timing report and saves it as JSON or CSV (depending on the file extension)
+        path (str/None): saving path (None: only printed)
+        """
+        report_df = self.report()
+        print(report_df.round(4).to_string(index=False))
+        if path is None:
+            return
+        if path.endswith('.json'):
+            with open(path, 'w') as f:
+                json.dump(report_df.to_dict(orient='records'), f, indent=2)
+        else:
+            report_df.to_csv(path, index=False)
+        print(f'Saved timing report to: {path}')
+
+
+# profiler of the current process, used by the scenario drivers and the distribution creator
+profiler = StageProfiler()
+
+
+def stage(name):
+    """
+    Context manager timing a stage with the profiler of the current process
+    name (str): name of the stage (see stages)
+    """
+    return profiler.stage(name)
+
+
+@contextlib.contextmanager
+def capture(profiler_name=None, path=None):
+    """
+    Captures a whole run with cProfile or pyinstrument (only the current process, not the worker processes)
+    profiler_name (str/None): 'cprofile', 'pyinstrument' or None (no capture)
+    path (str/None): saving path of the capture (cProfile stats file or pyinstrument html page)
+    """
+    if profiler_name is None:
+        yield
+    elif profiler_name == 'cprofile':
+        capture_profiler = cProfile.Profile()
+        capture_profiler.enable()
+        try:
+            yield
+        finally:
+            capture_profiler.disable()
+            capture_profiler.dump_stats(path if path is not None else 'profile.prof')
+            print(f"Saved cProfile stats to: {path if path is not None else 'profile.prof'}")
+    elif profiler_name == 'pyinstrument':
+        try:
+            from pyinstrument import Profiler
+        except ImportError:
+            print('pyinstrument is not installed, use cprofile instead')
+            exit()
+        capture_profiler = Profiler()
+        capture_profiler.start()
+        try:
+            yield
+        finally:
+            capture_profiler.stop()
+            with open(path if path is not None else 'profile.html', 'w') as f:
+                f.write(capture_profiler.output_html())
+            print(f"Saved pyinstrument profile to: {path if path is not None else 'profile.html'}")
+    else:
+        print(f'Unknown profiler {profiler_name}, use cprofile or pyinstrument')
+        exit()
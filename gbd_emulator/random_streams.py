@@ -0,0 +1,81 @@
+import hashlib
+import numpy as np
+from scipy.stats import qmc
+
+'''
+################################################
+# random streams of the sampling
+# every (country, run, risk, age, sex) combination gets its own numpy Generator, seeded with a SeedSequence whose
+# spawn key is made of the labels of the combination (the same seeds SeedSequence.spawn would give, but keyed by the
+# labels instead of the order of the spawn calls), so the samples do not depend on the number of worker processes or
+# the order in which the countries and combinations are calculated
+################################################
+'''
+# sampling methods of the intake distributions: independent random numbers per family, or one stratified
+# (Latin hypercube) or quasi-random (scrambled Sobol) number per sample (see sample_from_uniforms in
+# ensemble_distributions.py)
+sampling_methods = ['random', 'latin-hypercube', 'sobol']
+
+
+def label_key(label):
+    """
+    Stable integer key of a label (Python's hash of strings changes between processes)
+    label: name of a country, risk, age group or sex (or a run number)
+    Returns: non-negative integer
+    """
+    if isinstance(label, (int, np.integer)) and label >= 0:
+        return int(label)
+    return int.from_bytes(hashlib.blake2b(str(label).encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+def seed_sequence(seed, *labels):
+    """
+    SeedSequence of a combination of labels
+    seed (int): seed of the whole calculation (setup.random_seed)
+    labels: labels of the combination, e.g. country, run, risk, age and sex
+    Returns: SeedSequence
+    """
+    return np.random.SeedSequence(seed, spawn_key=tuple(label_key(label) for label in labels))
+
+
+def cell_generators(seed, country, run, cells):
+    """
+    Random number generators of the (risk, age, sex) combinations of a country and run
+    seed (int): seed of the whole calculation (setup.random_seed)
+    country (str): name of the country
+    run (int): run number
+    cells (iterable): (risk, age, sex) tuples, e.g. the index of the distributions dataframe
+    Returns: list of Generators, one per combination
+    """
+    return [np.random.Generator(np.random.PCG64(seed_sequence(seed, country, run, *cell))) for cell in cells]
+
+
+def check_sample_size(size, method):
+    """
+    Checks the sample size of a sampling method, the scrambled Sobol points are only balanced for powers of 2
+    size (int): sample size of the intake distributions
+    method (str): sampling method (see sampling_methods)
+    """
+    if method == 'sobol' and (size < 1 or size & (size - 1)):
+        print(f'Sobol sampling needs a power of 2 as sample size (e.g. {2 ** int(np.ceil(np.log2(max(size, 1))))}), '
+              f'not {size}')
+        exit()
+
+
+def stratified_uniforms(generator, size, method):
+    """
+    Stratified or quasi-random uniform numbers on [0, 1)
+    generator (Generator): random stream of the combination
+    size (int): number of uniform numbers
+    method (str): 'latin-hypercube' (one number in each of the size equally wide strata, in random order) or 'sobol'
+                  (scrambled Sobol points, size must be a power of 2)
+    Returns: array (size)
+    """
+    if method == 'latin-hypercube':
+        return (generator.permutation(size) + generator.random(size)) / size
+    elif method == 'sobol':
+        check_sample_size(size, method)
+        return qmc.Sobol(d=1, scramble=True, seed=generator).random_base2(int(size).bit_length() - 1)[:, 0]
+    else:
+        print(f'Unknown sampling method {method}, use one of {sampling_methods}')
+        exit()
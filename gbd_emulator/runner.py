@@ -0,0 +1,160 @@
+import os
+import types
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+import pandas as pd
+from .profiling import profiler, stage, capture
+from .convergence import telemetry
+from .truncation import truncation
+from .shared_inputs import shared_tables, attach
+
+
+def setup_to_namespace(setup):
+    """
+    Copies the settings of a Setup_file (module or namespace) into a plain namespace, which can be modified and sent
+    to worker processes
+    setup (module/namespace): Setup_file of the scenario
+    Returns: namespace with all public (non-module, non-function) attributes of the setup
+    """
+    settings = {key: value for key, value in vars(setup).items()
+                if not key.startswith('_') and not isinstance(value, (types.ModuleType, types.FunctionType, type))}
+    return types.SimpleNamespace(**settings)
+
+
+def split_countries(countries, num_workers, chunk_size):
+    """
+    Splits the countries into the chunks handed to the worker processes
+    countries (array): names of the countries to calculate
+    num_workers (int): number of worker processes
+    chunk_size (int/None): number of countries per chunk (if None, the countries are split evenly over the workers)
+    Returns: list of country arrays
+    """
+    if chunk_size is None:
+        chunk_size = -(-len(countries) // max(num_workers, 1))
+    chunk_size = max(int(chunk_size), 1)
+    return [countries[i: i + chunk_size] for i in range(0, len(countries), chunk_size)]
+
+
+def combine_results(results):
+    """
+    Combines the outputs of the single chunks into one output per name (chunks are kept in country order)
+    results (list): one dict of dataframes (output name -> dataframe) per chunk
+    Returns: dict of dataframes
+    """
+    combined = {}
+    for name in results[0]:
+        frames = [result[name] for result in results]
+        combined[name] = pd.concat(frames, ignore_index=isinstance(frames[0].index, pd.RangeIndex))
+    return combined
+
+
+def run_countries(calculate, setup, countries, load_inputs=None, **kwargs):
+    """
+    Runs the calculation of a scenario for the given countries, either in the current process or split into chunks
+    of countries that are calculated by a pool of worker processes (setup.num_workers, setup.chunk_size)
+    calculate (function): calculate function of the scenario, called as calculate(setup, countries, **kwargs) and
+                          returning a dict of dataframes
+    setup (module/namespace): Setup_file of the scenario
+    countries (array): names of the countries to calculate
+    load_inputs (function/None): loads the input tables of the scenario, called as load_inputs(setup). The tables are
+                                 loaded once and handed to every chunk (calculate(..., inputs=...)), the worker
+                                 processes get them in shared memory (shared_inputs.py). If None, every chunk loads
+                                 its own inputs
+    Returns: dict of dataframes (output name -> dataframe)
+    """
+    num_workers = setup.num_workers
+    chunks = split_countries(countries, num_workers, setup.chunk_size)
+    inputs = load_inputs(setup) if load_inputs is not None and len(chunks) > 1 else None
+    input_kwargs = {} if inputs is None else {'inputs': inputs}
+
+    if num_workers <= 1 or len(chunks) <= 1:
+        results = [calculate(setup, chunk, **input_kwargs, **kwargs) for chunk in chunks]
+    else:
+        print(f'Calculating {len(countries)} countries in {len(chunks)} chunks with {num_workers} workers')
+        # modules can not be sent to the worker processes, only the settings and the handles of the input tables in
+        # shared memory are passed on
+        worker_setup = setup_to_namespace(setup)
+        with shared_tables(inputs or {}) as handles, ProcessPoolExecutor(max_workers=num_workers) as executor:
+            outputs = list(executor.map(partial(_calculate_chunk, calculate, worker_setup, kwargs,
+                                                handles if inputs is not None else None), chunks))
+        results = [output[0] for output in outputs]
+        for output in outputs:
+            profiler.merge(output[1])
+            telemetry.merge(output[2])
+            truncation.merge(output[3])
+
+    return combine_results(results)
+
+
+def _calculate_chunk(calculate, setup, kwargs, handles, countries):
+    # runs in a worker process, returns the outputs of the chunk, the stage timings, the convergence telemetry and the
+    # truncation diagnostics of the worker
+    profiler.reset()
+    telemetry.reset()
+    truncation.reset()
+    if handles is not None:
+        kwargs = dict(kwargs, inputs=attach(handles))
+    results = calculate(setup, countries, **kwargs)
+    return results, profiler.stats, telemetry.stats, truncation.stats
+
+
+def run_and_save(calculate, save, setup, countries, start_country_idx, stop_country_idx, load_inputs=None,
+                 **kwargs):
+    """
+    Runs the calculation of a scenario for the given countries, saves the outputs and reports the time spent per
+    stage, the convergence of the parameter fitting and the truncated mass of the intake distributions (optionally
+    the whole run is captured with cProfile or pyinstrument, see setup.profiler)
+    calculate, save (function): calculate and save function of the scenario
+    setup (module/namespace): Setup_file of the scenario
+    countries (array): names of the countries to calculate
+    start_country_idx, stop_country_idx (int): range of the calculated countries (used to label the output)
+    load_inputs (function/None): loads the input tables shared by the chunks (see run_countries)
+    """
+    profiler.reset()
+    telemetry.reset()
+    truncation.reset()
+    with capture(setup.profiler, setup.profiler_path):
+        results = run_countries(calculate, setup, countries, load_inputs, **kwargs)
+        with stage('output'):
+            save(setup, results, start_country_idx, stop_country_idx, **kwargs)
+    profiler.save_report(setup.timing_report_path)
+    telemetry.save_report(setup.convergence_report_path)
+    truncation.save_report(setup.truncation_report_path)
+
+
+def save_dataframe(df, path, output_format='csv', index=True):
+    """
+    Saves an output dataframe in the chosen output format (the folder is created if needed)
+    df (dataframe): output to save
+    path (str): saving path (for parquet the file extension is replaced by .parquet)
+    output_format (str): 'csv' or 'parquet' (parquet needs pyarrow or fastparquet)
+    index (bool): whether the index is written
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    if output_format == 'csv':
+        df.to_csv(path, index=index)
+    elif output_format == 'parquet':
+        # parquet only allows string column names
+        df = df.copy()
+        df.columns = df.columns.map(str)
+        df.to_parquet(os.path.splitext(path)[0] + '.parquet', index=index)
+    else:
+        print(f'Unknown output format {output_format}, use csv or parquet')
+        exit()
+
+
+def save_partitioned(df, directory, partition_column, output_format='csv'):
+    """
+    Saves an output dataframe as a dataset partitioned by the values of a column, one file per value in a folder named
+    '<column>=<value>' (the layout read as one dataset by e.g. pyarrow.dataset or pandas.read_parquet)
+    df (dataframe): output to save
+    directory (str): folder of the dataset
+    partition_column (str): column whose values define the partitions (not written into the files)
+    output_format (str): 'csv' or 'parquet'
+    """
+    for value, partition in df.groupby(partition_column, sort=True):
+        save_dataframe(partition.drop(columns=partition_column),
+                       os.path.join(directory, f'{partition_column}={value}', 'part-0.csv'), output_format, index=False)
@@ -0,0 +1,9 @@
+'''
+################################################
+# scenario drivers of the emulator
+# each driver exposes main(setup, arguments), where setup is the Setup_file (module or namespace) of the scenario
+# and arguments the command line arguments (optionally start and stop index of the countries)
+# calculate(setup, countries) returns the outputs of a subset (chunk) of countries as a dict of dataframes and
+# save(setup, results, start_country_idx, stop_country_idx) writes the (combined) outputs
+################################################
+'''
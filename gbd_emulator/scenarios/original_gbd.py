@@ -0,0 +1,249 @@
+import numpy as np
+import pandas as pd
+import time
+from ..helpers_data_and_setup import calculate_mediation_matrix, load_input_files, load_mean_and_std, \
+    load_country_codes, load_risk_inputs, get_country_range, burden_arrays, country_burden
+from ..helpers_PAF_calculation import full_calculation, calculate_PAF_table, calculate_joint_PAF_table
+from ..Distribution_creater_class import DistributionCreator
+from ..runner import run_and_save, save_dataframe
+from ..profiling import stage
+from ..integration import create_integrator, uses_sample_means
+
+
+def main(setup, arguments):
+    """
+    Analytical scenario 1: reproduces the disease burden attributable to the 15 dietary risks under the 2017 exposure
+    distributions
+    setup (module/namespace): Setup_file of the scenario (number of runs, sample size, file paths, scenarios)
+    arguments (list): command line arguments (optionally start and stop index of the countries)
+    """
+    _, countries = load_country_codes(setup.M49_path)
+
+    # allowing subset execution rather than looping over all countries
+    start_country_idx, stop_country_idx = get_country_range(arguments, len(countries))
+
+    run_and_save(calculate, save, setup, countries[start_country_idx: stop_country_idx], start_country_idx,
+                 stop_country_idx, load_inputs)
+
+
+def save(setup, results, start_country_idx, stop_country_idx):
+    """
+    Saves the DALYs per country of each scenario
+    setup (module/namespace): Setup_file of the scenario
+    results (dict): DALYs dataframe per scenario name (output of calculate)
+    start_country_idx, stop_country_idx (int): range of the calculated countries (used in the saving path)
+    """
+    for scenario in setup.scenarios:
+        save_dataframe(results[scenario['name']],
+                       scenario['saving_path'].format(start_country_idx, stop_country_idx), setup.output_format)
+
+
+def load_inputs(setup):
+    """
+    Loads the input tables shared by all countries (handed to the worker processes in shared memory, see
+    shared_inputs.py)
+    setup (module/namespace): Setup_file of the scenario
+    Returns: dict of input tables
+    """
+    with stage('data loading'):
+        # get the risk factors, relative risks (RR) for morbidity and mortality and the TMRELs
+        risk_factors_df, risks_dict, rf_df_morb, rf_df_mort, TMREL_df = \
+            load_risk_inputs(setup.dietary_risk_factors_path, setup.rf_mord_mort_path, setup.TMREL_path)
+
+        # get the mean values of the YLDs and YLLs (those might vary for different scenarios)
+        total_YLD_df = pd.read_csv(setup.total_YLL_or_YLD_path.format('YLD'),
+                                   usecols=['location', 'sex', 'cause', 'age', 'val'], index_col=[0, 1, 2, 3])
+        total_YLD_df.sort_index(inplace=True)
+
+        total_YLL_df = pd.read_csv(setup.total_YLL_or_YLD_path.format('YLL'),
+                                   usecols=['location', 'sex', 'cause', 'age', 'val'], index_col=[0, 1, 2, 3])
+        total_YLL_df.sort_index(inplace=True)
+
+        # dense arrays of the YLDs and YLLs (dim 1 x locations x diseases x ages x sexes)
+        burden = burden_arrays(total_YLD_df, total_YLL_df, setup.index_dict)
+
+        # create the mediation matrix MF capturing the overlaps between risks (for better overview the calculation
+        # happens in helpers_data_and_setup.py)
+        MF = calculate_mediation_matrix()
+
+        # get the bounds and weights used to construct/compose intake distributions
+        minmax_bounds_df, distribution_weights_df = load_input_files(setup.min_max_path, setup.distrbution_weights_path)
+
+    return dict(risk_factors_df=risk_factors_df, risks_dict=risks_dict, rf_df_morb=rf_df_morb, rf_df_mort=rf_df_mort,
+                TMREL_df=TMREL_df, burden=burden, MF=MF,
+                minmax_bounds_df=minmax_bounds_df, distribution_weights_df=distribution_weights_df)
+
+
+def calculate(setup, countries, inputs=None):
+    """
+    Calculates the DALYs attributable to all dietary risks for the given countries
+    setup (module/namespace): Setup_file of the scenario
+    countries (array): names of the countries to calculate
+    inputs (dict/None): input tables of load_inputs (None: loaded by this call)
+    Returns: dict with one dataframe per scenario name (index: UNM49 code, columns: runs)
+    """
+    '''
+    ################################################
+    # general setup
+    ################################################
+    '''
+    index_dict = setup.index_dict
+
+    # country M49 code file; used here to get the UNM49 codes of the countries
+    country_codes_df, _ = load_country_codes(setup.M49_path)
+    num_countries = len(countries)
+
+    # define model dimensions: countries, risks, diseases, ages, genders
+    risks = index_dict['risks']
+    diseases = index_dict['diseases']
+    num_diseases = len(diseases)
+
+    age_groups = index_dict['age_groups']
+    num_ages = len(age_groups)
+
+    genders = index_dict['genders']
+    num_genders = len(genders)
+
+    num_runs = setup.num_runs
+
+    # integration of the PAFs (None: 100 equally wide bins) or ratio of the sample means
+    integrator = create_integrator(setup)
+    sample_means = uses_sample_means(setup)
+
+    '''
+    ################################################
+    # loading the data
+    ################################################
+    '''
+    # input tables shared by all countries (loaded here, or loaded once for all chunks by the runner)
+    inputs = load_inputs(setup) if inputs is None else inputs
+    risk_factors_df = inputs['risk_factors_df']
+    risks_dict = inputs['risks_dict']
+    rf_df_morb = inputs['rf_df_morb']
+    rf_df_mort = inputs['rf_df_mort']
+    TMREL_df = inputs['TMREL_df']
+    burden = inputs['burden']
+    MF = inputs['MF']
+    minmax_bounds_df = inputs['minmax_bounds_df']
+    distribution_weights_df = inputs['distribution_weights_df']
+
+    # output arrays
+    DALYs = np.zeros((num_countries, num_runs))
+
+    # stores UNM49 codes corresponding to each country index; used as output index
+    M49s = np.zeros(num_countries)
+
+    results = {}
+
+    for scenario in setup.scenarios:
+        print(f"Working on scenario {scenario['name']}")
+
+        # loop countries (possibly a subset or chunk) for this scenario
+        for idx1, country in enumerate(countries):
+            print(country)
+            M49s[idx1] = country_codes_df.loc[country, 'UNM49']
+
+            # total burden of all (disease, age, sex) cells of this country
+            total_YLDs, total_YLLs = country_burden(burden, country)
+
+            with stage('data loading'):
+                # loading the means and standard deviations (central values only) for this country
+                mean_values_df, sd_values_df = \
+                    load_mean_and_std(setup.GBD_centralval_path, country)
+
+            # timing block per country (all runs)
+            begin = time.time()
+
+            for run in np.arange(num_runs):
+                print(run)
+
+                # extract exposure means/SDs for this run/draw
+                means = mean_values_df.loc[:, str(run)].to_numpy()
+                stds = sd_values_df.loc[:, str(run)].to_numpy()
+
+                # generate exposure distributions for each (risk, age, sex) combination for this country and run
+                distributions_df = \
+                    DistributionCreator(
+                        country, risks, age_groups, genders, run, setup.sample_size,
+                        setup.random_seed, setup.sampling_method, setup.precision).get_distributions(
+                        means, stds, minmax_bounds_df.loc[country, :], distribution_weights_df)
+
+                # individual PAFs of all (disease, age, sex, risk) combinations, at once (sample-mean estimator) or
+                # per combination (histogram estimator)
+                if sample_means:
+                    with stage('PAF computation'):
+                        PAF_table = calculate_PAF_table(distributions_df, TMREL_df, risk_factors_df, rf_df_morb,
+                                                        rf_df_mort, index_dict, run)
+                else:
+                    PAF_table = np.zeros((num_diseases, num_ages, num_genders, len(risks), 2))
+
+                    with stage('PAF computation'):
+                        # loop through all diseases
+                        for idx2, disease in enumerate(diseases):
+
+                            # loop over ages
+                            for idx3, age in enumerate(age_groups):
+
+                                # loop over genders
+                                for idx4, gender in enumerate(genders):
+
+                                    # loop over risks
+                                    # compute individual PAFs for each risk that applies to this disease
+                                    for idx5, risk in enumerate(risks):
+                                        risk_diseases = risks_dict[risk]
+
+                                        # only compute if the disease is linked to the current risk
+                                        if disease in risk_diseases:
+                                            morb_mort = np.unique(
+                                                risk_factors_df.loc[(risk, disease), :].index.get_level_values(0))[0]
+
+                                            # if "Both", full_calculation returns both morbidity and mortality PAFs
+                                            if morb_mort == 'Both':
+                                                PAF_value = full_calculation(risk, disease, age, gender, TMREL_df,
+                                                                             risk_factors_df, distributions_df,
+                                                                             rf_df_morb, rf_df_mort, 'Both', run,
+                                                                             integrator)
+                                                PAF_table[idx2, idx3, idx4, idx5, :] = PAF_value
+
+                                            else:
+                                                # otherwise compute morbidity and mortality separately
+                                                PAF_table[idx2, idx3, idx4, idx5, 0] = \
+                                                    full_calculation(risk, disease, age, gender, TMREL_df,
+                                                                     risk_factors_df, distributions_df, rf_df_morb,
+                                                                     rf_df_mort, 'Morbidity', run, integrator)
+                                                PAF_table[idx2, idx3, idx4, idx5, 1] = \
+                                                    full_calculation(risk, disease, age, gender, TMREL_df,
+                                                                     risk_factors_df, distributions_df, rf_df_morb,
+                                                                     rf_df_mort, 'Mortality', run, integrator)
+
+                with stage('aggregation'):
+                    # aggregate across risks for each disease/age/sex using the mediation matrix
+                    # separate the joint PAFs for morbidity and mortality components
+                    PAF_J = calculate_joint_PAF_table(PAF_table, MF)
+
+                    # convert PAFs to DALYs attributable to each outcome/age/sex
+                    # - morbidity component applied to YLDs
+                    # - mortality component applied to YLLs
+                    attributable_DALYs = PAF_J[..., 0] * total_YLDs + PAF_J[..., 1] * total_YLLs
+
+                    # safety check for invalid values
+                    if np.any(np.isnan(attributable_DALYs)):
+                        print('value is nan')
+                        print(PAF_J[np.isnan(attributable_DALYs)])
+                        exit()
+
+                # total attributable DALYs for this country/run (sum over all diseases, ages, sexes)
+                DALYs[idx1, run] = np.sum(attributable_DALYs)
+
+                # explicit deletes (mostly useful if memory pressure is high)
+                del means
+                del stds
+
+            # end timing block
+            end = time.time()
+            print('time', end - begin)
+
+        # create dataframe with DALYs per country
+        results[scenario['name']] = pd.DataFrame(DALYs.copy(), index=M49s.copy(), columns=np.arange(num_runs))
+
+    return results
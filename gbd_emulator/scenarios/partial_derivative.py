@@ -0,0 +1,374 @@
+import numpy as np
+import pandas as pd
+import time
+from itertools import product
+from ..helpers_data_and_setup import calculate_mediation_matrix, load_input_files, load_std, \
+    load_total_YLDs_YLLs_projected, load_means_projected, load_country_codes, load_risk_inputs, get_country_range, \
+    burden_arrays, country_burden, dense_to_dataframe, summarise_runs
+from ..helpers_PAF_calculation import full_calculation, full_calculation_der, calculate_PAF_table, \
+    calculate_PAF_der_per_disease
+from ..Distribution_creater_class import DistributionCreator
+from ..runner import run_and_save, save_dataframe, save_partitioned
+from ..config import SSP_path
+from ..aggregation import Aggregator, age_band_groups, add_country_groups, load_country_groups, country_population, \
+    per_capita
+from ..profiling import stage
+from ..integration import create_integrator, uses_sample_means
+
+
+def main(setup, arguments):
+    """
+    Analytical scenario 3: marginal PAFs and marginal DALYs of the joint dietary disease burden per risk, for each
+    time point under the selected SSP (or under several SSPs at once, see SSPs_of_run)
+    setup (module/namespace): Setup_file of the scenario (number of runs, sample size, file paths, index_dict with
+                              time points)
+    arguments (list): command line arguments (optionally start and stop index of the countries)
+    """
+    _, countries = load_country_codes(setup.M49_path)
+
+    # allowing subset execution rather than looping over all countries
+    start_country_idx, stop_country_idx = get_country_range(arguments, len(countries))
+
+    run_and_save(calculate, save, setup, countries[start_country_idx: stop_country_idx], start_country_idx,
+                 stop_country_idx, load_inputs)
+
+
+def SSPs_of_run(setup):
+    """
+    SSPs calculated in a run: the SSPs compared in one run (setup.SSP_names) or only the SSP of the setup
+    setup (module/namespace): Setup_file of the scenario
+    Returns: list of SSP names
+    """
+    SSP_names = getattr(setup, 'SSP_names', None)
+    return list(SSP_names) if SSP_names else [setup.SSP_name]
+
+
+def save(setup, results, start_country_idx, stop_country_idx):
+    """
+    Saves the marginal DALYs of each age band (setup.age_bands), with the aggregates of the country groups (regions,
+    income groups, see load_country_groups) next to the countries or instead of them (setup.save_countries) and the
+    runs selected by setup.run_output: run 0 with one column per year ('first'), one column per run ('all') or summary
+    statistics over the runs ('summary'). The DALYs of several SSPs are saved as one dataset partitioned by SSP
+    setup (module/namespace): Setup_file of the scenario
+    results (dict): output of calculate (possibly combined from several chunks of countries)
+    start_country_idx, stop_country_idx (int): range of the calculated countries (not used in the saving path)
+    """
+    # the country groups are summed for every run once all countries are calculated, the DALYs per capita (a first
+    # 'measure' level next to the DALYs) divide the DALYs by the population of the countries (of the group) under the
+    # SSP in the year
+    DALYs_der_df = results['DALYs_der']
+    country_groups = load_country_groups(setup)
+    population = country_population(setup, DALYs_der_df.index.unique('year'), DALYs_der_df.index.unique('ssp'))
+    if population is None:
+        DALYs_der_df = add_country_groups(DALYs_der_df, country_groups, keep_countries=setup.save_countries)
+    else:
+        DALYs_der_df = pd.concat(
+            {'DALYs': add_country_groups(DALYs_der_df, country_groups, keep_countries=setup.save_countries),
+             'DALYs per capita': per_capita(DALYs_der_df, population, country_groups,
+                                            keep_countries=setup.save_countries)}, names=['measure'])
+    for name in DALYs_der_df.index.unique('age_band'):
+        # sorted, so the order does not depend on the chunks of countries
+        band_df = DALYs_der_df.xs(name, level='age_band').sort_index()
+        if setup.run_output == 'first':
+            output_df = band_df[0].unstack('year').reset_index()
+        elif setup.run_output == 'all':
+            output_df = band_df.reset_index()
+        elif setup.run_output == 'summary':
+            output_df = summarise_runs(band_df).reset_index()
+        else:
+            print(f'Unknown run output {setup.run_output}, use first, all or summary')
+            exit()
+        output_df.columns = output_df.columns.map(str)
+
+        if getattr(setup, 'SSP_names', None):
+            # one dataset for all SSPs (one folder per SSP)
+            save_partitioned(output_df, setup.SSP_comparison_path.format(name), 'ssp', setup.output_format)
+        else:
+            # save processed dfs (the saving path is set per SSP in the Setup_file)
+            save_dataframe(output_df.drop(columns='ssp'), setup.saving_path.format(name), setup.output_format)
+
+
+def load_inputs(setup):
+    """
+    Loads the input tables shared by all countries (handed to the worker processes in shared memory, see
+    shared_inputs.py), the inputs that do not depend on the SSP are loaded once for all SSPs of the run
+    setup (module/namespace): Setup_file of the scenario
+    Returns: dict of input tables (the burden and means per SSP)
+    """
+    with stage('data loading'):
+        # get the risk factors, relative risks (RR) for morbidity and mortality and the TMRELs
+        risk_factors_df, risks_dict, rf_df_morb, rf_df_mort, TMREL_df = \
+            load_risk_inputs(setup.dietary_risk_factors_path, setup.rf_mord_mort_path, setup.TMREL_path)
+
+        # create the mediation matrix MF capturing the overlaps between risks (for better overview the calculation
+        # happens in helpers_data_and_setup.py)
+        MF = calculate_mediation_matrix()
+
+        # get the bounds and weights used to construct/compose intake distributions
+        minmax_bounds_df, distribution_weights_df = load_input_files(setup.min_max_path, setup.distrbution_weights_path)
+
+        # the YLLs and YLDs and the means of all time points for each SSP, time points between the projected years
+        # (2020, 2025, ..., 2050) are interpolated linearly
+        time_points = setup.index_dict['time_points']
+        burden, means_df = {}, {}
+        for SSP_name in SSPs_of_run(setup):
+            total_YLD_df, total_YLL_df = load_total_YLDs_YLLs_projected(
+                SSP_path(setup, 'total_YLL_or_YLD_path_per_SSP', SSP_name), time_points)
+            means_df[SSP_name] = load_means_projected(SSP_path(setup, 'means_per_SSP', SSP_name), time_points)
+
+            # dense arrays of the YLDs and YLLs (dim time points x locations x diseases x ages x sexes)
+            burden[SSP_name] = burden_arrays(total_YLD_df, total_YLL_df, setup.index_dict, time_points)
+
+    return dict(risk_factors_df=risk_factors_df, risks_dict=risks_dict, rf_df_morb=rf_df_morb, rf_df_mort=rf_df_mort,
+                TMREL_df=TMREL_df, MF=MF, minmax_bounds_df=minmax_bounds_df,
+                distribution_weights_df=distribution_weights_df, burden=burden, means_df=means_df)
+
+
+def calculate(setup, countries, inputs=None):
+    """
+    Calculates the marginal DALYs per SSP, year and risk for the given countries
+    setup (module/namespace): Setup_file of the scenario
+    countries (array): names of the countries to calculate
+    inputs (dict/None): input tables of load_inputs (None: loaded by this call)
+    Returns: dict with the marginal DALYs (index: age band, [sex, disease,] ssp, year, country, risk; columns: runs)
+    """
+    '''
+    ################################################
+    # general setup
+    ################################################
+    '''
+    index_dict = setup.index_dict
+
+    # country M49 code file; used here to get the UNM49 codes of the countries
+    country_codes_df, _ = load_country_codes(setup.M49_path)
+    num_countries = len(countries)
+
+    # define model dimensions: SSPs, time_points, countries, risks, diseases, ages, genders
+    SSP_names = SSPs_of_run(setup)
+    num_SSPs = len(SSP_names)
+
+    time_points = index_dict['time_points']
+    num_times = len(time_points)
+
+    # the (SSP, time point) combinations are calculated together as one batch axis
+    batch = list(product(SSP_names, time_points))
+
+    risks = index_dict['risks']
+    num_risks = len(risks)
+
+    diseases = index_dict['diseases']
+    num_diseases = len(diseases)
+
+    age_groups = index_dict['age_groups']
+    num_ages = len(age_groups)
+
+    genders = index_dict['genders']
+    num_genders = len(genders)
+
+    num_runs = setup.num_runs
+
+    # integration of the PAFs (None: 100 equally wide bins) or ratio of the sample means
+    integrator = create_integrator(setup)
+    sample_means = uses_sample_means(setup)
+
+    '''
+    ################################################
+    # loading the data
+    ################################################
+    '''
+    # input tables shared by all countries (loaded here, or loaded once for all chunks by the runner)
+    inputs = load_inputs(setup) if inputs is None else inputs
+    risk_factors_df = inputs['risk_factors_df']
+    risks_dict = inputs['risks_dict']
+    rf_df_morb = inputs['rf_df_morb']
+    rf_df_mort = inputs['rf_df_mort']
+    TMREL_df = inputs['TMREL_df']
+    MF = inputs['MF']
+    minmax_bounds_df = inputs['minmax_bounds_df']
+    distribution_weights_df = inputs['distribution_weights_df']
+    burden = inputs['burden']
+    means_df = inputs['means_df']
+
+    # groups of the outputs: age bands (e.g. all ages and below 70), sex and disease groups (if set, otherwise the
+    # DALYs are summed over the sexes and diseases), see aggregation.py
+    aggregator = Aggregator({'age_band': age_band_groups(age_groups, setup.age_bands), 'sex': setup.sex_groups,
+                             'disease': setup.disease_groups})
+    axes = {'batch': batch, 'disease': diseases, 'age_band': age_groups, 'sex': genders, 'risk': risks}
+    by = ['age_band'] + [axis for axis in ['sex', 'disease'] if axis in aggregator.groupings] + ['batch', 'risk']
+    groups = aggregator.levels(axes, by[:-2])
+
+    # output array of the marginal DALYs of all groups
+    DALYs_der = np.zeros(tuple(len(labels) for labels in groups.values()) +
+                         (num_SSPs, num_times, num_countries, num_risks, num_runs))
+
+    # stores UNM49 codes corresponding to each country index; used as output index
+    M49s = np.zeros(num_countries)
+
+    # loop over countries, all SSPs and time points of a country are calculated together (only the means and the
+    # total burden change between the SSPs and years, the stds, RRs and TMRELs are shared)
+    for idx1, country in enumerate(countries):
+        print(country)
+        M49s[idx1] = country_codes_df.loc[country, 'UNM49']
+
+        # total burden of all (disease, age, sex) cells of this country (dim (SSP, time point) x diseases x ages x
+        # sexes)
+        total_YLDs, total_YLLs = [np.concatenate(arrays) for arrays in zip(
+            *[country_burden(burden[SSP_name], country, slice(None)) for SSP_name in SSP_names])]
+
+        with stage('data loading'):
+            # the means of all SSPs and time points and the standard deviations
+            mean_values_dfs = {SSP_name: means_df[SSP_name].loc[country] for SSP_name in SSP_names}
+            sd_values_df = load_std(setup.GBD_centralval_path, country)
+
+        # timing block per country (all runs)
+        begin = time.time()
+
+        # loop over runs
+        for run in np.arange(num_runs):
+            print(run)
+            # stores PAF derivatives of each (SSP, time point)/outcome/age/sex/risk given the overlap between risks
+            # (morbidity and mortality)
+            PAF_J_der_table = np.zeros((len(batch), num_diseases, num_ages, num_genders, num_risks, 2))
+
+            # extract the means of all SSPs and time points (dim (SSP, time point) x (risk, age, sex) combinations)
+            # and the standard deviations for that run
+            means = np.stack([mean_values_dfs[SSP_name].loc[time_point, str(run)].to_numpy()
+                              for SSP_name, time_point in batch])
+            stds = sd_values_df.loc[:, str(run)].to_numpy()
+
+            # generate exposure distributions for each (SSP, time point, risk, age, sex) combination for this country
+            # and run, the variables of all SSPs and time points are fitted and sampled together (the distributions
+            # are indexed by the position on the batch axis)
+            distributions_batch_df = \
+                DistributionCreator(
+                    country, risks, age_groups, genders, run, setup.sample_size, setup.random_seed,
+                    setup.sampling_method, setup.precision, years=np.arange(len(batch))).get_distributions(
+                    means, stds, minmax_bounds_df.loc[country, :], distribution_weights_df)
+
+            # loop over SSPs and time-points
+            for batch_idx, (SSP_name, time_point) in enumerate(batch):
+                print(f'Calculating for {SSP_name}, year: {time_point}')
+                distributions_df = distributions_batch_df.loc[batch_idx]
+
+                # PAFs and PAF derivatives of all (disease, age, sex, risk) combinations at once (sample-mean
+                # estimator)
+                if sample_means:
+                    with stage('PAF computation'):
+                        PAF_table = calculate_PAF_table(distributions_df, TMREL_df, risk_factors_df, rf_df_morb,
+                                                        rf_df_mort, index_dict, run)
+                        PAF_table_der = calculate_PAF_table(distributions_df, TMREL_df, risk_factors_df, rf_df_morb,
+                                                            rf_df_mort, index_dict, run, derivative=True)
+
+                # loop over diseases, age groups, and genders
+                for idx2, disease in enumerate(diseases):
+                    # set up PAF arrays for original and derivatives of PAFs
+                    if sample_means:
+                        PAF_array, PAF_array_der = PAF_table[idx2], PAF_table_der[idx2]
+                    else:
+                        PAF_array = np.zeros((num_ages, 2, len(risks), 2))
+                        PAF_array_der = np.zeros((num_ages, num_genders, num_risks, 2))
+
+                        with stage('PAF computation'):
+                            for idx3, age in enumerate(age_groups):
+                                for idx4, gender in enumerate(genders):
+
+                                    # loop over risks
+                                    for idx5, risk in enumerate(risks):
+                                        risk_diseases = risks_dict[risk]
+
+                                        # only compute if the disease is linked to the current risk
+                                        if disease in risk_diseases:
+                                            morb_mort = np.unique(
+                                                risk_factors_df.loc[(risk, disease), :].index.get_level_values(0))[0]
+
+                                            # if "Both", full_calculation and full_calculation_der returns both
+                                            if morb_mort == 'Both':
+
+                                                # compute and store original DALYs
+                                                PAF_value = full_calculation(risk, disease, age, gender, TMREL_df,
+                                                                             risk_factors_df, distributions_df,
+                                                                             rf_df_morb, rf_df_mort, 'Both', run,
+                                                                             integrator)
+                                                PAF_array[idx3, idx4, idx5, :] = PAF_value
+
+                                                # compute and store PAF derivatives
+                                                PAF_value_der = full_calculation_der(
+                                                    risk, disease, age, gender, TMREL_df, risk_factors_df,
+                                                    distributions_df, rf_df_morb, rf_df_mort, 'Both', run, integrator)
+                                                PAF_array_der[idx3, idx4, idx5, :] = PAF_value_der
+
+                                            else:
+                                                # otherwise compute morbidity and mortality separately
+                                                # compute and store original PAFs
+                                                PAF_array[idx3, idx4, idx5, 0] = \
+                                                    full_calculation(risk, disease, age, gender, TMREL_df,
+                                                                     risk_factors_df, distributions_df, rf_df_morb,
+                                                                     rf_df_mort, 'Morbidity', run, integrator)
+                                                PAF_array[idx3, idx4, idx5, 1] = \
+                                                    full_calculation(risk, disease, age, gender, TMREL_df,
+                                                                     risk_factors_df, distributions_df, rf_df_morb,
+                                                                     rf_df_mort, 'Mortality', run, integrator)
+
+                                                # compute and store PAF derivatives
+                                                PAF_array_der[idx3, idx4, idx5, 0] = \
+                                                    full_calculation_der(risk, disease, age, gender, TMREL_df,
+                                                                         risk_factors_df, distributions_df, rf_df_morb,
+                                                                         rf_df_mort, 'Morbidity', run, integrator)
+                                                PAF_array_der[idx3, idx4, idx5, 1] = \
+                                                    full_calculation_der(risk, disease, age, gender, TMREL_df,
+                                                                         risk_factors_df, distributions_df, rf_df_morb,
+                                                                         rf_df_mort, 'Mortality', run, integrator)
+
+                    with stage('aggregation'):
+                        # leave the 'risk' loop after filling the PAF arrays
+                        # re-enter the age loop to calculate final PAF derivatives
+                        for idx3, age in enumerate(age_groups):
+
+                            # loop over genders
+                            for idx4, gender in enumerate(genders):
+
+                                # loop over risks
+                                for idx5, risk in enumerate(risks):
+                                    risk_diseases = risks_dict[risk]
+                                    if disease in risk_diseases:
+
+                                        # compute PAF derivatives for each risk given the overlap between risks
+                                        PAF_J_Morb_der = calculate_PAF_der_per_disease(
+                                            PAF_array_der[idx3, idx4, :, 0], PAF_array[idx3, idx4, :, 0], MF, idx5,
+                                            idx2)
+                                        PAF_J_Mort_der = calculate_PAF_der_per_disease(
+                                            PAF_array_der[idx3, idx4, :, 1], PAF_array[idx3, idx4, :, 1], MF, idx5,
+                                            idx2)
+
+                                        PAF_J_der_table[batch_idx, idx2, idx3, idx4, idx5] = \
+                                            PAF_J_Morb_der, PAF_J_Mort_der
+
+                del distributions_df
+
+            with stage('aggregation'):
+                # calculates DALY derivatives of each (SSP, time point)/outcome/age/sex/risk
+                attributable_DALYs_der = PAF_J_der_table[..., 0] * total_YLDs[..., None] + \
+                    PAF_J_der_table[..., 1] * total_YLLs[..., None]
+                if np.any(np.isnan(attributable_DALYs_der)):
+                    print('value is nan')
+                    print(PAF_J_der_table[np.isnan(attributable_DALYs_der)])
+                    exit()
+
+                # save the final DALYs of all groups, SSPs, time points and risks (sum over the diseases, sexes
+                # and the age groups of each group in one contraction)
+                DALYs_der[..., idx1, :, run] = aggregator.aggregate(attributable_DALYs_der, axes, by)[0].reshape(
+                    DALYs_der.shape[:-5] + (num_SSPs, num_times, num_risks))
+
+            del means
+            del stds
+
+        # end timing block
+        end = time.time()
+        print('time', end - begin)
+
+    with stage('aggregation'):
+        # dense array to a dataframe with all runs (the runs are selected when saving)
+        DALYs_der_df = dense_to_dataframe(DALYs_der, dict(groups, ssp=SSP_names, year=time_points, country=countries,
+                                                          risk=risks))
+
+    return {'DALYs_der': DALYs_der_df}
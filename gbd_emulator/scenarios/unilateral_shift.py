@@ -0,0 +1,427 @@
+import numpy as np
+import pandas as pd
+from ..helpers_data_and_setup import calculate_mediation_matrix, calculate_MF_NJ, calculate_MF_J, load_input_files, \
+    load_mean_and_std, load_country_codes, load_risk_inputs, get_country_range, burden_arrays, country_burden, \
+    dense_to_dataframe
+from ..helpers_PAF_calculation import full_calculation, full_calculation_shift, calculate_PAF_table, \
+    calculate_PAF_per_disease, change_joint_PAFs_per_disease, calculate_PJ_PAFs
+from ..Distribution_creater_class import DistributionCreator
+from ..runner import run_and_save, save_dataframe
+from ..profiling import stage
+from ..integration import create_integrator, uses_sample_means
+from ..aggregation import Aggregator, age_band_groups, add_country_groups, load_country_groups, country_population, \
+    per_capita
+
+# DALY calculation modes
+# 'J': joint (mediation-adjusted) DALYs per risk, 'NJ': non-joint DALYs per risk (no mediation),
+# 'PJ': proportional joint DALYs per risk (sum to the joint DALYs of all dietary risks)
+modes = ['J', 'NJ', 'PJ']
+
+
+def main(setup, arguments, mode='J'):
+    """
+    Analytical scenario 2: change in burden when shifting the mean intake of one or more dietary risks by a fixed
+    amount h
+    setup (module/namespace): Setup_file of the scenario (number of runs, sample size, file paths, index_dict with
+                              scenario names and time points)
+    arguments (list): command line arguments (optionally start and stop index of the countries)
+    mode (str): one of 'J', 'NJ' or 'PJ' (see modes)
+    """
+    if mode not in modes:
+        raise ValueError(f"mode must be one of: {', '.join(modes)}")
+
+    _, countries = load_country_codes(setup.M49_path)
+
+    # allowing subset execution rather than looping over all countries
+    start_country_idx, stop_country_idx = get_country_range(arguments, len(countries))
+
+    run_and_save(calculate, save, setup, countries[start_country_idx: stop_country_idx], start_country_idx,
+                 stop_country_idx, load_inputs, mode=mode)
+
+
+def save(setup, results, start_country_idx, stop_country_idx, mode='J'):
+    """
+    Saves the DALYs per scenario, year, country and risk (and per age band, sex and disease group if set), with the
+    aggregates of the country groups (regions, income groups, see load_country_groups) next to the countries or
+    instead of them (setup.save_countries)
+    setup (module/namespace): Setup_file of the scenario
+    results (dict): output of calculate (possibly combined from several chunks of countries)
+    start_country_idx, stop_country_idx (int): range of the calculated countries (not used in the saving path)
+    mode (str): one of 'J', 'NJ' or 'PJ' (see modes)
+    """
+    keys = [column for column in results['DALYs'].columns if column != 'DALYs']
+    DALYs_Unilateral_Shift = results['DALYs'].set_index(keys)
+
+    # the country groups are summed once all countries are calculated, the DALYs per capita divide the DALYs by the
+    # population of the countries (of the group) under setup.population_SSP in the year
+    country_groups = load_country_groups(setup)
+    years = DALYs_Unilateral_Shift.index.unique('Year')
+    population = country_population(setup, years.astype(int), [setup.population_SSP])
+    if population is not None:
+        # with the year labels of the output
+        population = population.droplevel('ssp').rename_axis(['Year', 'Country']).rename(
+            index=dict(zip(years.astype(int), years)), level='Year')
+        DALYs_per_capita = per_capita(DALYs_Unilateral_Shift, population, country_groups, 'Country',
+                                      setup.save_countries)['DALYs']
+    DALYs_Unilateral_Shift = add_country_groups(DALYs_Unilateral_Shift, country_groups, 'Country', setup.save_countries)
+    if population is not None:
+        DALYs_Unilateral_Shift['DALYs per capita'] = DALYs_per_capita
+    DALYs_Unilateral_Shift = DALYs_Unilateral_Shift.reset_index().sort_values(keys).reset_index(drop=True)
+    save_dataframe(DALYs_Unilateral_Shift, setup.saving_path.format(mode), setup.output_format)
+
+
+def load_inputs(setup):
+    """
+    Loads the input tables shared by all countries (handed to the worker processes in shared memory, see
+    shared_inputs.py)
+    setup (module/namespace): Setup_file of the scenario
+    Returns: dict of input tables
+    """
+    with stage('data loading'):
+        # get the risk factors, relative risks (RR) for morbidity and mortality and the TMRELs
+        risk_factors_df, risks_dict, rf_df_morb, rf_df_mort, TMREL_df = \
+            load_risk_inputs(setup.dietary_risk_factors_path, setup.rf_mord_mort_path, setup.TMREL_path)
+
+        # Get the shift dataframe containg h values for the different risks
+        shift_df = pd.read_csv(setup.shift_path, index_col=[0, 1, 2, 3, 4, 5])
+        shift_df.sort_index(inplace=True)
+        shift_df.index = shift_df.index.set_levels(shift_df.index.levels[1].astype(str), level=1)
+
+        # get the mean values of the YLDs and YLLs (those might vary for different scenarios)
+        total_YLD_df = pd.read_csv(setup.total_YLL_or_YLD_path.format('YLD'),
+                                   usecols=['year', 'location', 'sex', 'cause', 'age', 'val'],
+                                   index_col=[0, 1, 2, 3, 4], dtype={'year': str})
+        total_YLD_df.sort_index(inplace=True)
+
+        total_YLL_df = pd.read_csv(setup.total_YLL_or_YLD_path.format('YLL'),
+                                   usecols=['year', 'location', 'sex', 'cause', 'age', 'val'],
+                                   index_col=[0, 1, 2, 3, 4], dtype={'year': str})
+        total_YLL_df.sort_index(inplace=True)
+
+        # dense arrays of the YLDs and YLLs (dim time points x locations x diseases x ages x sexes)
+        burden = burden_arrays(total_YLD_df, total_YLL_df, setup.index_dict, setup.index_dict['time_points'])
+
+        # create the mediation matrix MF capturing the overlaps between risks (for better overview the calculation
+        # happens in helpers_data_and_setup.py)
+        MF = calculate_mediation_matrix()
+
+        # get the bounds and weights used to construct/compose intake distributions
+        minmax_bounds_df, distribution_weights_df = load_input_files(setup.min_max_path, setup.distrbution_weights_path)
+
+    return dict(risk_factors_df=risk_factors_df, risks_dict=risks_dict, rf_df_morb=rf_df_morb, rf_df_mort=rf_df_mort,
+                TMREL_df=TMREL_df, shift_df=shift_df, burden=burden, MF=MF,
+                minmax_bounds_df=minmax_bounds_df, distribution_weights_df=distribution_weights_df)
+
+
+def calculate(setup, countries, mode='J', inputs=None):
+    """
+    Calculates the DALYs (original plus change due to the shift) per risk for the given countries
+    setup (module/namespace): Setup_file of the scenario
+    countries (array): names of the countries to calculate
+    mode (str): one of 'J', 'NJ' or 'PJ' (see modes)
+    inputs (dict/None): input tables of load_inputs (None: loaded by this call)
+    Returns: dict with the DALYs dataframe (columns: Scenario, Year, Country, Risk, [Age Group, Sex, Disease,] DALYs)
+    """
+    '''
+    ################################################
+    # general setup
+    ################################################
+    '''
+    index_dict = setup.index_dict
+
+    # country M49 code file; used here to get the UNM49 codes of the countries
+    country_codes_df, _ = load_country_codes(setup.M49_path)
+    num_countries = len(countries)
+
+    # define model dimensions: scenarios, time_points, countries, risks, diseases, ages, genders
+    scenario_names = index_dict['scenario_names']
+    num_scenarios = len(scenario_names)
+
+    time_points = index_dict['time_points']
+    num_times = len(time_points)
+
+    risks = index_dict['risks']
+    num_risks = len(risks)
+
+    diseases = index_dict['diseases']
+    num_diseases = len(diseases)
+
+    age_groups = index_dict['age_groups']
+    num_ages = len(age_groups)
+
+    genders = index_dict['genders']
+    num_genders = len(genders)
+
+    num_runs = setup.num_runs
+
+    # integration of the PAFs (None: 100 equally wide bins) or ratio of the sample means
+    integrator = create_integrator(setup)
+    sample_means = uses_sample_means(setup)
+
+    '''
+    ################################################
+    # loading the data
+    ################################################
+    '''
+    # input tables shared by all countries (loaded here, or loaded once for all chunks by the runner)
+    inputs = load_inputs(setup) if inputs is None else inputs
+    risk_factors_df = inputs['risk_factors_df']
+    risks_dict = inputs['risks_dict']
+    rf_df_morb = inputs['rf_df_morb']
+    rf_df_mort = inputs['rf_df_mort']
+    TMREL_df = inputs['TMREL_df']
+    shift_df = inputs['shift_df']
+    burden = inputs['burden']
+    MF = inputs['MF']
+    minmax_bounds_df = inputs['minmax_bounds_df']
+    distribution_weights_df = inputs['distribution_weights_df']
+
+    # output arrays (one for original GBD DALYs and one for changes in DALYs)
+    DALYs_per_risk = np.zeros((num_scenarios, num_times, num_countries, num_diseases, num_ages, num_genders,
+                               num_risks, num_runs))
+    DALYs_per_risk_shift = np.zeros((num_scenarios, num_times, num_countries, num_diseases, num_ages, num_genders,
+                                     num_risks, num_runs))
+
+    # stores UNM49 codes corresponding to each country index; used as output index
+    M49s = np.zeros(num_countries)
+
+    # Loop over scenarios
+    for scenario_idx, scenario_name in enumerate(scenario_names):
+        # loop over time-points (for projections)
+        for year_idx, time_point in enumerate(time_points):
+            print(f'Calculating for scenario: {scenario_name}, year: {time_point}')
+
+            # loop countries (possibly a subset or chunk) for this scenario
+            for idx1, country in enumerate(countries):
+                print(country)
+                M49s[idx1] = country_codes_df.loc[country, 'UNM49']
+
+                # total burden of all (disease, age, sex) cells of this country and time point
+                total_YLDs, total_YLLs = country_burden(burden, country, year_idx)
+
+                with stage('data loading'):
+                    # loading the means and standard deviations (central values only) for this country
+                    mean_values_df, sd_values_df = \
+                        load_mean_and_std(setup.GBD_centralval_path, country)
+
+                # Loop over runs (if using central values there would be only one run per scenario, time-point
+                # and country)
+                for run in np.arange(num_runs):
+                    print(run)
+
+                    # stores joint PAFs of each outcome/age/sex/risk (morbidity and mortality)
+                    PAF_J_table = np.zeros((num_diseases, num_ages, num_genders, num_risks, 2))
+                    # stores changes in joint PAFs of each outcome/age/sex/risk (morbidity and mortality)
+                    change_PAF_J_table = np.zeros((num_diseases, num_ages, num_genders, num_risks, 2))
+
+                    # extract exposure means/SDs for this run/draw
+                    means = mean_values_df.loc[:, str(run)].to_numpy()
+                    stds = sd_values_df.loc[:, str(run)].to_numpy()
+
+                    # generate exposure distributions for each (risk, age, sex) combination for this country and run
+                    distributions_df = \
+                        DistributionCreator(
+                            country, risks, age_groups, genders, run, setup.sample_size,
+                            setup.random_seed, setup.sampling_method, setup.precision).get_distributions(
+                            means, stds, minmax_bounds_df.loc[country, :], distribution_weights_df)
+
+                    # original and shifted PAFs of all (disease, age, sex, risk) combinations at once (sample-mean
+                    # estimator)
+                    if sample_means:
+                        with stage('PAF computation'):
+                            shift = shift_df.loc[(scenario_name, time_point, country), str(run)].reindex(
+                                pd.MultiIndex.from_product([age_groups, genders, risks])).to_numpy()
+                            PAF_table = calculate_PAF_table(distributions_df, TMREL_df, risk_factors_df, rf_df_morb,
+                                                            rf_df_mort, index_dict, run)
+                            PAF_table_shift = calculate_PAF_table(
+                                distributions_df, TMREL_df, risk_factors_df, rf_df_morb, rf_df_mort, index_dict, run,
+                                shift.reshape(num_ages, num_genders, num_risks))
+
+                    # loop through all diseases
+                    for idx2, disease in enumerate(diseases):
+
+                        # set up PAF arrays for original and shifted PAFs
+                        if sample_means:
+                            PAF_array, PAF_array_shift = PAF_table[idx2], PAF_table_shift[idx2]
+                        else:
+                            PAF_array = np.zeros((num_ages, num_genders, num_risks, 2))
+                            PAF_array_shift = np.zeros((num_ages, num_genders, num_risks, 2))
+
+                            with stage('PAF computation'):
+                                # loop through age groups
+                                for idx3, age in enumerate(age_groups):
+
+                                    # loop through genders
+                                    for idx4, gender in enumerate(genders):
+
+                                        # loop over risks
+                                        # compute individual original and shifted PAFs for each risk that applies
+                                        # to this disease
+                                        for idx5, risk in enumerate(risks):
+                                            risk_diseases = risks_dict[risk]
+
+                                            # only compute if the disease is linked to the current risk
+                                            if disease in risk_diseases:
+                                                morb_mort = np.unique(risk_factors_df.loc[(risk, disease), :]
+                                                                      .index.get_level_values(0))[0]
+
+                                                # if "Both", full_calculation and full_calculation_shift returns both
+                                                # morbidity and mortality PAFs
+                                                if morb_mort == 'Both':
+                                                    # compute and store original PAFs
+                                                    PAF_value = full_calculation(
+                                                        risk, disease, age, gender, TMREL_df, risk_factors_df,
+                                                        distributions_df, rf_df_morb, rf_df_mort, 'Both', run,
+                                                        integrator)
+                                                    PAF_array[idx3, idx4, idx5, :] = PAF_value
+
+                                                    # compute and store shifted PAFs
+                                                    PAF_value_shift = full_calculation_shift(
+                                                        scenario_name, time_point, country, disease, age, gender, risk,
+                                                        TMREL_df, risk_factors_df, distributions_df, rf_df_morb,
+                                                        rf_df_mort, shift_df, 'Both', run, integrator)
+                                                    PAF_array_shift[idx3, idx4, idx5, :] = PAF_value_shift
+
+                                                else:
+                                                    # otherwise compute morbidity and mortality separately
+                                                    # compute and store original PAFs
+                                                    PAF_array[idx3, idx4, idx5, 0] = full_calculation(
+                                                        risk, disease, age, gender, TMREL_df, risk_factors_df,
+                                                        distributions_df, rf_df_morb, rf_df_mort, 'Morbidity', run,
+                                                        integrator)
+                                                    PAF_array[idx3, idx4, idx5, 1] = full_calculation(
+                                                        risk, disease, age, gender, TMREL_df, risk_factors_df,
+                                                        distributions_df, rf_df_morb, rf_df_mort, 'Mortality', run,
+                                                        integrator)
+
+                                                    # compute and store shifted PAFs
+                                                    PAF_array_shift[idx3, idx4, idx5, 0] = full_calculation_shift(
+                                                        scenario_name, time_point, country, disease, age, gender, risk,
+                                                        TMREL_df, risk_factors_df, distributions_df, rf_df_morb,
+                                                        rf_df_mort, shift_df, 'Morbidity', run, integrator)
+                                                    PAF_array_shift[idx3, idx4, idx5, 1] = full_calculation_shift(
+                                                        scenario_name, time_point, country, disease, age, gender, risk,
+                                                        TMREL_df, risk_factors_df, distributions_df, rf_df_morb,
+                                                        rf_df_mort, shift_df, 'Mortality', run, integrator)
+
+                        with stage('aggregation'):
+                            # leave the 'risk' loop after filling the PAF arrays
+                            # re-enter the age loop to calculate final PAFs
+                            for idx3, age in enumerate(age_groups):
+
+                                # loop through genders
+                                for idx4, gender in enumerate(genders):
+
+                                    if mode == 'PJ':
+                                        PAF_prop, PAF_prop_shift = _calculate_PJ_PAFs_per_disease(
+                                            PAF_array[idx3, idx4], PAF_array_shift[idx3, idx4], MF, idx2, risks,
+                                            risks_dict, disease)
+
+                                    # loop over risks
+                                    for idx5, risk in enumerate(risks):
+                                        risk_diseases = risks_dict[risk]
+
+                                        if disease in risk_diseases:
+                                            if mode == 'PJ':
+                                                # take only the value for this specific risk and calculate the change in
+                                                # proportional joint PAF
+                                                PAF_J_table[idx2, idx3, idx4, idx5] = PAF_prop[idx5, :]
+                                                change_PAF_J_table[idx2, idx3, idx4, idx5] = \
+                                                    PAF_prop_shift[idx5, :] - PAF_prop[idx5, :]
+
+                                            else:
+                                                # choose mediation matrix based on the mode (modified mediation matrices
+                                                # are constructed in helpers_data_and_setup.py)
+                                                if mode == 'NJ':
+                                                    # construct matrix for non-joint PAFs
+                                                    modified_MF = calculate_MF_NJ(risk)
+                                                else:
+                                                    # construct matrix for joint PAFs
+                                                    modified_MF = calculate_MF_J(MF, risk)
+
+                                                # Calculate individual original PAF for that specific risk
+                                                PAF_J_Morb = calculate_PAF_per_disease(
+                                                    PAF_array[idx3, idx4, :, 0], modified_MF, idx2)
+                                                PAF_J_Mort = calculate_PAF_per_disease(
+                                                    PAF_array[idx3, idx4, :, 1], modified_MF, idx2)
+
+                                                # Calculate individual shifted PAF for that specific risk
+                                                changes_Morb = change_joint_PAFs_per_disease(
+                                                    PAF_array[idx3, idx4, :, 0], PAF_array_shift[idx3, idx4, idx5, 0],
+                                                    modified_MF, idx2)
+                                                changes_Mort = change_joint_PAFs_per_disease(
+                                                    PAF_array[idx3, idx4, :, 1], PAF_array_shift[idx3, idx4, idx5, 1],
+                                                    modified_MF, idx2)
+
+                                                # Store joint PAFs
+                                                PAF_J_table[idx2, idx3, idx4, idx5] = PAF_J_Morb, PAF_J_Mort
+                                                change_PAF_J_table[idx2, idx3, idx4, idx5] = changes_Morb, changes_Mort
+
+                    with stage('aggregation'):
+                        # convert joint PAFs to DALYs attributable to each outcome/age/sex/risk
+                        # - morbidity component applied to YLDs
+                        # - mortality component applied to YLLs
+                        attributable_DALYs = \
+                            PAF_J_table[..., 0] * total_YLDs[..., None] + PAF_J_table[..., 1] * total_YLLs[..., None]
+                        change_attributable_DALYs = change_PAF_J_table[..., 0] * total_YLDs[..., None] + \
+                            change_PAF_J_table[..., 1] * total_YLLs[..., None]
+
+                    # Assign information pertaining to the scenario, year, and country
+                    DALYs_per_risk[scenario_idx, year_idx, idx1, :, :, :, :, run] = attributable_DALYs
+                    DALYs_per_risk_shift[scenario_idx, year_idx, idx1, :, :, :, :, run] = change_attributable_DALYs
+
+                    # explicitly delete means and standard deviations (useful if memory pressure is high)
+                    del means
+                    del stds
+
+    with stage('aggregation'):
+        # sum the original DALYs and the changes per scenario, year, country and risk (and per age band, sex and
+        # disease group if set, see aggregation.py) over the diseases, age groups, sexes and runs, one contraction each
+        aggregator = Aggregator({'Age Group': age_band_groups(age_groups, setup.age_bands), 'Sex': setup.sex_groups,
+                                 'Disease': setup.disease_groups})
+        axes = {'Scenario': scenario_names, 'Year': time_points, 'Country': countries, 'Disease': diseases,
+                'Age Group': age_groups, 'Sex': genders, 'Risk': risks, 'run': np.arange(num_runs)}
+        by = ['Scenario', 'Year', 'Country', 'Risk'] + \
+            [axis for axis in ['Age Group', 'Sex', 'Disease'] if axis in aggregator.groupings]
+        DALYs_original, levels = aggregator.aggregate(DALYs_per_risk, axes, by)
+        DALYs_change, _ = aggregator.aggregate(DALYs_per_risk_shift, axes, by)
+
+        # output processing
+        DALYs_Unilateral_Shift = dense_to_dataframe((DALYs_original + DALYs_change)[..., None], levels)
+        DALYs_Unilateral_Shift = DALYs_Unilateral_Shift.set_axis(['DALYs'], axis=1).reset_index()
+
+    return {'DALYs': DALYs_Unilateral_Shift}
+
+
+def _calculate_PJ_PAFs_per_disease(PAFs, PAFs_shift, MF, o, risks, risks_dict, disease):
+    """
+    Calculates the proportional joint PAFs (original and shifted) of all risks for one disease, age and sex
+    PAFs (array): individual PAFs (dim risks x 2, morbidity and mortality)
+    PAFs_shift (array): individual shifted PAFs (dim risks x 2, morbidity and mortality)
+    MF: mediation matrix
+    o: corresponding disease index
+    Returns: proportional joint PAFs and shifted proportional joint PAFs (dim risks x 2)
+    """
+    PAFs_J = np.zeros_like(PAFs)
+    PAFs_J_shift = np.zeros_like(PAFs_shift)
+
+    # calculate joint PAFs for individual risks (with the modified mediation matrix of the risk)
+    for idx5, risk in enumerate(risks):
+        if disease in risks_dict[risk]:
+            modified_MF = calculate_MF_J(MF, risk)
+            for k in range(2):
+                PAFs_J[idx5, k] = calculate_PAF_per_disease(PAFs[:, k], modified_MF, o)
+                PAFs_J_shift[idx5, k] = calculate_PAF_per_disease(PAFs_shift[:, k], modified_MF, o)
+
+    PAF_prop = np.zeros_like(PAFs)
+    PAF_prop_shift = np.zeros_like(PAFs_shift)
+    for k in range(2):
+        # calculate combined PAFs for all dietary risks (original and shifted)
+        combined_PAF_all_risks = calculate_PAF_per_disease(PAFs[:, k], MF, o)
+        combined_PAF_all_risks_shift = calculate_PAF_per_disease(PAFs_shift[:, k], MF, o)
+
+        # calculate proportional PAFs for both baseline and shifted scenarios
+        PAF_prop[:, k] = calculate_PJ_PAFs(PAFs_J[:, k], combined_PAF_all_risks)
+        PAF_prop_shift[:, k] = calculate_PJ_PAFs(PAFs_J_shift[:, k], combined_PAF_all_risks_shift)
+
+    return PAF_prop, PAF_prop_shift
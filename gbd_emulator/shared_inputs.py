@@ -0,0 +1,101 @@
+import contextlib
+import numpy as np
+import pandas as pd
+from multiprocessing import shared_memory
+
+'''
+################################################
+# shared memory publication of the input tables
+# the read-only input tables of a scenario (RR and TMREL draws, YLL/YLD totals, min/max bounds, mediation matrix) are
+# loaded once by the main process and their values are copied into shared memory blocks. The worker processes only
+# receive small handles (name, shape and dtype of the block, index and columns of the table) and build the dataframes
+# on top of the shared blocks without copying, so a worker does not read any csv file and the memory of the tables
+# does not grow with the number of workers
+################################################
+'''
+
+
+class SharedTable(object):
+    # handle of a numeric dataframe or array whose values are stored in a shared memory block
+
+    def __init__(self, table, memory):
+        """
+        Copies the values of the table into the shared memory block
+        table (dataframe/array): numeric table with a single dtype
+        memory (SharedMemory): block of at least the size of the values
+        """
+        values = np.ascontiguousarray(table.to_numpy() if isinstance(table, pd.DataFrame) else table)
+        np.ndarray(values.shape, values.dtype, buffer=memory.buf)[...] = values
+        self.name, self.shape, self.dtype = memory.name, values.shape, values.dtype
+        self.index = table.index if isinstance(table, pd.DataFrame) else None
+        self.columns = table.columns if isinstance(table, pd.DataFrame) else None
+
+    def attach(self):
+        """
+        Returns: read-only dataframe (or array) on top of the shared memory block
+        """
+        if self.name not in _attached:
+            _attached[self.name] = shared_memory.SharedMemory(name=self.name)
+        values = np.ndarray(self.shape, self.dtype, buffer=_attached[self.name].buf)
+        values.flags.writeable = False
+        if self.index is None:
+            return values
+        return pd.DataFrame(values, index=self.index, columns=self.columns, copy=False)
+
+
+# shared memory blocks attached by the current (worker) process, kept open for the following chunks
+_attached = {}
+
+
+def _is_shareable(table):
+    # numeric dataframes with a single dtype and numeric or boolean arrays (masks) are shared, everything else is sent
+    # as it is
+    if isinstance(table, pd.DataFrame):
+        return table.shape[1] > 0 and len(set(table.dtypes)) == 1 and np.issubdtype(table.dtypes.iloc[0], np.number)
+    return isinstance(table, np.ndarray) and (np.issubdtype(table.dtype, np.number) or table.dtype == bool)
+
+
+def publish(inputs, blocks):
+    """
+    Copies the shareable tables of the inputs into shared memory blocks
+    inputs (dict): input tables (nested dicts are published recursively)
+    blocks (list): list the created SharedMemory blocks are appended to (to be released by the main process)
+    Returns: dict of the same structure with SharedTable handles instead of the shared tables
+    """
+    handles = {}
+    for name, table in inputs.items():
+        if isinstance(table, dict):
+            handles[name] = publish(table, blocks)
+        elif _is_shareable(table):
+            size = table.size * (table.dtypes.iloc[0] if isinstance(table, pd.DataFrame) else table.dtype).itemsize
+            blocks.append(shared_memory.SharedMemory(create=True, size=max(size, 1)))
+            handles[name] = SharedTable(table, blocks[-1])
+        else:
+            handles[name] = table
+    return handles
+
+
+def attach(handles):
+    """
+    Builds the input tables from the handles (tables that are not shared are returned as they are)
+    handles (dict): output of publish, or the input tables themselves
+    Returns: dict of input tables
+    """
+    return {name: attach(handle) if isinstance(handle, dict) else
+            handle.attach() if isinstance(handle, SharedTable) else handle for name, handle in handles.items()}
+
+
+@contextlib.contextmanager
+def shared_tables(inputs):
+    """
+    Context manager publishing the input tables in shared memory for the time the worker processes run
+    inputs (dict): input tables
+    Returns (yields): dict of handles to send to the worker processes
+    """
+    blocks = []
+    try:
+        yield publish(inputs, blocks)
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
@@ -0,0 +1,161 @@
+import os
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor
+import pandas as pd
+from .config import load_module, repo_root, scenario_folders
+from .runner import save_dataframe
+
+'''
+################################################
+# SSP preprocessing pipeline of the Marginals scenario
+# prepares the demand proportions, projected means and projected YLDs/YLLs of all SSPs in one run with the scripts of
+# the Marginals Calculation folder. The inputs that are the same for all SSPs (income groups, baseline means, GBD
+# projections with the 2020 baseline per measure, SSP populations) are read and prepared once, the SSP specific steps
+# run in parallel worker processes (one task per SSP). Next to the files per SSP that the Marginals scenario reads, the
+# results of all SSPs are combined into one table per step with typed columns (categories for the labels, integer
+# years), saved as csv or parquet
+################################################
+'''
+SSPs = ['SSP1', 'SSP2', 'SSP3', 'SSP4', 'SSP5']
+preprocessing_steps = ['proportions', 'means', 'burden']
+measures = ['YLD', 'YLL']
+
+# preprocessing script of each step (Marginals Calculation folder)
+scripts = {'proportions': 'SSP_Proportions', 'means': 'SSP_means', 'burden': 'YLL_YLD_SSP_Projections'}
+
+# combined outputs of all SSPs (relative to the data root) and their label and year columns
+combined_outputs = {'proportions': ('SSP Means/SSP_Proportions/all_SSPs_proportions.csv',
+                                    ['ssp', 'ISO3', 'IncomeGroup'], 'year'),
+                    'means': ('SSP Means/SSP_means/all_SSPs_means.csv',
+                              ['ssp', 'Risk', 'Location', 'Age Group', 'Sex', 'Unit'], 'Year'),
+                    'burden': ('SSP_YLL_YLD_Projections/SSPs/all_SSPs_total_burden_projected_gendered.csv',
+                               ['ssp', 'measure', 'location', 'cause', 'age', 'sex'], 'year')}
+
+# preprocessing scripts loaded by the current process and inputs shared by all SSPs of a worker process
+_modules = {}
+_shared = {}
+
+
+def load_scripts():
+    """
+    Loads the preprocessing scripts of the Marginals Calculation folder (once per process)
+    Returns: dict of modules per step
+    """
+    if not _modules:
+        folder = os.path.join(repo_root, scenario_folders['marginals'])
+        for step, script in scripts.items():
+            _modules[step] = load_module(os.path.join(folder, script + '.py'), script)
+    return _modules
+
+
+def load_shared_inputs(data_root, steps, burden_measures):
+    """
+    Reads and prepares the inputs of the steps that are the same for all SSPs
+    data_root (str): root directory of the data
+    steps (list): preprocessing steps to run
+    burden_measures (list): burden measures to project ('YLD' and/or 'YLL')
+    Returns: dict of dataframes
+    """
+    modules = load_scripts()
+    shared = {}
+    if 'proportions' in steps:
+        shared['income_brackets'] = modules['proportions'].load_income_groups(data_root)
+    if 'means' in steps:
+        shared['baseline_means'] = modules['means'].load_baseline_means(data_root)
+    if 'burden' in steps:
+        shared['SSP_population'] = modules['burden'].load_SSP_population(data_root)
+        for measure in burden_measures:
+            shared[f'{measure}_projections'] = modules['burden'].project_burden(measure, data_root)
+    return shared
+
+
+def prepare_SSP(ssp, data_root, steps, burden_measures, shared):
+    """
+    Runs the SSP specific part of the steps for one SSP and saves the files read by the Marginals scenario
+    ssp (str): one of SSPs
+    data_root (str): root directory of the data
+    steps (list): preprocessing steps to run
+    burden_measures (list): burden measures to project
+    shared (dict): inputs shared by all SSPs (output of load_shared_inputs)
+    Returns: dict of output dataframes per step (the burden of all measures in one dataframe)
+    """
+    modules = load_scripts()
+    results = {}
+    if 'proportions' in steps:
+        results['proportions'] = modules['proportions'].calculate_SSP_proportions(
+            ssp, data_root, income_brackets=shared['income_brackets'])
+        save_dataframe(results['proportions'], modules['proportions'].output_path(ssp, data_root), index=False)
+    if 'means' in steps:
+        # the proportions of this run are used directly, otherwise the saved proportions are read
+        results['means'] = modules['means'].calculate_SSP_means(
+            ssp, data_root, results.get('proportions'), shared['baseline_means'])
+        save_dataframe(results['means'], modules['means'].output_path(ssp, data_root), index=False)
+    if 'burden' in steps:
+        burden = {}
+        for measure in burden_measures:
+            burden[measure] = modules['burden'].apply_ssp_scaling(
+                shared[f'{measure}_projections'], ssp, data_root, shared['SSP_population'])
+            save_dataframe(burden[measure], modules['burden'].output_path(ssp, measure, data_root), index=False)
+        results['burden'] = pd.concat(burden, names=['measure']).reset_index(level=0)
+    print(f'Prepared {ssp}')
+    return results
+
+
+def _set_shared_inputs(shared):
+    # initializer of the worker processes, the shared inputs are sent once per worker instead of once per SSP
+    _shared.update(shared)
+
+
+def _prepare_SSP(ssp, data_root, steps, burden_measures):
+    return prepare_SSP(ssp, data_root, steps, burden_measures, _shared)
+
+
+def typed_table(df, label_columns, year_column):
+    """
+    Converts the label columns of a combined output to categories and the years to integers
+    df (dataframe): combined output of all SSPs
+    label_columns (list): columns with labels (SSP, measure, country, risk, age group, sex, ...)
+    year_column (str): column with the years
+    Returns: dataframe with typed columns
+    """
+    df = df.reset_index(drop=True)
+    for column in label_columns:
+        df[column] = df[column].astype('category')
+    df[year_column] = df[year_column].astype('int16')
+    return df
+
+
+def run_SSP_pipeline(data_root, ssps=SSPs, steps=preprocessing_steps, burden_measures=measures, num_workers=None,
+                     output_format='csv'):
+    """
+    Prepares the inputs of the Marginals scenario for the given SSPs in one run
+    data_root (str): root directory of the data
+    ssps (list): SSPs to prepare
+    steps (list): preprocessing steps to run (see preprocessing_steps)
+    burden_measures (list): burden measures to project
+    num_workers (int/None): number of worker processes (None: one per SSP, at most the number of CPUs)
+    output_format (str): format of the combined outputs ('csv' or 'parquet')
+    Returns: dict of combined output dataframes per step
+    """
+    print('Preparing the inputs shared by all SSPs')
+    shared = load_shared_inputs(data_root, steps, burden_measures)
+
+    if num_workers is None:
+        num_workers = min(len(ssps), os.cpu_count() or 1)
+
+    if num_workers <= 1 or len(ssps) == 1:
+        results = [prepare_SSP(ssp, data_root, steps, burden_measures, shared) for ssp in ssps]
+    else:
+        with ProcessPoolExecutor(max_workers=num_workers, initializer=_set_shared_inputs,
+                                 initargs=(shared,)) as executor:
+            results = list(executor.map(partial(_prepare_SSP, data_root=data_root, steps=steps,
+                                                burden_measures=burden_measures), ssps))
+
+    combined = {}
+    for step in steps:
+        path, label_columns, year_column = combined_outputs[step]
+        combined[step] = typed_table(pd.concat({ssp: result[step] for ssp, result in zip(ssps, results)},
+                                               names=['ssp']).reset_index(level=0), label_columns, year_column)
+        save_dataframe(combined[step], os.path.join(data_root, path), output_format, index=False)
+        print(f'Saved the {step} of all SSPs to {os.path.join(data_root, path)}')
+    return combined
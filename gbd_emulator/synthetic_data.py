@@ -0,0 +1,139 @@
+import os
+import numpy as np
+import pandas as pd
+from .helpers import index_dict, distribution_names
+
+'''
+################################################
+# synthetic input data
+# creates a Data folder with the file layout of the Setup_files, filled with random but realistically shaped inputs
+# (means/stds, min/max bounds, ensemble weights, RR/TMREL draws, YLL/YLD tables, shift file and SSP projections)
+# used for benchmarking, as the original GBD inputs can not be shared
+################################################
+'''
+weight_columns = ['exp', 'gamma', 'llogis', 'gumbel', 'weibull', 'lnorm', 'norm', 'betasr', 'mgamma', 'mgumbel',
+                  'invgamma', 'invweibull']
+
+
+def create_synthetic_data(data_root, num_countries=2, num_runs=1, seed=0, scenario_names=('CT', 'FT'),
+                          shift_time_points=('2025', '2030'), SSP_name='SSP1',
+                          SSP_time_points=(2020, 2025, 2030, 2035, 2040, 2045, 2050)):
+    """
+    Writes a complete set of synthetic input files for all analytical scenarios
+    data_root (str): root directory of the data (replaces '../Data/' of the Setup_files)
+    num_countries (int): number of countries (the first countries of index_dict)
+    num_runs (int): number of runs/draws per input
+    seed (int): seed of the random number generator
+    scenario_names, shift_time_points (tuple): scenarios and years of the shift file
+    SSP_name (str): SSP of the Marginals projections
+    SSP_time_points (tuple): years of the SSP projections
+    Returns: array of the synthetic countries
+    """
+    rng = np.random.default_rng(seed)
+    countries = np.sort(index_dict['countries'][:num_countries])
+    risks = index_dict['risks']
+    diseases = index_dict['diseases']
+    age_groups = index_dict['age_groups']
+    genders = index_dict['genders']
+    runs = [str(run) for run in range(num_runs)]
+
+    GBD_path = os.path.join(data_root, 'GBD 2017')
+    for folder in [os.path.join(GBD_path, 'Central_Values'), os.path.join(GBD_path, 'total YLLs and YLDs'),
+                   os.path.join(data_root, 'Shift'), os.path.join(data_root, 'Projections', 'total YLLs and YLDs'),
+                   os.path.join(data_root, 'SSP Means', 'SSP_means'),
+                   os.path.join(data_root, 'SSP_YLL_YLD_Projections', 'SSPs', SSP_name)]:
+        os.makedirs(folder, exist_ok=True)
+
+    # country codes (only the name, UNM49 code and FAO-GBD pair indicator are used by the emulator)
+    pd.DataFrame({'FAO': np.arange(len(countries)), 'ISO3': [country[:3].upper() for country in countries],
+                  'GBD_name': countries, 'Country': countries, 'UNM49': np.arange(len(countries)) + 1,
+                  'FAO-GBD pair': 1, 'GBD_2017_name': countries}).to_csv(
+        os.path.join(data_root, 'Country_Codes_FAO_GBD_ISO_M49.csv'), index=False)
+
+    # risk-outcome pairs: units, low/high indicator and whether the RR differs for morbidity and mortality
+    risk_scale = dict(zip(risks, rng.uniform(5, 200, len(risks))))
+    low = {risk: int(risk.startswith('Diet low')) for risk in risks}
+    rows = []
+    for risk in risks:
+        for disease in rng.choice(diseases, size=rng.integers(1, 6), replace=False):
+            if rng.random() < 0.6:
+                rows.append([risk, '', '', '', '', disease, 'Both', risk_scale[risk] / 5, low[risk]])
+            else:
+                for morb_mort in ['Morbidity', 'Mortality']:
+                    rows.append([risk, '', '', '', '', disease, morb_mort, risk_scale[risk] / 5, low[risk]])
+    pd.DataFrame(rows, columns=['Risk', 'RR', 'Lower', 'Upper', 'Source', 'Cause', 'Morb_Mort', 'Units', 'Low']).to_csv(
+        os.path.join(GBD_path, 'Dietry_risks_relative_risk_factors_parameters.csv'), sep=';', index=False)
+
+    # relative risk draws per unit of exposure (> 1, i.e. harmful below/above the TMREL)
+    rf_index = pd.MultiIndex.from_product([risks, diseases, age_groups], names=['risk', 'cause', 'age'])
+    for morb_mort in ['morb', 'mort']:
+        pd.DataFrame({run: rng.uniform(1.02, 1.3, len(rf_index)) for run in runs}, index=rf_index).to_csv(
+            os.path.join(GBD_path, f'rf_{morb_mort}_distributions_without_uncertainty.csv'))
+
+    # TMRELs above the typical intake for protective risks, below for harmful risks
+    pd.DataFrame({run: [risk_scale[risk] * (1.3 if low[risk] else 0.4) * rng.uniform(0.9, 1.1) for risk in risks]
+                  for run in runs}, index=pd.Index(risks, name='risk')).to_csv(
+        os.path.join(GBD_path, 'TMREL_distributions_without_uncertainty.csv'))
+
+    # ensemble weights
+    weights_df = pd.DataFrame(rng.dirichlet(np.ones(len(distribution_names)), size=len(risks)),
+                              columns=weight_columns)
+    weights_df.insert(0, 'Risk', risks)
+    weights_df.to_csv(os.path.join(data_root, 'ensemble_distribution_weights.csv'), sep=';', index=False)
+
+    # means and standard deviations per country (coefficient of variation between 0.2 and 1.5) and the relative
+    # minimum and maximum of each distribution
+    cell_index = pd.MultiIndex.from_product([risks, age_groups, genders], names=['risk', 'age', 'sex'])
+    cell_scale = np.array([risk_scale[risk] for risk in cell_index.get_level_values(0)])
+    min_max_rows = []
+    means = {}
+    for country in countries:
+        mean = cell_scale * rng.uniform(0.5, 1.5) * rng.uniform(0.7, 1.3, len(cell_index))
+        coefficient_of_variation = rng.uniform(0.2, 1.5, len(cell_index))
+        means[country] = pd.DataFrame({run: mean * rng.uniform(0.95, 1.05, len(mean)) for run in runs},
+                                      index=cell_index)
+        means[country].to_csv(os.path.join(GBD_path, 'Central_Values', f'Mean_central_{country}.csv'))
+        pd.DataFrame({run: mean * coefficient_of_variation for run in runs}, index=cell_index).to_csv(
+            os.path.join(GBD_path, 'Central_Values', f'Std_central_{country}.csv'))
+        for risk, age, gender in cell_index:
+            min_max_rows.append([risk, country, age, gender, rng.uniform(0.0, 0.2), rng.uniform(3, 8)])
+    pd.DataFrame(min_max_rows, columns=['risk', 'location', 'age', 'sex', 'xmin', 'xmax']).to_csv(
+        os.path.join(GBD_path, 'relative_exposure_minmax.csv'), index=False)
+
+    # total YLDs and YLLs (2017, projections for the shift years and SSP projections)
+    burden_index = pd.MultiIndex.from_product([countries, genders, age_groups, diseases],
+                                              names=['location', 'sex', 'age', 'cause'])
+    for measure in ['YLD', 'YLL']:
+        burden_df = pd.DataFrame({'val': rng.uniform(10, 5000, len(burden_index))}, index=burden_index).reset_index()
+        burden_df.to_csv(os.path.join(GBD_path, 'total YLLs and YLDs', f'total_{measure}s_gendered.csv'), index=False)
+
+        projected_df = pd.concat([burden_df.assign(year=year) for year in shift_time_points])
+        projected_df[['year', 'location', 'sex', 'age', 'cause', 'val']].to_csv(
+            os.path.join(data_root, 'Projections', 'total YLLs and YLDs',
+                         f'total_projected_{measure}s_gendered_new.csv'), index=False)
+
+        SSP_df = pd.concat([burden_df.assign(year=year, val=burden_df['val'] * (1 + 0.01 * (year - 2020)))
+                            for year in SSP_time_points])
+        SSP_df[['year', 'location', 'cause', 'age', 'sex', 'val']].to_csv(
+            os.path.join(data_root, 'SSP_YLL_YLD_Projections', 'SSPs', SSP_name,
+                         f'{SSP_name}_total_{measure}s_projected_gendered.csv'), index=False)
+
+    # shift file (h values between -10% and +10% of the typical intake of each risk)
+    shift_index = pd.MultiIndex.from_product([scenario_names, shift_time_points, countries, age_groups, genders,
+                                              risks], names=['scenario', 'year', 'location', 'age', 'sex', 'risk'])
+    shift_scale = np.array([risk_scale[risk] for risk in shift_index.get_level_values(5)])
+    pd.DataFrame({run: shift_scale * rng.uniform(-0.1, 0.1, len(shift_index)) for run in runs},
+                 index=shift_index).to_csv(os.path.join(data_root, 'Shift', 'Shift_Example_Emulator.csv'))
+
+    # SSP means (central values only)
+    SSP_means = []
+    for country in countries:
+        for year in SSP_time_points:
+            SSP_means.append(pd.DataFrame({'Risk': cell_index.get_level_values(0), 'Year': year,
+                                           'Location': country, 'Age Group': cell_index.get_level_values(1),
+                                           'Sex': cell_index.get_level_values(2),
+                                           '0': means[country]['0'].to_numpy() * (1 + 0.005 * (year - 2020))}))
+    pd.concat(SSP_means).to_csv(os.path.join(data_root, 'SSP Means', 'SSP_means', f'{SSP_name}_means.csv'),
+                                index=False)
+
+    return countries
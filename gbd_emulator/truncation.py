@@ -0,0 +1,111 @@
+import json
+import numpy as np
+import pandas as pd
+from .helpers import distribution_names
+
+'''
+################################################
+# truncation diagnostics of the intake distributions
+# probability mass of each distribution family (and of the whole ensemble) that lies outside of the limits [l, u]
+# of relative_exposure_minmax.csv and is cut off by the truncated sampling, per (country, risk, family)
+################################################
+'''
+
+
+def _empty_stats():
+    return {'count': 0, 'invalid': 0, 'coefficient': 0.0, 'mass': 0.0, 'max_mass': 0.0}
+
+
+class TruncationDiagnostics(object):
+    # accumulates the truncated mass per (country, risk, family) over the age and sex combinations
+
+    def __init__(self):
+        self.stats = {}
+
+    def record(self, country, risks, coefficients, mass):
+        """
+        Records the truncated mass of the (risk, age, sex) combinations of a country
+        country (str): name of the country
+        risks (array): risk of each combination
+        coefficients (array): weights of the families of each combination (combinations, 12)
+        mass (array): truncated mass of the families of each combination (combinations, 12), nan for invalid
+                      parameters
+        """
+        valid = ~np.isnan(mass)
+        mass = np.where(valid, mass, 0)
+        ensemble_mass = np.sum(np.where(valid, coefficients, 0) * mass, axis=1)
+        for risk in np.unique(risks):
+            cells = risks == risk
+            for idx, family in enumerate(distribution_names + ['ensemble']):
+                stats = self.stats.setdefault((country, risk, family), _empty_stats())
+                family_mass = mass[cells, idx] if idx < len(distribution_names) else ensemble_mass[cells]
+                stats['count'] += int(np.sum(cells))
+                stats['mass'] += float(np.sum(family_mass))
+                stats['max_mass'] = max(stats['max_mass'], float(np.max(family_mass)))
+                if idx < len(distribution_names):
+                    stats['invalid'] += int(np.sum(~valid[cells, idx]))
+                    stats['coefficient'] += float(np.sum(coefficients[cells, idx]))
+                else:
+                    stats['coefficient'] += float(np.sum(cells))
+
+    def reset(self):
+        self.stats = {}
+
+    def merge(self, stats):
+        """
+        Adds the stats of another diagnostics object (e.g. of a worker process)
+        stats (dict): stats per (country, risk, family)
+        """
+        for key, other in stats.items():
+            own = self.stats.setdefault(key, _empty_stats())
+            for name in ['count', 'invalid', 'coefficient', 'mass']:
+                own[name] += other[name]
+            own['max_mass'] = max(own['max_mass'], other['max_mass'])
+
+    def report(self):
+        """
+        Returns: dataframe with one row per (country, risk, family), the number of age and sex combinations, the
+                 combinations with invalid parameters, the mean coefficient and the mean and largest truncated mass
+        """
+        rows = [dict(country=country, risk=risk, family=family, count=stats['count'], invalid=stats['invalid'],
+                     mean_coefficient=stats['coefficient'] / stats['count'], mean_mass=stats['mass'] / stats['count'],
+                     max_mass=stats['max_mass'])
+                for (country, risk, family), stats in self.stats.items()]
+        report_df = pd.DataFrame(rows, columns=['country', 'risk', 'family', 'count', 'invalid', 'mean_coefficient',
+                                                'mean_mass', 'max_mass'])
+        report_df['family'] = pd.Categorical(report_df['family'], categories=distribution_names + ['ensemble'])
+        return report_df.sort_values(['country', 'risk', 'family']).reset_index(drop=True)
+
+    def summary(self):
+        """
+        Returns: dataframe with the mean and largest truncated mass per family over all countries and risks
+        """
+        report_df = self.report()
+        report_df['mass'] = report_df['mean_mass'] * report_df['count']
+        summary_df = report_df.groupby('family', observed=True).agg(
+            count=('count', 'sum'), invalid=('invalid', 'sum'), mass=('mass', 'sum'),
+            max_mass=('max_mass', 'max')).reset_index()
+        summary_df['mean_mass'] = summary_df['mass'] / summary_df['count']
+        return summary_df[['family', 'count', 'invalid', 'mean_mass', 'max_mass']]
+
+    def save_report(self, path):
+        """
+        Saves the report per country and risk as JSON or CSV (depending on the file extension) and prints the summary
+        per family
+        path (str/None): saving path (None: nothing is reported)
+        """
+        if len(self.stats) == 0 or path is None:
+            return
+        print(self.summary().round(4).to_string(index=False))
+        report_df = self.report()
+        report_df['family'] = report_df['family'].astype(str)
+        if path.endswith('.json'):
+            with open(path, 'w') as f:
+                json.dump(report_df.to_dict(orient='records'), f, indent=2, default=float)
+        else:
+            report_df.to_csv(path, index=False)
+        print(f'Saved truncation report to: {path}')
+
+
+# diagnostics of the current process, filled by the distribution creator (Distribution_creater_class.py)
+truncation = TruncationDiagnostics()
@@ -0,0 +1,115 @@
+import numpy as np
+import pandas as pd
+import pytest
+from gbd_emulator.helpers_PAF_calculation import calculate_PAF_table, full_calculation, full_calculation_shift, \
+    full_calculation_der, calculate_rr_array, calculate_rr_der_array
+from gbd_emulator.integration import PAFIntegrator
+
+'''
+################################################
+# equivalence of the sample-mean estimator of the PAFs (calculate_PAF_table) with the histogram estimator of each
+# combination (full_calculation, full_calculation_shift and full_calculation_der with many quantile bins) and with
+# the sample means evaluated combination by combination, on a small synthetic sample tensor
+################################################
+'''
+# tolerance of the histogram estimator with 2000 quantile bins for 20000 samples (the RR is averaged over each bin
+# instead of the samples in it): absolute for the PAFs, relative for the PAF derivatives (ratios of order 1000)
+histogram_tolerance = dict(abs=2e-4, rel=1e-3)
+
+risks = ['red meat', 'fruits']
+diseases = ['Stroke', 'Colon and rectum cancer']
+age_groups = ['25 to 29', '30 to 34']
+genders = ['Male', 'Female']
+sample_size = 20000
+run = 0
+scenario, time_point, country = 'CT', '2030', 'Albania'
+
+
+@pytest.fixture(scope='module')
+def inputs():
+    rng = np.random.default_rng(0)
+    cells = pd.MultiIndex.from_product([risks, age_groups, genders])
+    # red meat (harmful above the TMREL) around the TMREL, fruits (harmful below the TMREL) mostly below it
+    samples = np.concatenate([rng.lognormal(np.log(30), 0.5, (4, sample_size)),
+                              rng.gamma(4, 40, (4, sample_size))])
+    distribution_df = pd.DataFrame(samples, index=cells, columns=np.arange(sample_size))
+
+    TMREL_df = pd.DataFrame({str(run): [25.0, 250.0]}, index=risks)
+    risks_df = pd.DataFrame({'Units': [100.0, 100.0, 100.0, 100.0], 'Low': [False, False, True, True]},
+                            index=pd.MultiIndex.from_tuples([('red meat', 'Stroke', 'Both'),
+                                                             ('red meat', 'Colon and rectum cancer', 'Morbidity'),
+                                                             ('red meat', 'Colon and rectum cancer', 'Mortality'),
+                                                             ('fruits', 'Stroke', 'Both')]))
+    rf_index = pd.MultiIndex.from_product([risks, diseases, age_groups])
+    rf_df_morb = pd.DataFrame({str(run): rng.uniform(1.1, 1.6, len(rf_index))}, index=rf_index).sort_index()
+    rf_df_mort = pd.DataFrame({str(run): rng.uniform(1.1, 1.6, len(rf_index))}, index=rf_index).sort_index()
+
+    # shift h per (age, sex, risk)
+    shift = rng.uniform(-10, 10, (len(age_groups), len(genders), len(risks)))
+    shift_df = pd.DataFrame({str(run): shift.ravel()}, index=pd.MultiIndex.from_tuples(
+        [(scenario, time_point, country, age, gender, risk)
+         for age in age_groups for gender in genders for risk in risks]))
+
+    index_dict = {'risks': risks, 'diseases': diseases, 'age_groups': age_groups, 'genders': genders}
+    return dict(distribution_df=distribution_df, TMREL_df=TMREL_df, risks_df=risks_df, rf_df_morb=rf_df_morb,
+                rf_df_mort=rf_df_mort, shift=shift, shift_df=shift_df, index_dict=index_dict)
+
+
+def _PAF_table(inputs, quantity):
+    return calculate_PAF_table(inputs['distribution_df'], inputs['TMREL_df'], inputs['risks_df'],
+                               inputs['rf_df_morb'], inputs['rf_df_mort'], inputs['index_dict'], run,
+                               inputs['shift'] if quantity == 'shifted PAF' else None, quantity == 'PAF derivative')
+
+
+def _calls(inputs):
+    # (risk, disease, age, gender, morbidity/mortality, slot of the PAF table) of all linked combinations
+    for risk, disease, morb_mort in inputs['risks_df'].index:
+        for slot in ([0, 1] if morb_mort == 'Both' else [0] if morb_mort == 'Morbidity' else [1]):
+            for age in age_groups:
+                for gender in genders:
+                    yield risk, disease, age, gender, morb_mort, slot
+
+
+def _table_value(PAF_table, call):
+    risk, disease, age, gender, _, slot = call
+    return PAF_table[diseases.index(disease), age_groups.index(age), genders.index(gender), risks.index(risk), slot]
+
+
+@pytest.mark.parametrize('quantity', ['PAF', 'shifted PAF', 'PAF derivative'])
+def test_sample_means_match_histogram_estimator(inputs, quantity):
+    PAF_table = _PAF_table(inputs, quantity)
+    integrator = PAFIntegrator(num_bins=2000)
+    arguments = (inputs['TMREL_df'], inputs['risks_df'], inputs['distribution_df'], inputs['rf_df_morb'],
+                 inputs['rf_df_mort'])
+    for call in _calls(inputs):
+        risk, disease, age, gender, morb_mort, _ = call
+        if quantity == 'shifted PAF':
+            expected = full_calculation_shift(scenario, time_point, country, disease, age, gender, risk, *arguments,
+                                              inputs['shift_df'], morb_mort, run, integrator)
+        elif quantity == 'PAF derivative':
+            expected = full_calculation_der(risk, disease, age, gender, *arguments, morb_mort, run, integrator)
+        else:
+            expected = full_calculation(risk, disease, age, gender, *arguments, morb_mort, run, integrator)
+        assert _table_value(PAF_table, call) == pytest.approx(expected, **histogram_tolerance), call
+
+
+@pytest.mark.parametrize('quantity', ['PAF', 'shifted PAF', 'PAF derivative'])
+def test_sample_means_equal_per_combination_loop(inputs, quantity):
+    PAF_table = _PAF_table(inputs, quantity)
+    rr_function = calculate_rr_der_array if quantity == 'PAF derivative' else calculate_rr_array
+    for call in _calls(inputs):
+        risk, disease, age, gender, morb_mort, _ = call
+        rf_df = inputs['rf_df_morb'] if morb_mort == 'Morbidity' else inputs['rf_df_mort']
+        h = inputs['shift'][age_groups.index(age), genders.index(gender), risks.index(risk)] \
+            if quantity == 'shifted PAF' else 0.0
+        rr = rr_function(inputs['distribution_df'].loc[(risk, age, gender), :].to_numpy() + h,
+                         inputs['TMREL_df'].loc[risk, str(run)], rf_df.loc[(risk, disease, age), str(run)],
+                         inputs['risks_df'].loc[(risk, disease, morb_mort), 'Units'],
+                         inputs['risks_df'].loc[(risk, disease, morb_mort), 'Low'])
+        assert _table_value(PAF_table, call) == np.mean(rr - 1) / np.mean(rr), call
+
+
+def test_unlinked_combinations_are_zero(inputs):
+    PAF_table = _PAF_table(inputs, 'PAF')
+    # fruits are not linked to colon and rectum cancer
+    assert np.all(PAF_table[diseases.index('Colon and rectum cancer'), :, :, risks.index('fruits')] == 0)
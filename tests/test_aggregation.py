@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+import pytest
+from gbd_emulator.aggregation import Aggregator, age_band_groups, group_membership, add_country_groups, per_capita
+
+'''
+################################################
+# aggregates of the result arrays (Aggregator) and country groups of the outputs (add_country_groups, per_capita)
+# against sums calculated by hand on small arrays
+################################################
+'''
+age_groups = ['25 to 29', '65 to 69', '70 to 74']
+diseases = ['Stroke', 'Colon and rectum cancer', 'Diabetes']
+countries = ['Albania', 'Chad', 'Peru']
+years = [2020, 2030]
+runs = [0, 1]
+country_groups = {'Europe and Africa': ['Albania', 'Chad'], 'World': None}
+
+
+@pytest.fixture(scope='module')
+def output_df():
+    # DALYs of every (year, country, disease) and run
+    index = pd.MultiIndex.from_product([years, countries, diseases], names=['year', 'country', 'disease'])
+    values = np.arange(len(index) * len(runs), dtype=float).reshape(len(index), len(runs)) ** 1.5
+    return pd.DataFrame(values, index=index, columns=runs)
+
+
+@pytest.fixture(scope='module')
+def population():
+    index = pd.MultiIndex.from_product([years, countries], names=['year', 'country'])
+    return pd.Series([3.0, 17.0, 33.0, 2.5, 19.0, 35.0], index=index)
+
+
+def test_aggregate_sums_groups():
+    array = np.arange(len(age_groups) * len(diseases) * 2, dtype=float).reshape(len(age_groups), len(diseases), 2)
+    axes = {'age': age_groups, 'disease': diseases, 'gender': ['Male', 'Female']}
+    aggregator = Aggregator({'age': age_band_groups(age_groups, {'all_ages': (None, None), 'below70': (None, 70)}),
+                             'disease': {'cancers': ['Colon and rectum cancer'], 'all': None}})
+    aggregate, levels = aggregator.aggregate(array, axes, ['disease', 'age'])
+    assert levels == {'disease': ['cancers', 'all'], 'age': ['all_ages', 'below70']}
+    # the gender axis is summed
+    expected = np.array([[array[:, 1].sum(), array[:2, 1].sum()], [array.sum(), array[:2].sum()]])
+    assert aggregate == pytest.approx(expected)
+
+
+def test_unknown_members_raise():
+    with pytest.raises(ValueError, match='Chadd'):
+        group_membership(countries, {'Africa': ['Chadd']})
+
+
+def test_country_groups_are_sums(output_df):
+    df = add_country_groups(output_df, country_groups)
+    assert list(df.index.unique('country')) == countries + list(country_groups)
+    df = df.sort_index()
+    for year in years:
+        for disease in diseases:
+            cells = [(year, country, disease) for country in countries]
+            assert df.loc[(year, 'Europe and Africa', disease)].to_numpy() == pytest.approx(
+                output_df.loc[cells[:2]].sum().to_numpy())
+            assert df.loc[(year, 'World', disease)].to_numpy() == pytest.approx(output_df.loc[cells].sum().to_numpy())
+    assert list(add_country_groups(output_df, country_groups, keep_countries=False).index.unique('country')) == \
+        list(country_groups)
+
+
+def test_per_capita_divides_by_group_population(output_df, population):
+    df = per_capita(output_df, population, country_groups)
+    sums_df = add_country_groups(output_df, country_groups)
+    assert df.index.equals(sums_df.index)
+    df, sums_df = df.sort_index(), sums_df.sort_index()
+    for year in years:
+        assert df.loc[(year, 'Peru')].to_numpy() == pytest.approx(
+            sums_df.loc[(year, 'Peru')].to_numpy() / population[(year, 'Peru')])
+        assert df.loc[(year, 'Europe and Africa')].to_numpy() == pytest.approx(
+            sums_df.loc[(year, 'Europe and Africa')].to_numpy() /
+            (population[(year, 'Albania')] + population[(year, 'Chad')]))
+        assert df.loc[(year, 'World')].to_numpy() == pytest.approx(
+            sums_df.loc[(year, 'World')].to_numpy() / population[year].sum())
@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+from gbd_emulator import ensemble_distributions
+from gbd_emulator.Distribution_creater_class import DistributionCreator
+from gbd_emulator.helpers import distribution_names
+from gbd_emulator.helpers_variables_calculation import run_for_beta, solve_fisk, solve_weibull, solve_invweibull
+
+'''
+################################################
+# equivalence of the truncated inverse-CDF sampling of the ensemble (samples of each family within [F(l), F(u)],
+# weighted with the mass of the family within the limits) with the redraw loop it replaced (samples outside of the
+# limits are redrawn from the pooled samples until all of them are within the limits)
+################################################
+'''
+# tolerance of the quantiles and mean of the two samplers (Monte Carlo error of 200000 samples)
+sampling_tolerance = dict(abs=0.3)
+quantiles = [0.05, 0.25, 0.5, 0.75, 0.95]
+sample_size = 200000
+
+# one cell, whose limits cut off a few percent of most families
+mu, sigma, lower, upper = 50.0, 20.0, 20.0, 110.0
+# families of the ensemble with weights (the others have no valid parameters in the redraw loop)
+weights = {'gamma': 0.3, 'fisk': 0.1, 'weibull_min': 0.2, 'lognorm': 0.2, 'norm': 0.1, 'mirrored_gamma': 0.1}
+
+
+@pytest.fixture(scope='module')
+def cell():
+    mean, std = np.array([mu]), np.array([sigma])
+    variables = np.zeros((1, 12))
+    variables[:, 0], variables[:, 1] = solve_fisk(mean, std)
+    variables[:, 2], variables[:, 3] = solve_weibull(mean, std)
+    variables[:, 4], variables[:, 5] = solve_invweibull(mean, std)
+    variables[:, 6], variables[:, 7], variables[:, 10], variables[:, 11] = run_for_beta(mean, std, np.array([upper]),
+                                                                                        np.array([lower]))
+    variables[:, 8], variables[:, 9] = upper, lower
+    parameters = DistributionCreator('Albania', ['red meat'], ['25 to 29'], ['Male'], 0)._get_parameters(
+        mean, std, variables)
+    coefficients = np.array([[weights.get(name, 0.0) for name in distribution_names]])
+    return parameters, coefficients
+
+
+def _redraw_loop(parameters, coefficients, rng):
+    # the sampling before the truncated inverse CDF: samples of all families, one family per sample drawn with the
+    # coefficients, samples outside of the limits redrawn from the pooled samples of the families
+    data = ensemble_distributions.ppf(rng.random((len(distribution_names), sample_size)), parameters[0],
+                                      per_family=True)
+    families = rng.choice(len(distribution_names), sample_size, p=coefficients[0])
+    samples = data[families, np.arange(sample_size)]
+    outside = np.flatnonzero((samples < lower) | (samples > upper))
+    while len(outside) > 0:
+        samples[outside] = data[rng.choice(len(distribution_names), len(outside), p=coefficients[0]),
+                                rng.integers(sample_size, size=len(outside))]
+        outside = outside[(samples[outside] < lower) | (samples[outside] > upper)]
+    return samples
+
+
+def test_truncated_sampling_matches_redraw_loop(cell):
+    parameters, coefficients = cell
+    truncated = ensemble_distributions.sample(parameters, coefficients, sample_size, np.random.default_rng(0),
+                                              truncate=True)[0]
+    redrawn = _redraw_loop(parameters, coefficients, np.random.default_rng(1))
+    assert np.quantile(truncated, quantiles) == pytest.approx(np.quantile(redrawn, quantiles), **sampling_tolerance)
+    assert np.mean(truncated) == pytest.approx(np.mean(redrawn), **sampling_tolerance)
+
+
+def test_truncated_samples_within_limits(cell):
+    parameters, coefficients = cell
+    samples = ensemble_distributions.sample(parameters, coefficients, sample_size, np.random.default_rng(0),
+                                            truncate=True)
+    assert np.all((samples >= lower) & (samples <= upper))
+    # the quantiles of the families stay within the limits for probabilities shared by all families or per family
+    q = np.random.default_rng(2).random((len(distribution_names), 100))
+    for values in [ensemble_distributions.truncated_ppf(q[0], parameters),
+                   ensemble_distributions.truncated_ppf(q, parameters, per_family=True)]:
+        valid = values[:, coefficients[0] > 0]
+        assert np.all((valid >= lower) & (valid <= upper))
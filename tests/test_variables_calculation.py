@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+from gbd_emulator.helpers_variables_calculation import solve_fisk, solve_weibull, solve_invweibull, run_for_fisk, \
+    run_for_weibull, run_for_invweibull, fisk_residual, weibull_residual, invweibull_residual
+
+'''
+################################################
+# equivalence of the vectorized Newton solvers (solve_fisk, solve_weibull, solve_invweibull) with the optimizers of
+# the scalar fitting (run_for_fisk, run_for_weibull, run_for_invweibull), cell by cell
+################################################
+'''
+# tolerance of the parameters of the optimizers (they stop once the mean is matched within 1-5%, the variance then
+# lies within about 1e-5 of the root)
+optimizer_tolerance = dict(rel=1e-4)
+
+# means and stds from a coefficient of variation of 0.1 (closed-form regimes of the Weibull families nearby) to 1.6
+# (the Fisk parameter at the bound of the optimizers)
+mu = np.array([50.0, 50.0, 50.0, 50.0, 120.0])
+sigma = np.array([5.0, 20.0, 45.0, 80.0, 30.0])
+
+solvers = {'fisk': (solve_fisk, run_for_fisk),
+           'weibull': (solve_weibull, run_for_weibull),
+           'invweibull': (solve_invweibull, run_for_invweibull)}
+
+
+@pytest.mark.parametrize('family', list(solvers))
+def test_newton_matches_optimizers(family):
+    solve, run_for_family = solvers[family]
+    parameters = np.column_stack(solve(mu, sigma))
+    for cell in range(len(mu)):
+        expected = run_for_family(mu[cell], sigma[cell])
+        assert parameters[cell] == pytest.approx(np.asarray(expected, dtype=float), **optimizer_tolerance), cell
+
+
+def test_newton_solves_the_variance():
+    # the Newton roots match the variance (for large coefficients of variation the Fisk root lies beyond the bound
+    # beta = pi of the optimizers, which is then the solution)
+    vr = sigma ** 2
+    below_bound = sigma / mu < 0.5
+    assert np.all(fisk_residual(*solve_fisk(mu, sigma), vr)[below_bound] < 1e-10)
+    assert np.all(weibull_residual(*solve_weibull(mu, sigma), vr) < 1e-10)
+    assert np.all(invweibull_residual(*solve_invweibull(mu, sigma), vr) < 1e-10)